@@ -0,0 +1,71 @@
+"""Measure batch receipt rendering throughput as the number of workers grows.
+
+Usage:
+    python -m benchmarks.bench_batch_receipts [--carts 2000] [--units 50] [--workers 1 2 4]
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.batch_renderer import render_receipts, snapshot_cart
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+FORMATS = ('text', 'csv', 'json', 'yaml')
+
+
+def build_carts(carts: int, units: int) -> list:
+    """Create carts holding units spread over a few names."""
+    result = []
+    for _ in range(carts):
+        cart = ShoppingCart()
+        cart.add_items(Item(name=f"Product {i % 10}", price=1.99) for i in range(units))
+        result.append(cart)
+    return result
+
+
+def render_serially(carts: list, directory: str) -> None:
+    """Render every receipt one after the other through generate_receipt."""
+    for cart_number, cart in enumerate(carts):
+        for format_type in FORMATS:
+            cart.generate_receipt(format_type, file_path=os.path.join(directory, f"{cart_number}.{format_type}"))
+
+
+def timed(function) -> float:
+    """Run function and return its duration in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--carts', type=int, default=2000)
+    parser.add_argument('--units', type=int, default=50)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    carts = build_carts(args.carts, args.units)
+    receipts = args.carts * len(FORMATS)
+    snapshot_size = len(pickle.dumps(snapshot_cart(carts[0])))
+    items_size = len(pickle.dumps(list(carts[0].list_items().values())))
+    print(f"{args.carts} carts x {len(FORMATS)} formats, {args.units} units per cart, {os.cpu_count()} CPUs")
+    print(f"pickled cart: {snapshot_size:,} bytes as a snapshot, {items_size:,} bytes as Items\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Separate carts for the serial run, so that the receipt cache it fills does not matter
+        serial_carts = build_carts(args.carts, args.units)
+        elapsed = timed(lambda: render_serially(serial_carts, directory))
+        print(f"{'serial':<8}  {'-':>7}  {receipts / elapsed:>10,.0f} receipts/s")
+        for executor in ('thread', 'process'):
+            for workers in args.workers:
+                elapsed = timed(lambda: render_receipts(carts, FORMATS, directory, executor=executor,
+                                                        max_workers=workers))
+                print(f"{executor:<8}  {workers:>7}  {receipts / elapsed:>10,.0f} receipts/s")
+
+
+if __name__ == '__main__':
+    main()
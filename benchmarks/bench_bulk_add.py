@@ -0,0 +1,53 @@
+"""Benchmark importing a large order with add_items versus add_item in a loop.
+
+Usage:
+    python -m benchmarks.bench_bulk_add [--lines 50000] [--names 500]
+"""
+import argparse
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def build_order(lines: int, names: int) -> list:
+    """Build an order of `lines` items spread over `names` distinct names."""
+    return [Item(name=f"Product {i % names}", price=float(i % 100) + 0.99) for i in range(lines)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=50_000)
+    parser.add_argument('--names', type=int, default=500)
+    args = parser.parse_args()
+
+    order = build_order(args.lines, args.names)
+
+    cart = ShoppingCart()
+    start = time.perf_counter()
+    for item in order:
+        cart.add_item(item)
+    loop_add = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for item in order:
+        cart.remove_item(item)
+    loop_remove = time.perf_counter() - start
+
+    cart = ShoppingCart()
+    start = time.perf_counter()
+    cart.add_items(order)
+    bulk_add = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cart.remove_items(order)
+    bulk_remove = time.perf_counter() - start
+
+    print(f"{args.lines} lines over {args.names} names")
+    print(f"{'operation':<10}  {'loop (ms)':>10}  {'bulk (ms)':>10}")
+    print(f"{'add':<10}  {loop_add * 1e3:>10.1f}  {bulk_add * 1e3:>10.1f}")
+    print(f"{'remove':<10}  {loop_remove * 1e3:>10.1f}  {bulk_remove * 1e3:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
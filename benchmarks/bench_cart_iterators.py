@@ -0,0 +1,77 @@
+"""Compare walking a cart through copied listings with its lazy iterators.
+
+Usage:
+    python -m benchmarks.bench_cart_iterators [--units 1000000] [--names 1000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def walk_copied_items(cart: ShoppingCart) -> int:
+    """Walk every unit the way callers used to, through a copy of every group."""
+    count = 0
+    listing = {
+        item_name: {**item_group, 'instances': item_group['instances'].copy()}
+        for item_name, item_group in cart._items.items()
+    }
+    for item_group in listing.values():
+        for _ in item_group['instances']:
+            count += 1
+    return count
+
+
+def walk_items(cart: ShoppingCart) -> int:
+    count = 0
+    for _ in cart.iter_items():
+        count += 1
+    return count
+
+
+def walk_copied_groups(cart: ShoppingCart) -> int:
+    """Walk the totals of every name through a copy of every group."""
+    listing = {item_name: dict(item_group) for item_name, item_group in cart._items.items()}
+    return sum(item_group['total_price_cents'] for item_group in listing.values())
+
+
+def walk_groups(cart: ShoppingCart) -> int:
+    return sum(group.subtotal_cents for group in cart.iter_groups())
+
+
+def measure(function, cart: ShoppingCart) -> tuple:
+    """Return the time taken by a walk, in seconds, and the peak memory it allocated, in bytes."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(cart)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=1_000_000)
+    parser.add_argument('--names', type=int, default=1000)
+    args = parser.parse_args()
+
+    cart = ShoppingCart()
+    cart.add_items([Item(name=f"Item {i % args.names}", price=1.25) for i in range(args.units)])
+
+    print(f"{args.units:,} units under {args.names:,} names")
+    print(f"{'walk':<28}  {'time':>10}  {'peak allocated':>14}")
+    for label, function in (
+        ('every unit, copied groups', walk_copied_items),
+        ('every unit, iter_items', walk_items),
+        ('every name, copied groups', walk_copied_groups),
+        ('every name, iter_groups', walk_groups),
+    ):
+        elapsed, peak = measure(function, cart)
+        print(f"{label:<28}  {elapsed * 1000:>7.1f} ms  {peak / 1024:>11,.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Compare scanning archived carts through CartView against loading them as ShoppingCart.
+
+Usage:
+    python -m benchmarks.bench_cart_view [--carts 2000] [--units 500]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from shopping_cart.models.cart_view import CartView
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def write_archive(directory: str, carts: int, units: int) -> list:
+    """Save carts as snapshot files and return their paths."""
+    cart = ShoppingCart()
+    cart.add_items(Item(name=f"Product {i % 50}", price=(i % 7) + 0.99) for i in range(units))
+    paths = []
+    for cart_number in range(carts):
+        file_path = os.path.join(directory, f"{cart_number}.snapshot")
+        cart.save_snapshot(file_path)
+        paths.append(file_path)
+    return paths
+
+
+def scan_views(paths: list) -> int:
+    """Sum the totals of every cart through views."""
+    total = 0
+    for file_path in paths:
+        with CartView(file_path) as view:
+            total += view.total_price_cents
+    return total
+
+
+def scan_views_by_name(paths: list) -> int:
+    """Sum one name's quantity over every cart through views."""
+    total = 0
+    for file_path in paths:
+        with CartView(file_path) as view:
+            total += view.get_total_quantity_by_name('Product 7')
+    return total
+
+
+def scan_carts(paths: list) -> int:
+    """Sum the totals of every cart by loading them, then listing their units."""
+    total = 0
+    for file_path in paths:
+        cart = ShoppingCart.load_snapshot(file_path)
+        cart.list_items_by_name('Product 7')
+        total += cart.total_price_cents
+    return total
+
+
+def timed(function) -> float:
+    """Run function and return its duration in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--carts', type=int, default=2000)
+    parser.add_argument('--units', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_archive(directory, args.carts, args.units)
+        results = [
+            ('views, totals', timed(lambda: scan_views(paths))),
+            ('views, quantity by name', timed(lambda: scan_views_by_name(paths))),
+            ('load_snapshot + one name', timed(lambda: scan_carts(paths))),
+        ]
+
+    print(f"{args.carts} carts of {args.units} units")
+    for label, elapsed in results:
+        print(f"{label:<26}  {elapsed:>7.3f} s  {args.carts / elapsed:>10,.0f} carts/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare the Catalog with a list of {'name', 'price'} dicts: bulk loading, lookups and item creation.
+
+Usage:
+    python -m benchmarks.bench_catalog [--skus 1000000] [--names 200000]
+"""
+import argparse
+import csv
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+
+from shopping_cart.models import catalog as catalog_module
+from shopping_cart.models.catalog import CSV_HEADER, Catalog
+from shopping_cart.models.item import Item
+
+
+def timed(function) -> float:
+    """Time a function with the garbage collector off, like timeit."""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--skus', type=int, default=1_000_000)
+    parser.add_argument('--names', type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = [(f"SKU{i:08d}", f"Product {rng.randrange(args.names)}", rng.randrange(1, 10_000) / 100)
+            for i in range(args.skus)]
+    products = [{'sku': sku, 'name': name, 'price': price} for sku, name, price in rows]
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'catalog.csv')
+        json_path = os.path.join(directory, 'catalog.json')
+        with open(csv_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            writer.writerows((sku, name, f"{price:.2f}") for sku, name, price in rows)
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(products, file)
+
+        print(f"{args.skus:,} SKUs under {args.names:,} names, orjson {'on' if catalog_module.orjson else 'off'}")
+        print(f"{'operation':<32}  {'time':>12}")
+        print(f"{'load CSV':<32}  {timed(lambda: Catalog.from_csv(csv_path)):>10.2f} s")
+        print(f"{'load JSON':<32}  {timed(lambda: Catalog.from_json(json_path)):>10.2f} s")
+
+    catalog = Catalog(rows)
+    name = rows[len(rows) // 2][1]
+    queries = (
+        ('name lookup, list scan', lambda: [product for product in products if product['name'] == name]),
+        ('name lookup, first (index)', lambda: catalog.find_by_name(name)),
+        ('name lookup, catalog', lambda: catalog.find_by_name(name)),
+        ('price range, list scan', lambda: sorted((product for product in products if 10.0 <= product['price'] <= 10.5),
+                                                  key=lambda product: product['price'])),
+        ('price range, first (index)', lambda: catalog.in_price_range(10.0, 10.5)),
+        ('price range, catalog', lambda: catalog.in_price_range(10.0, 10.5)),
+    )
+    for label, query in queries:
+        print(f"{label:<32}  {timed(query) * 1000:>9,.3f} ms")
+
+    count = 100_000
+    template = catalog.get(rows[0][0])
+    dict_time = timed(lambda: [Item(name=products[0]['name'], price=products[0]['price']) for _ in range(count)])
+    template_time = timed(lambda: [template.new_item() for _ in range(count)])
+    print(f"{'Item from a dict, each':<32}  {dict_time / count * 1e6:>9,.3f} µs")
+    print(f"{'Item from a template, each':<32}  {template_time / count * 1e6:>9,.3f} µs")
+
+
+if __name__ == '__main__':
+    main()
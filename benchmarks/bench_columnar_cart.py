@@ -0,0 +1,105 @@
+"""Compare ShoppingCart with ColumnarShoppingCart on a large cart: memory, bulk operations and aggregations.
+
+Usage:
+    python -m benchmarks.bench_columnar_cart [--units 1000000] [--names 1000]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from bisect import bisect_right
+from collections import Counter
+from heapq import nlargest
+
+from shopping_cart.models import columnar_cart
+from shopping_cart.models.columnar_cart import ColumnarShoppingCart
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+PRICES = [0.25, 0.99, 1.49, 2.50, 4.99, 9.99, 19.99]
+BIN_EDGES = [0.0, 1.0, 5.0, 10.0, 20.0]
+
+
+def price_histogram(cart: ShoppingCart) -> list:
+    """Count units per price range by walking the cart's Item objects."""
+    histogram = [0] * (len(BIN_EDGES) - 1)
+    for price, count in Counter(item.price for item in cart.iter_items()).items():
+        index = bisect_right(BIN_EDGES, price) - 1
+        if 0 <= index < len(histogram):
+            histogram[index] += count
+    return histogram
+
+
+def top_names(cart: ShoppingCart) -> list:
+    return nlargest(10, cart.iter_groups(), key=lambda group: group.subtotal_cents)
+
+
+def timed(function) -> float:
+    """Time a function with the garbage collector off, like timeit."""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=1_000_000)
+    parser.add_argument('--names', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    def new_items():
+        return [Item(name=f"Item {rng.randrange(args.names)}", price=rng.choice(PRICES)) for _ in range(args.units)]
+
+    results = {}
+    for label, cart_class in (('dict', ShoppingCart), ('columnar', ColumnarShoppingCart)):
+        # Memory is measured on a cart of its own, as tracing slows everything down
+        gc.collect()
+        tracemalloc.start()
+        cart = cart_class()
+        cart.add_items(new_items())
+        gc.collect()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del cart
+
+        items = new_items()
+        removed = items[::100]
+        cart = cart_class()
+        add_time = timed(lambda: cart.add_items(items))
+        del items
+        gc.collect()
+
+        if cart_class is ShoppingCart:
+            histogram, top = (lambda: price_histogram(cart)), (lambda: top_names(cart))
+        else:
+            histogram, top = (lambda: cart.price_histogram(BIN_EDGES)), (lambda: cart.top_names(10, 'subtotal_cents'))
+        results[label] = [
+            ('bytes per unit', memory / args.units),
+            ('add_items', add_time),
+            ('total_price', timed(lambda: cart.total_price)),
+            ('per-name subtotals', timed(lambda: list(cart.iter_groups()))),
+            ('top 10 names by subtotal', timed(top)),
+            ('price histogram', timed(histogram)),
+            ('list one name', timed(lambda: cart.list_items_by_name('Item 0'))),
+            (f"remove_items ({len(removed):,})", timed(lambda: cart.remove_items(removed))),
+        ]
+        del cart, removed
+
+    print(f"{args.units:,} units under {args.names:,} names, NumPy {'on' if columnar_cart.numpy else 'off'}")
+    print(f"{'operation':<28}  {'dict':>12}  {'columnar':>12}")
+    for (label, dict_value), (_, columnar_value) in zip(results['dict'], results['columnar']):
+        if label == 'bytes per unit':
+            print(f"{label:<28}  {dict_value:>12,.0f}  {columnar_value:>12,.0f}")
+        else:
+            print(f"{label:<28}  {dict_value * 1000:>9,.2f} ms  {columnar_value * 1000:>9,.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
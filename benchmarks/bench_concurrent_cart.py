@@ -0,0 +1,99 @@
+"""Compare a cart behind one lock with ConcurrentShoppingCart under contention.
+
+Usage:
+    python -m benchmarks.bench_concurrent_cart [--threads 8] [--operations 20000] [--stripes 16]
+"""
+import argparse
+import threading
+import time
+
+from shopping_cart.models.concurrent_cart import ConcurrentShoppingCart
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class LockedShoppingCart:
+    """A ShoppingCart behind a single lock, the simplest way to share one."""
+
+    def __init__(self):
+        self.cart = ShoppingCart()
+        self.lock = threading.Lock()
+
+    def add_item(self, item):
+        with self.lock:
+            self.cart.add_item(item)
+
+    def remove_item(self, item):
+        with self.lock:
+            self.cart.remove_item(item)
+
+    def generate_receipt(self, format_type, **options):
+        with self.lock:
+            return self.cart.generate_receipt(format_type, **options)
+
+
+def run(cart, threads: int, operations: int, shared_name: bool, with_reader: bool) -> tuple:
+    """Have every thread add then remove its items.
+
+    Returns:
+        The elapsed time and the slowest single operation, in seconds.
+    """
+    batches = [
+        [Item(name='Shared' if shared_name else f"Thread {thread_number} item {i % 8}", price=1.25)
+         for i in range(operations)]
+        for thread_number in range(threads)
+    ]
+    barrier = threading.Barrier(threads + 1)
+    done = threading.Event()
+    slowest = [0.0] * threads
+
+    def worker(thread_number, items):
+        barrier.wait()
+        for operation in (cart.add_item, cart.remove_item):
+            for item in items:
+                start = time.perf_counter()
+                operation(item)
+                slowest[thread_number] = max(slowest[thread_number], time.perf_counter() - start)
+
+    def reader():
+        while not done.is_set():
+            cart.generate_receipt('csv')
+
+    workers = [threading.Thread(target=worker, args=(number, items)) for number, items in enumerate(batches)]
+    for thread in workers:
+        thread.start()
+    reader_thread = threading.Thread(target=reader)
+    if with_reader:
+        reader_thread.start()
+    start = time.perf_counter()
+    barrier.wait()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    if with_reader:
+        reader_thread.join()
+    return elapsed, max(slowest)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--operations', type=int, default=20_000)
+    parser.add_argument('--stripes', type=int, default=16)
+    args = parser.parse_args()
+
+    total_operations = 2 * args.threads * args.operations
+    print(f"{args.threads} threads x {args.operations} adds and removes, {args.stripes} stripes")
+    print(f"{'workload':<32}  {'cart':<8}  {'throughput':>13}  {'slowest op':>10}")
+    for label, shared_name, with_reader in (
+        ('distinct names', False, False),
+        ('distinct names, receipt reader', False, True),
+        ('one shared name', True, False),
+    ):
+        for cart_label, cart in (('one lock', LockedShoppingCart()), ('striped', ConcurrentShoppingCart(args.stripes))):
+            elapsed, slowest = run(cart, args.threads, args.operations, shared_name, with_reader)
+            print(f"{label:<32}  {cart_label:<8}  {total_operations / elapsed:>8,.0f} op/s  {slowest * 1000:>7.1f} ms")
+
+if __name__ == '__main__':
+    main()
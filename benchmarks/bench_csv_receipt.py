@@ -0,0 +1,73 @@
+"""Compare CSV receipt rendering against the original string joins and plain csv.writer.
+
+Usage:
+    python -m benchmarks.bench_csv_receipt [--units 1000000]
+"""
+import argparse
+import csv
+import io
+import os
+import tempfile
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.csv_receipt_strategy import CSVReceiptStrategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def join_receipt(data: dict) -> str:
+    """Render the receipt the way the original strategy did, without quoting."""
+    output = [','.join(['UID', 'Name', 'Unit Price'])]
+    for item_name, item_group in data['items'].items():
+        for item in item_group['instances']:
+            row = [str(item.uid), item.name, f"{item.price:.2f}"]
+            output.append(','.join(row))
+    output.append(f"Total Price,,{data['total_price']:.2f}")
+    return '\n'.join(output)
+
+
+def writerows_receipt(data: dict) -> str:
+    """Render the receipt by passing every row through csv.writer."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(CSVReceiptStrategy().iter_rows(data))
+    return buffer.getvalue()
+
+
+def timed(function) -> float:
+    """Run function and return its duration in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    cart = ShoppingCart()
+    cart.add_items(Item(name=f"Product {i % 1000}", price=1.99) for i in range(args.units))
+    data = cart._receipt_data()
+    strategy = CSVReceiptStrategy()
+    # Generate the lazy UIDs up front so that no variant pays for them
+    for item_group in data['items'].values():
+        for item in item_group['instances']:
+            item.uid
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'receipt.csv')
+        results = [
+            ('original joins', timed(lambda: join_receipt(data))),
+            ('csv.writer writerows', timed(lambda: writerows_receipt(data))),
+            ('strategy generate', timed(lambda: strategy.generate(data))),
+            ('strategy stream to file', timed(lambda: strategy.write_file(data, file_path))),
+            ('grouped', timed(lambda: CSVReceiptStrategy(grouped=True).generate(data))),
+        ]
+
+    print(f"{args.units} rows")
+    for label, elapsed in results:
+        print(f"{label:<26}  {elapsed:>7.2f} s  {args.units / elapsed:>12,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
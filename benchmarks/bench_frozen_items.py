@@ -0,0 +1,61 @@
+"""Measure the cost of listing a large cart and of the first changes after a listing.
+
+Usage:
+    python -m benchmarks.bench_frozen_items [--units 1000000] [--names 100] [--repeat 20]
+"""
+import argparse
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def copied_listing(cart: ShoppingCart) -> dict:
+    """List the cart the way list_items used to, with shallow copies of every group."""
+    return {
+        item_name: {**item_group, 'instances': item_group['instances'].copy(), 'lines': item_group['lines'].copy()}
+        for item_name, item_group in cart._items.items()
+    }
+
+
+def timed(function, repeat: int) -> float:
+    """Return the best time of a function over several runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=1_000_000)
+    parser.add_argument('--names', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    cart = ShoppingCart()
+    cart.add_items([Item(name=f"Item {i % args.names}", price=1.25) for i in range(args.units)])
+    extra = Item(name='Item 0', price=1.25)
+
+    def add_after_listing():
+        listing = cart.list_items()
+        cart.add_item(extra)
+        cart.remove_item(extra)
+        return listing
+
+    print(f"{args.units:,} units under {args.names} names")
+    print(f"{'operation':<36}  {'time':>12}")
+    for label, function in (
+        ('copy every group (previous)', lambda: copied_listing(cart)),
+        ('list_items', cart.list_items),
+        ('list_items_by_name', lambda: cart.list_items_by_name('Item 0')),
+        ('list, then add and remove one unit', add_after_listing),
+        ('add and remove one unit', lambda: (cart.add_item(extra), cart.remove_item(extra))),
+    ):
+        print(f"{label:<36}  {timed(function, args.repeat) * 1e6:>9,.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
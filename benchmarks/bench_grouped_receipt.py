@@ -0,0 +1,46 @@
+"""Compare grouped receipts with per-unit receipts as the number of units grows.
+
+Usage:
+    python -m benchmarks.bench_grouped_receipt [--names 100] [--units 10000 100000]
+"""
+import argparse
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+FORMATS = ('text', 'csv', 'json', 'yaml')
+
+
+def build_cart(names: int, units: int) -> ShoppingCart:
+    """Fill a cart with units spread evenly over names, added with quantities."""
+    cart = ShoppingCart()
+    for i in range(names):
+        cart.add_item(Item(name=f"Product {i}", price=1.99), quantity=max(units // names, 1))
+    return cart
+
+
+def timed(function) -> float:
+    """Run function and return its duration in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--names', type=int, default=100)
+    parser.add_argument('--units', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'units':>9}  {'format':<6}  {'grouped':>10}  {'per unit':>10}")
+    for units in args.units:
+        for format_type in FORMATS:
+            # Fresh carts so that neither run benefits from the receipt cache
+            grouped = timed(lambda: build_cart(args.names, units).generate_receipt(format_type, grouped=True))
+            per_unit = timed(lambda: build_cart(args.names, units).generate_receipt(format_type))
+            print(f"{units:>9}  {format_type:<6}  {grouped * 1000:>8.2f}ms  {per_unit * 1000:>8.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
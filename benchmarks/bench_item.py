@@ -0,0 +1,75 @@
+"""Benchmark constructing items with the slotted Item against the original dataclass.
+
+Usage:
+    python -m benchmarks.bench_item [--count 1000000]
+"""
+from dataclasses import dataclass, field
+import argparse
+import time
+import tracemalloc
+import uuid
+
+from shopping_cart.models.item import Item
+
+
+@dataclass(frozen=True)
+class DataclassItem:
+    """The original Item: a frozen dataclass with an eager uuid4() UID."""
+    name: str
+    price: float
+    uid: uuid.UUID = field(default_factory=uuid.uuid4)
+
+    def __post_init__(self):
+        if not isinstance(self.name, str):
+            raise TypeError("Item name nust be a string.")
+        elif not self.name:
+            raise ValueError("Item name must be a non-empty string.")
+        if not isinstance(self.price, float):
+            raise TypeError("Item price must be a float.")
+        elif self.price < 0:
+            raise ValueError("Price must be a non-negative float.")
+
+
+def build(item_class, count: int, read_uid: bool) -> list:
+    """Construct count items, optionally reading every UID."""
+    items = [item_class(name='Rice', price=1.80) for _ in range(count)]
+    if read_uid:
+        for item in items:
+            item.uid
+    return items
+
+
+def measure(item_class, count: int, read_uid: bool) -> tuple:
+    """Return construction time in seconds and retained memory in bytes."""
+    start = time.perf_counter()
+    items = build(item_class, count, read_uid)
+    elapsed = time.perf_counter() - start
+    del items
+
+    tracemalloc.start()
+    items = build(item_class, count, read_uid)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return elapsed, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.count} items")
+    print(f"{'class':<28}  {'time (s)':>9}  {'items/s':>12}  {'memory (MB)':>12}")
+    for label, item_class, read_uid in (
+        ('dataclass + uuid4', DataclassItem, False),
+        ('slotted, UID never read', Item, False),
+        ('slotted, UID read', Item, True),
+    ):
+        elapsed, retained = measure(item_class, args.count, read_uid)
+        print(f"{label:<28}  {elapsed:>9.2f}  {args.count / elapsed:>12,.0f}  "
+              f"{retained / 2 ** 20:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
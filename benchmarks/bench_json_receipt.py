@@ -0,0 +1,52 @@
+"""Compare JSON receipt size and encode time across layouts and encoders.
+
+Usage:
+    python -m benchmarks.bench_json_receipt [--sizes 1000 10000 100000]
+"""
+import argparse
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts import json_receipt_strategy
+from shopping_cart.models.receipts.json_receipt_strategy import JSONReceiptStrategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def variants() -> list:
+    """List the (label, strategy) pairs to compare, skipping missing encoders."""
+    strategies = [
+        ('indented', JSONReceiptStrategy()),
+        ('compact json', JSONReceiptStrategy(compact=True, encoder='json')),
+    ]
+    for encoder in ('ujson', 'orjson'):
+        if getattr(json_receipt_strategy, encoder) is not None:
+            strategies.append((f"compact {encoder}", JSONReceiptStrategy(compact=True, encoder=encoder)))
+    return strategies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'units':>8}  {'variant':<15}  {'size (KB)':>10}  {'str (ms)':>9}  {'bytes (ms)':>10}")
+    for size in args.sizes:
+        cart = ShoppingCart()
+        cart.add_items(Item(name=f"Product {i % 1000}", price=1.99) for i in range(size))
+        data = cart._receipt_data()
+
+        for label, strategy in variants():
+            start = time.perf_counter()
+            content = strategy.generate(data)
+            str_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            content_bytes = strategy.generate_bytes(data)
+            bytes_time = time.perf_counter() - start
+
+            print(f"{size:>8}  {label:<15}  {len(content_bytes) / 1024:>10.0f}  "
+                  f"{str_time * 1e3:>9.1f}  {bytes_time * 1e3:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
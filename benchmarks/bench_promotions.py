@@ -0,0 +1,80 @@
+"""Measure what promotions cost per add, and the discounted total against a recomputation.
+
+Usage:
+    python -m benchmarks.bench_promotions [--units 200000] [--names 1000] [--promotions 500]
+"""
+import argparse
+import gc
+import random
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.promotions import BuyOneGetOneFree, MultiBuy, PercentOff, SpendThreshold
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+PRICES = [0.25, 0.99, 1.49, 2.50, 4.99]
+
+
+def make_promotions(count: int) -> list:
+    """Spread item promotions of every kind over the first names, plus two cart thresholds."""
+    kinds = (lambda name: BuyOneGetOneFree(name), lambda name: MultiBuy(name, 3, 2.00),
+             lambda name: PercentOff(name, 10))
+    promotions = [kinds[i % len(kinds)](f"Item {i}") for i in range(count)]
+    return promotions + [SpendThreshold(100.00, amount_off=5.00), SpendThreshold(500.00, percent_off=5)]
+
+
+def timed(function) -> float:
+    """Time a function with the garbage collector off, like timeit."""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=200_000)
+    parser.add_argument('--names', type=int, default=1000)
+    parser.add_argument('--promotions', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    items = [Item(name=f"Item {rng.randrange(args.names)}", price=rng.choice(PRICES)) for _ in range(args.units)]
+    # Generate the UIDs up front, so that the first cart does not pay for them
+    for item in items:
+        item.uid
+    promotions = make_promotions(args.promotions)
+
+    print(f"{args.units:,} units under {args.names:,} names, {len(promotions):,} promotions")
+    print(f"{'operation':<32}  {'none':>12}  {'promotions':>12}")
+    results = {}
+    for label, rules in (('none', None), ('promotions', promotions)):
+        cart = ShoppingCart(promotions=rules)
+
+        def add_one_by_one():
+            for item in items:
+                cart.add_item(item)
+
+        add_time = timed(add_one_by_one)
+        cart.clear_cart()
+        bulk_time = timed(lambda: cart.add_items(items))
+        read_time = timed(lambda: [cart.total_due_cents for _ in range(1000)]) / 1000
+        results[label] = [('add_item, per unit', add_time / args.units),
+                          ('add_items, per unit', bulk_time / args.units),
+                          ('read the total due', read_time)]
+
+    for (label, plain), (_, promoted) in zip(results['none'], results['promotions']):
+        print(f"{label:<32}  {plain * 1e6:>9,.2f} µs  {promoted * 1e6:>9,.2f} µs")
+
+    # What keeping the discounts up to date saves: evaluating every promotion after each change
+    rebuilt = ShoppingCart()
+    rebuilt.add_items(items)
+    rebuild_time = timed(lambda: rebuilt.set_promotions(promotions))
+    print(f"recomputing every discount from scratch: {rebuild_time * 1000:,.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
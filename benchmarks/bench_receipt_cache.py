@@ -0,0 +1,43 @@
+"""Benchmark regenerating receipts with the receipt and line caches.
+
+Each round mutates the cart by one unit and then renders the receipt four
+times (preview, confirm, email, archive), as a checkout does.
+
+Usage:
+    python -m benchmarks.bench_receipt_cache [--units 100000] [--rounds 5] [--format text]
+"""
+import argparse
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def run(cart: ShoppingCart, rounds: int, format_type: str) -> float:
+    """Return the mean time per checkout round in milliseconds."""
+    cart.generate_receipt(format_type)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cart.add_item(Item(name='Last Minute', price=0.99))
+        for _ in range(4):
+            cart.generate_receipt(format_type)
+    return (time.perf_counter() - start) / rounds * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=100_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--format', default='text')
+    args = parser.parse_args()
+
+    items = [Item(name=f"Product {i % 1000}", price=1.99) for i in range(args.units)]
+    print(f"{args.units} units, {args.format} receipts")
+    for label, cache_receipt_lines in (('receipt cache', False), ('receipt + line cache', True)):
+        cart = ShoppingCart(cache_receipt_lines=cache_receipt_lines)
+        cart.add_items(items)
+        print(f"{label:<22}  {run(cart, args.rounds, args.format):>8.1f} ms per checkout")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Measure the throughput of rebuilding carts from receipt files.
+
+Usage:
+    python -m benchmarks.bench_receipt_parsers [--units 200000] [--names 1000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+LAYOUTS = [
+    ('csv', {}),
+    ('json', {}),
+    ('json', {'compact': True}),
+    ('yaml', {}),
+    ('yaml', {'compact': True}),
+]
+
+
+def load_whole_json(file_path: str) -> ShoppingCart:
+    """Rebuild a cart the ad-hoc way: decode the whole document, then build the items."""
+    with open(file_path, encoding='utf-8') as file:
+        receipt = json.load(file)
+    cart = ShoppingCart()
+    cart.add_items(Item(entry['name'], entry['unit_price'], uuid.UUID(entry['uid'])) for entry in receipt['items'])
+    return cart
+
+
+def timed(function) -> tuple:
+    """Run function and return its result and its duration in seconds."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=200_000)
+    parser.add_argument('--names', type=int, default=1000)
+    args = parser.parse_args()
+
+    cart = ShoppingCart()
+    cart.add_items(Item(name=f"Product {i % args.names}", price=(i % 500) / 100) for i in range(args.units))
+
+    print(f"{args.units} units under {args.names} names")
+    print(f"{'layout':<22}  {'size':>10}  {'time':>9}  {'units/s':>10}  {'MB/s':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for format_type, options in LAYOUTS:
+            label = format_type + (' compact' if options.get('compact') else '')
+            file_path = os.path.join(directory, f"receipt.{format_type}")
+            cart.write_receipt(file_path, format_type, **options)
+            size = os.path.getsize(file_path)
+
+            restored, elapsed = timed(lambda: ShoppingCart.load_receipt(file_path))
+            assert restored.total_price_cents == cart.total_price_cents
+            print(f"{label:<22}  {size / 1e6:>8.1f}MB  {elapsed:>7.3f} s  "
+                  f"{args.units / elapsed:>10,.0f}  {size / 1e6 / elapsed:>6.1f}")
+
+            if options == {} and format_type == 'json':
+                restored, elapsed = timed(lambda: load_whole_json(file_path))
+                assert restored.total_price_cents == cart.total_price_cents
+                print(f"{'json, whole document':<22}  {size / 1e6:>8.1f}MB  {elapsed:>7.3f} s  "
+                      f"{args.units / elapsed:>10,.0f}  {size / 1e6 / elapsed:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Compare peak memory of generate_receipt and write_receipt for large carts.
+
+Usage:
+    python -m benchmarks.bench_receipt_streaming [--units 200000] [--formats text csv json yaml]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def peak_memory(function) -> tuple:
+    """Run function and return its duration in seconds and peak allocation in bytes."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=200_000)
+    parser.add_argument('--formats', nargs='+', default=['text', 'csv', 'json', 'yaml'])
+    args = parser.parse_args()
+
+    cart = ShoppingCart()
+    cart.add_items(Item(name=f"Product {i % 1000}", price=1.99) for i in range(args.units))
+
+    print(f"{args.units} units")
+    print(f"{'format':<6}  {'generate (MB)':>13}  {'write (MB)':>10}  {'generate (s)':>12}  {'write (s)':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in args.formats:
+            file_path = os.path.join(directory, f"receipt.{fmt}")
+            generate_time, generate_peak = peak_memory(lambda: cart.generate_receipt(fmt, file_path))
+            write_time, write_peak = peak_memory(lambda: cart.write_receipt(file_path, fmt))
+            print(f"{fmt:<6}  {generate_peak / 2 ** 20:>13.1f}  {write_peak / 2 ** 20:>10.1f}  "
+                  f"{generate_time:>12.2f}  {write_time:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
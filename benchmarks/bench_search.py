@@ -0,0 +1,90 @@
+"""Measure type-ahead queries on the search index against scanning every name.
+
+Usage:
+    python -m benchmarks.bench_search [--names 500000] [--queries 1000]
+"""
+import argparse
+import gc
+import random
+import time
+
+from shopping_cart.models.search import SearchIndex
+
+BRANDS = ['Acme', 'Bright', 'Country', 'Daily', 'Evergreen', 'Farmhouse', 'Golden', 'Harvest', 'Island', 'Jolly',
+          'Kind', 'Lakeside', 'Meadow', 'Nature', 'Orchard', 'Prairie', 'Quality', 'Riverside', 'Sunny', 'Valley']
+KINDS = ['Organic', 'Fresh', 'Frozen', 'Smoked', 'Roasted', 'Spicy', 'Sweet', 'Salted', 'Unsalted', 'Whole',
+         'Sliced', 'Dried', 'Baby', 'Wild', 'Classic', 'Light', 'Extra', 'Premium', 'Mini', 'Large']
+PRODUCTS = ['Apple', 'Banana', 'Orange', 'Milk', 'Bread', 'Eggs', 'Cheese', 'Chocolate', 'Coffee', 'Tea',
+            'Chicken Breast', 'Salmon Fillet', 'Rice', 'Pasta', 'Tomato Sauce', 'Lettuce', 'Carrots', 'Potatoes',
+            'Yogurt', 'Cereal', 'Almonds', 'Butter', 'Cookies', 'Crackers', 'Granola', 'Honey', 'Juice', 'Ketchup',
+            'Lemonade', 'Mustard', 'Noodles', 'Olives', 'Peanuts', 'Quinoa', 'Raisins', 'Spinach', 'Tofu', 'Walnuts']
+SIZES = ['100g', '250g', '500g', '(1kg)', '(2kg)', '6 Pack', '12 Pack', '1L', '2L', 'Family Size']
+
+
+def typo(rng: random.Random, word: str) -> str:
+    """Swap two neighbouring letters of a word, or double one."""
+    position = rng.randrange(1, len(word) - 1)
+    if rng.random() < 0.5:
+        return word[:position - 1] + word[position] + word[position - 1] + word[position + 1:]
+    return word[:position] + word[position] + word[position:]
+
+
+def timed(function) -> float:
+    """Time a function with the garbage collector off, like timeit."""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--names', type=int, default=500_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = set()
+    while len(names) < args.names:
+        names.add(f"{rng.choice(BRANDS)} {rng.choice(KINDS)} {rng.choice(PRODUCTS)} {rng.choice(SIZES)} "
+                  f"#{rng.randrange(10_000)}")
+    names = list(names)
+    folded = [name.casefold() for name in names]
+
+    index = None
+
+    def build():
+        nonlocal index
+        index = SearchIndex(names)
+
+    print(f"{args.names:,} names, {args.queries:,} queries of each kind")
+    print(f"build the index: {timed(build):.2f} s")
+
+    # What is typed in the search box: the start of a name or of a word, or a word with a typo
+    samples = [rng.choice(names).casefold().split() for _ in range(args.queries)]
+    kinds = {
+        'start of a name': [' '.join(words)[:rng.randrange(1, 12)] for words in samples],
+        'start of a word': [rng.choice(words)[:rng.randrange(2, 6)] for words in samples],
+        'word with a typo': [typo(rng, max(words, key=len)) for words in samples],
+    }
+    print(f"{'query':<20}  {'index mean':>12}  {'index max':>12}  {'scan mean':>12}")
+    for label, queries in kinds.items():
+        times = []
+        for query in queries:
+            times.append(timed(lambda: index.search(query)))
+        scanned = queries[:10]
+        scan_time = timed(lambda: [[name for name in folded if query in name][:20] for query in scanned])
+        print(f"{label:<20}  {sum(times) / len(times) * 1000:>9,.3f} ms  {max(times) * 1000:>9,.3f} ms  "
+              f"{scan_time / len(scanned) * 1000:>9,.1f} ms")
+
+    added = [f"Zesty Lime Soda {i}" for i in range(100)]
+    add_time = timed(lambda: [index.add(name) for name in added])
+    remove_time = timed(lambda: [index.remove(name) for name in added])
+    print(f"add a name: {add_time / len(added) * 1000:.3f} ms, remove a name: {remove_time / len(added) * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
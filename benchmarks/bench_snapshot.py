@@ -0,0 +1,70 @@
+"""Measure saving and loading binary cart snapshots, and their size against receipts.
+
+Usage:
+    python -m benchmarks.bench_snapshot [--units 1000000] [--names 1000]
+"""
+import argparse
+import io
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class CountingStream(io.RawIOBase):
+    """A binary stream that only counts what is written to it."""
+
+    def __init__(self):
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+
+def timed(function) -> tuple:
+    """Run function and return its result and its duration in seconds."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=1_000_000)
+    parser.add_argument('--names', type=int, default=1000)
+    args = parser.parse_args()
+
+    cart = ShoppingCart()
+    cart.add_items(Item(name=f"Product {i % args.names}", price=(i % 500) / 100) for i in range(args.units))
+    # Generate the lazy UIDs up front so that saving does not pay for them
+    for item_group in cart.list_items().values():
+        for item in item_group['instances']:
+            item.uid
+
+    stream = io.BytesIO()
+    _, save_time = timed(lambda: cart.save_snapshot(stream))
+    snapshot = stream.getvalue()
+    restored, load_time = timed(lambda: ShoppingCart.load_snapshot(snapshot))
+    assert restored.total_price_cents == cart.total_price_cents
+    _, resave_time = timed(lambda: restored.save_snapshot(io.BytesIO()))
+    _, unpack_time = timed(lambda: restored.list_items_by_name('Product 0'))
+
+    print(f"{args.units} units under {args.names} names")
+    print(f"save                      {save_time:>7.3f} s")
+    print(f"load                      {load_time:>7.3f} s")
+    print(f"save again after load     {resave_time:>7.3f} s")
+    print(f"unpack one name           {unpack_time:>7.3f} s")
+
+    print(f"\nsnapshot          {len(snapshot):>14,} bytes")
+    for label, options in (('JSON receipt', {}), ('compact JSON', {'compact': True})):
+        counter = CountingStream()
+        cart.write_receipt(counter, 'json', **options)
+        print(f"{label:<16}  {counter.size:>14,} bytes  ({counter.size / len(snapshot):.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
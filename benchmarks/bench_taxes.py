@@ -0,0 +1,79 @@
+"""Measure what taxes cost per add, and the kept tax lines against walking every unit.
+
+Usage:
+    python -m benchmarks.bench_taxes [--units 200000] [--names 1000]
+"""
+import argparse
+import gc
+import random
+import time
+from collections import defaultdict
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+from shopping_cart.models.taxes import TaxTable
+
+PRICES = [0.25, 0.99, 1.49, 2.50, 4.99]
+
+
+def walk_taxes(cart: ShoppingCart, table: TaxTable) -> int:
+    """Compute the tax by walking every unit, the way callers did without a tax table."""
+    taxable_cents = defaultdict(int)
+    for item in cart.iter_items():
+        taxable_cents[table.category_of(item.name)] += item.price_cents
+    return sum(table.tax_cents(category, cents) for category, cents in taxable_cents.items())
+
+
+def timed(function) -> float:
+    """Time a function with the garbage collector off, like timeit."""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=200_000)
+    parser.add_argument('--names', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    items = [Item(name=f"Item {rng.randrange(args.names)}", price=rng.choice(PRICES)) for _ in range(args.units)]
+    # Generate the UIDs up front, so that the first cart does not pay for them
+    for item in items:
+        item.uid
+    categories = ('food', 'clothing', 'standard')
+    table = TaxTable({'standard': 8.875, 'food': 2.25, 'clothing': 4},
+                     categories={f"Item {i}": categories[i % 3] for i in range(args.names)})
+
+    print(f"{args.units:,} units under {args.names:,} names, {len(table.rates)} tax categories")
+    print(f"{'operation':<28}  {'none':>12}  {'taxes':>12}")
+    results = {}
+    for label, tax_table in (('none', None), ('taxes', table)):
+        cart = ShoppingCart(tax_table=tax_table)
+
+        def add_one_by_one():
+            for item in items:
+                cart.add_item(item)
+
+        add_time = timed(add_one_by_one)
+        cart.clear_cart()
+        bulk_time = timed(lambda: cart.add_items(items))
+        if tax_table is None:
+            tax_time = timed(lambda: walk_taxes(cart, table))
+        else:
+            tax_time = timed(lambda: cart.tax_lines())
+        results[label] = [('add_item, per unit', add_time / args.units * 1e6, 'µs'),
+                          ('add_items, per unit', bulk_time / args.units * 1e6, 'µs'),
+                          ('tax of the cart', tax_time * 1000, 'ms')]
+
+    for (label, plain, unit), (_, taxed, _) in zip(results['none'], results['taxes']):
+        print(f"{label:<28}  {plain:>9,.2f} {unit}  {taxed:>9,.2f} {unit}")
+
+
+if __name__ == '__main__':
+    main()
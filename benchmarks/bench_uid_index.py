@@ -0,0 +1,54 @@
+"""Benchmark ShoppingCart.remove_item and get_item against the group size.
+
+Every cart holds a single name group, so without the UID index the cost of
+each call grows with the number of instances in that group.
+
+Usage:
+    python -m benchmarks.bench_uid_index [--sizes 10 1000 1000000] [--samples 1000]
+"""
+import argparse
+import random
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def bench(size: int, samples: int) -> tuple:
+    """Return the mean get_item and remove_item cost in microseconds."""
+    cart = ShoppingCart()
+    items = [Item(name='Rice', price=1.80) for _ in range(size)]
+    for item in items:
+        cart.add_item(item)
+
+    targets = random.sample(items, min(samples, size))
+    uids = [str(item.uid) for item in targets]
+
+    start = time.perf_counter()
+    for uid in uids:
+        cart.get_item('Rice', uid)
+    get_cost = (time.perf_counter() - start) / len(targets) * 1e6
+
+    start = time.perf_counter()
+    for item in targets:
+        cart.remove_item(item)
+    remove_cost = (time.perf_counter() - start) / len(targets) * 1e6
+
+    return get_cost, remove_cost
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--samples', type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'instances':>10}  {'get_item (us)':>14}  {'remove_item (us)':>17}")
+    for size in args.sizes:
+        get_cost, remove_cost = bench(size, args.samples)
+        print(f"{size:>10}  {get_cost:>14.2f}  {remove_cost:>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
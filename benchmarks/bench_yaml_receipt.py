@@ -0,0 +1,42 @@
+"""Report YAML receipt throughput in items per second for each emitter and layout.
+
+Usage:
+    python -m benchmarks.bench_yaml_receipt [--units 20000]
+"""
+import argparse
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts import yaml_receipt_strategy
+from shopping_cart.models.receipts.text_receipt_strategy import TextReceiptStrategy
+from shopping_cart.models.receipts.yaml_receipt_strategy import YAMLReceiptStrategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=20_000)
+    args = parser.parse_args()
+
+    cart = ShoppingCart()
+    cart.add_items(Item(name=f"Product {i % 1000}", price=1.99) for i in range(args.units))
+    data = cart._receipt_data()
+
+    strategies = [('text (reference)', TextReceiptStrategy())]
+    for compact in (False, True):
+        layout = 'flow' if compact else 'block'
+        strategies.append((f"yaml {layout}, python", YAMLReceiptStrategy(compact=compact, use_libyaml=False)))
+        if yaml_receipt_strategy.LibYAMLDumper is not None:
+            strategies.append((f"yaml {layout}, libyaml", YAMLReceiptStrategy(compact=compact)))
+
+    print(f"{args.units} units")
+    print(f"{'strategy':<22}  {'time (s)':>9}  {'items/s':>12}")
+    for label, strategy in strategies:
+        start = time.perf_counter()
+        strategy.generate(data)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<22}  {elapsed:>9.2f}  {args.units / elapsed:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Stress random add/remove operations and check the cart total exactly.
+
+Usage:
+    python -m benchmarks.stress_money [--operations 10000000] [--seed 0]
+"""
+from decimal import Decimal
+import argparse
+import random
+import time
+
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+PRICES = [0.01, 0.05, 0.10, 0.29, 0.33, 0.99, 1.15, 3.49, 19.99, 1234.56]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', type=int, default=10_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    templates = [Item(name=f"Product {i}", price=price) for i, price in enumerate(PRICES)]
+    cart = ShoppingCart()
+    in_cart = []
+    float_total = 0.0
+
+    start = time.perf_counter()
+    for _ in range(args.operations):
+        if in_cart and rng.random() < 0.45:
+            position = rng.randrange(len(in_cart))
+            in_cart[position], in_cart[-1] = in_cart[-1], in_cart[position]
+            item = in_cart.pop()
+            cart.remove_item(item)
+            float_total -= item.price
+        else:
+            template = rng.choice(templates)
+            item = Item(name=template.name, price=template.price)
+            cart.add_item(item)
+            in_cart.append(item)
+            float_total += item.price
+    elapsed = time.perf_counter() - start
+
+    expected = sum(Decimal(repr(item.price)) for item in in_cart)
+    print(f"{args.operations} operations in {elapsed:.1f}s, {len(in_cart)} units left")
+    print(f"expected total:       {expected}")
+    print(f"cart total (cents):   {cart.total_price_cents}")
+    print(f"float accumulator:    {float_total!r}")
+    assert cart.total_price_cents == int(expected * 100), "cart total drifted"
+    print("cart total is exact")
+
+
+if __name__ == '__main__':
+    main()
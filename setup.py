@@ -8,6 +8,10 @@ setup(
         'PyYAML>=5.4.1',
         'PyQt5>=5.15.0'
     ],
+    extras_require={
+        'fast': ['orjson>=3.0'],
+        'columnar': ['numpy>=1.17'],
+    },
     python_requires='>=3.7',
     include_package_data=True,
     description='A shopping cart application',
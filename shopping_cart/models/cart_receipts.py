@@ -0,0 +1,231 @@
+from concurrent.futures import Executor
+from typing import IO, Dict, Hashable, Optional, Tuple, Union
+import logging
+import uuid
+from shopping_cart.models.cart_snapshot import write_snapshot
+from shopping_cart.models.receipts.async_receipt_strategy import get_async_receipt_strategy
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from shopping_cart.models.receipts.receipt_parsers import format_of_file, get_receipt_parser
+from shopping_cart.models.receipts.receipt_strategy_factory import get_receipt_strategy
+
+logger = logging.getLogger(__name__)
+
+
+class CartReceiptsMixin:
+    """Receipts and snapshots, shared by every cart type.
+
+    A cart keeps its contents however it likes and describes them through a
+    few hooks: _receipt_version, _receipt_data and _snapshot_contents, and
+    optionally _receipt_snapshot and _fragments_for. It must also set
+    `_receipt_cache` to an empty dictionary, where rendered receipts are
+    kept with the version they were rendered at.
+    """
+
+    _receipt_cache: Dict[BaseReceiptStrategy, Tuple[Hashable, str]]
+
+    def receipt_adjustments(self) -> Dict[str, any]:
+        """Collect the discounts and taxes printed after the total, with the total due.
+
+        Returns:
+            A dictionary merged into the data handed to receipt strategies:
+            empty unless the cart has promotions or taxes.
+        """
+        return {}
+
+    def save_snapshot(self, destination: Union[str, IO[bytes]]) -> None:
+        """Save the cart in the compact binary snapshot format.
+
+        Each name is stored once with its units' distinct prices, a small
+        integer price index and the raw 16-byte UID of every unit, and the
+        counted lines as they are. Snapshots saved by any cart type can be
+        loaded by ShoppingCart and ColumnarShoppingCart.
+
+        Args:
+            destination: A file path or a writable binary stream.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        items, total_quantity, total_price_cents = self._snapshot_contents()
+        if not isinstance(destination, str):
+            write_snapshot(destination, items, total_quantity, total_price_cents)
+            return
+        try:
+            with open(destination, 'wb') as file:
+                write_snapshot(file, items, total_quantity, total_price_cents)
+        except IOError as e:
+            raise IOError(f"Unable to write to file: {destination}") from e
+        logger.debug(f"Saved snapshot of {total_quantity} items to {destination}.")
+
+    @classmethod
+    def load_receipt(cls, source: Union[str, IO], format_type: Optional[str] = None,
+                     cart_options: Optional[Dict[str, any]] = None, **options) -> 'CartReceiptsMixin':
+        """Rebuild a cart from a per-unit CSV, JSON or YAML receipt.
+
+        The receipt is parsed incrementally and every unit keeps the UID
+        printed on it. The cart is only built once the whole receipt has
+        been read and its total price checked.
+
+        Args:
+            source: A file path, or a readable text or binary stream.
+            format_type: The receipt format ('csv', 'json', 'yaml'). Defaults
+                to the one of the file's extension.
+            cart_options: Arguments for the cart's constructor.
+            **options: Options for the format's parser, e.g. the dialect of CSV receipts.
+
+        Returns:
+            The rebuilt cart.
+
+        Raises:
+            IOError: If the file cannot be read.
+            ValueError: If the format cannot be parsed or told from the file
+                name, if the receipt is grouped or invalid, or if its total
+                price does not match its units.
+        """
+        if format_type is None:
+            if not isinstance(source, str):
+                raise ValueError("The format of a receipt stream must be given as format_type.")
+            format_type = format_of_file(source)
+        parser = get_receipt_parser(format_type, **options)
+
+        cart = cls(**(cart_options or {}))
+        if isinstance(source, str):
+            with parser.open(source) as stream:
+                cart.add_items(parser.iter_items(stream))
+        else:
+            cart.add_items(parser.iter_items(source))
+        logger.debug(f"Loaded {cart.total_quantity} items from a {format_type} receipt.")
+        return cart
+
+    def generate_receipt(self, format_type: str = 'text', file_path: Optional[str] = None, **options) -> str:
+        """Generate a receipt using the specified format.
+
+        Every unit is listed with a UID. Units added with a quantity get an
+        Item built for the receipt, which the cart does not keep, with the
+        UID derived from its line. With grouped=True the receipt has one line
+        per item name instead, built from the quantity and subtotal kept for
+        each name, so its cost depends on the number of names rather than the
+        number of units. The receipt is cached per format and options, and
+        reused until the cart changes.
+
+        Args:
+            format_type: The format type ('csv', 'text', 'json', 'yaml').
+            file_path: Optional file path to save the receipt.
+            **options: Options for the format's strategy, e.g. grouped=True,
+                or compact=True for JSON.
+
+        Returns:
+            The receipt content as a string.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        strategy = get_receipt_strategy(format_type, **options)
+
+        version, receipt_content = self._cached_receipt(strategy)
+        if receipt_content is not None:
+            if file_path:
+                strategy.save(receipt_content, file_path)
+            logger.debug(f"Receipt in {format_type} format reused from cache.")
+            return receipt_content
+
+        receipt_content = strategy.generate(self._receipt_data(strategy.grouped), file_path,
+                                            self._fragments_for(strategy))
+        self._receipt_cache[strategy] = (version, receipt_content)
+        logger.debug(f"Receipt generated in {format_type} format.")
+        return receipt_content
+
+    async def agenerate_receipt(self, format_type: str = 'text', file_path: Optional[str] = None,
+                                atomic: bool = False, max_concurrency: Optional[int] = None,
+                                executor: Optional[Executor] = None, **options) -> str:
+        """Generate a receipt without blocking the event loop.
+
+        The receipt is formatted and saved in an executor from a copy of the
+        cart's contents taken when the call starts, so the cart can keep
+        changing meanwhile. Receipts are cached like with generate_receipt,
+        but the fragments of cache_receipt_lines are not used.
+
+        Args:
+            format_type: The format type ('csv', 'text', 'json', 'yaml').
+            file_path: Optional file path to save the receipt.
+            atomic: Whether to save the receipt through a temporary file
+                renamed over the file path.
+            max_concurrency: The number of receipts formatted or written at
+                once, across every format (8 by default).
+            executor: The executor running the formatting and writing, the
+                event loop's default one if not given.
+            **options: Options for the format's strategy, e.g. grouped=True.
+
+        Returns:
+            The receipt content as a string.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+            ValueError: If max_concurrency is not positive.
+        """
+        async_strategy = get_async_receipt_strategy(format_type, max_concurrency, executor, **options)
+        strategy = async_strategy.strategy
+
+        version, receipt_content = self._cached_receipt(strategy)
+        if receipt_content is not None:
+            if file_path:
+                await async_strategy.save(receipt_content, file_path, atomic)
+            logger.debug(f"Receipt in {format_type} format reused from cache.")
+            return receipt_content
+
+        receipt_content = await async_strategy.generate(self._receipt_snapshot(strategy.grouped), file_path, atomic)
+        self._receipt_cache[strategy] = (version, receipt_content)
+        logger.debug(f"Receipt generated in {format_type} format.")
+        return receipt_content
+
+    def write_receipt(self, destination: Union[str, IO], format_type: str = 'text', **options) -> None:
+        """Stream a receipt to a file or a writable stream.
+
+        Unlike generate_receipt, the receipt is written piece by piece and is
+        never held in memory as a whole.
+
+        Args:
+            destination: A file path, or a writable text or binary stream.
+            format_type: The format type ('csv', 'text', 'json', 'yaml').
+            **options: Options for the format's strategy, e.g. compact=True for JSON.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        strategy = get_receipt_strategy(format_type, **options)
+        data = self._receipt_data(strategy.grouped)
+        if isinstance(destination, str):
+            strategy.write_file(data, destination, self._fragments_for(strategy))
+        else:
+            strategy.write(data, destination, self._fragments_for(strategy))
+        logger.debug(f"Receipt streamed in {format_type} format.")
+
+    def _cached_receipt(self, strategy: BaseReceiptStrategy) -> Tuple[Hashable, Optional[str]]:
+        """Get the cart's version, and the receipt cached for it if there is one.
+
+        The version is read before the receipt data is collected, so a
+        receipt is never cached with a version newer than its contents.
+        """
+        version = self._receipt_version()
+        cached_version, receipt_content = self._receipt_cache.get(strategy, (None, None))
+        return version, receipt_content if cached_version == version else None
+
+    def _receipt_version(self) -> Hashable:
+        """Get a value that changes whenever the contents of the cart do."""
+        raise NotImplementedError
+
+    def _receipt_data(self, grouped: bool = False) -> Dict[str, any]:
+        """Collect the data handed to receipt strategies, with every unit unless grouped."""
+        raise NotImplementedError
+
+    def _receipt_snapshot(self, grouped: bool = False) -> Dict[str, any]:
+        """Freeze the data handed to receipt strategies, to render it while the cart changes."""
+        return self._receipt_data(grouped)
+
+    def _fragments_for(self, strategy: BaseReceiptStrategy) -> Optional[Dict[uuid.UUID, str]]:
+        """Get the item fragment cache of a strategy, if fragments are cached."""
+        return None
+
+    def _snapshot_contents(self) -> Tuple[Dict[str, Dict[str, any]], int, int]:
+        """Get the item groups, total quantity and total price in cents written to snapshots."""
+        raise NotImplementedError
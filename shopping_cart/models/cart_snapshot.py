@@ -0,0 +1,281 @@
+from array import array
+from operator import attrgetter
+from typing import IO, Dict, Iterator, List, NamedTuple, Tuple, Union
+import struct
+import sys
+import uuid
+from shopping_cart.models.item import Item, uid_from_bytes
+
+# Binary snapshot layout, little-endian throughout:
+#
+#   header       magic, format version, flags, total quantity, total price in cents, group count
+#   group table  per name: the record below followed by the UTF-8 name
+#   group data   per name, in table order: the distinct unit prices (float64),
+#                each unit's index into them (uint8, uint16 or uint32 depending
+#                on the number of prices), each unit's raw 16-byte UID, then the
+#                counted lines as float64 prices followed by int64 quantities
+#
+# Everything needed for the totals is in the header and the group table, so
+# they can be read without decoding any unit.
+MAGIC = b'SCRT'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHqqI')
+GROUP = struct.Struct('<IqqQII')
+UID_SIZE = 16
+
+# Size of the unit price indices, by array typecode
+_INDEX_SIZES = {typecode: array(typecode).itemsize for typecode in 'BHI'}
+
+_get_price = attrgetter('price')
+_get_raw_uid = attrgetter('_uid')
+_uid_bytes = uuid.UUID.bytes.fget
+
+
+class SnapshotGroup(NamedTuple):
+    """An entry of the group table of a snapshot."""
+    name: str
+    total_quantity: int
+    total_price_cents: int
+    unit_count: int
+    price_count: int
+    line_count: int
+    offset: int
+
+
+def write_snapshot(stream: IO[bytes], items: Dict[str, Dict[str, any]],
+                   total_quantity: int, total_price_cents: int) -> None:
+    """Write cart contents to a binary stream as a snapshot.
+
+    Args:
+        stream: A writable binary stream.
+        items: The cart's item groups, keyed by name.
+        total_quantity: The cart's total quantity.
+        total_price_cents: The cart's total price in cents.
+    """
+    encoded_groups = [(item_name.encode('utf-8'), item_group, _encode_units(item_group))
+                      for item_name, item_group in items.items()]
+
+    stream.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, total_quantity, total_price_cents, len(encoded_groups)))
+    for name, item_group, (prices, price_indices, uids) in encoded_groups:
+        stream.write(GROUP.pack(len(name), item_group['total_quantity'], item_group['total_price_cents'],
+                                len(price_indices), len(prices), len(item_group['lines'])))
+        stream.write(name)
+
+    for name, item_group, (prices, price_indices, uids) in encoded_groups:
+        lines = item_group['lines']
+        for values in (prices, price_indices, uids, array('d', lines.keys()), array('q', lines.values())):
+            if values:
+                stream.write(_little_endian(values))
+
+
+def read_snapshot_source(source: Union[str, bytes, IO[bytes]]) -> bytes:
+    """Read the whole of a snapshot.
+
+    Args:
+        source: A file path, the snapshot's bytes, or a readable binary stream.
+
+    Returns:
+        The snapshot's bytes.
+
+    Raises:
+        IOError: If the file cannot be read.
+    """
+    if isinstance(source, str):
+        try:
+            with open(source, 'rb') as file:
+                return file.read()
+        except IOError as e:
+            raise IOError(f"Unable to read file: {source}") from e
+    if hasattr(source, 'read'):
+        return source.read()
+    return source
+
+
+def read_snapshot_header(buffer: bytes) -> Tuple[int, int, List[SnapshotGroup]]:
+    """Read the header and group table of a snapshot.
+
+    Args:
+        buffer: The snapshot, as bytes or any object supporting the buffer protocol.
+
+    Returns:
+        The total quantity, the total price in cents and the group table.
+
+    Raises:
+        ValueError: If the buffer is not a valid snapshot of a supported version.
+    """
+    total_quantity, total_price_cents, group_count = read_snapshot_totals(buffer)
+    groups = read_group_table(buffer, group_count)
+    if (sum(group.total_quantity for group in groups) != total_quantity
+            or sum(group.total_price_cents for group in groups) != total_price_cents):
+        raise ValueError("Corrupted shopping cart snapshot: group totals do not add up.")
+    return total_quantity, total_price_cents, groups
+
+
+def read_snapshot_totals(buffer: bytes) -> Tuple[int, int, int]:
+    """Read the fixed-size header of a snapshot.
+
+    Args:
+        buffer: The snapshot, as bytes or any object supporting the buffer protocol.
+
+    Returns:
+        The total quantity, the total price in cents and the number of groups.
+
+    Raises:
+        ValueError: If the buffer is not a snapshot of a supported version.
+    """
+    try:
+        magic, version, _, total_quantity, total_price_cents, group_count = HEADER.unpack_from(buffer, 0)
+    except struct.error as e:
+        raise ValueError("Not a shopping cart snapshot: the header is truncated.") from e
+    if magic != MAGIC:
+        raise ValueError("Not a shopping cart snapshot.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {version}; expected {FORMAT_VERSION}.")
+    return total_quantity, total_price_cents, group_count
+
+
+def read_group_table(buffer: bytes, group_count: int) -> List[SnapshotGroup]:
+    """Read the group table of a snapshot, which follows the header.
+
+    Args:
+        buffer: The snapshot, as bytes or any object supporting the buffer protocol.
+        group_count: The number of groups, from the header.
+
+    Returns:
+        The group table, in snapshot order.
+
+    Raises:
+        ValueError: If the group table does not match the size of the snapshot.
+    """
+    records = []
+    position = HEADER.size
+    try:
+        for _ in range(group_count):
+            record = GROUP.unpack_from(buffer, position)
+            position += GROUP.size
+            name = bytes(buffer[position:position + record[0]]).decode('utf-8')
+            position += record[0]
+            records.append((name, record))
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError("Corrupted shopping cart snapshot: invalid group table.") from e
+
+    groups = []
+    for name, (_, quantity, price_cents, unit_count, price_count, line_count) in records:
+        groups.append(SnapshotGroup(name, quantity, price_cents, unit_count, price_count, line_count, position))
+        position += _lines_offset(price_count, unit_count) + line_count * 16
+
+    if position != len(buffer):
+        raise ValueError("Corrupted shopping cart snapshot: unexpected data size.")
+    return groups
+
+
+def decode_units(buffer: bytes, group: SnapshotGroup) -> Dict[str, any]:
+    """Decode the units of a group, still packed.
+
+    Args:
+        buffer: The snapshot.
+        group: The group's entry in the group table.
+
+    Returns:
+        A dictionary with the raw 'uids', the distinct 'prices' and the
+        'price_indices' of the units, as consumed by unpack_units.
+    """
+    position = group.offset
+    prices = _read_array('d', buffer, position, group.price_count)
+    position += group.price_count * 8
+    price_indices = _read_array(_index_typecode(group.price_count), buffer, position, group.unit_count)
+    position += group.unit_count * price_indices.itemsize
+    uids = bytes(buffer[position:position + group.unit_count * UID_SIZE])
+    return {'uids': uids, 'prices': tuple(prices), 'price_indices': price_indices}
+
+
+def decode_lines(buffer: bytes, group: SnapshotGroup) -> Dict[float, int]:
+    """Decode the counted lines of a group.
+
+    Args:
+        buffer: The snapshot.
+        group: The group's entry in the group table.
+
+    Returns:
+        A mapping of unit price to a count.
+    """
+    position = group.offset + _lines_offset(group.price_count, group.unit_count)
+    prices = _read_array('d', buffer, position, group.line_count)
+    quantities = _read_array('q', buffer, position + group.line_count * 8, group.line_count)
+    return dict(zip(prices, quantities))
+
+
+def unpack_units(item_name: str, packed_units: Dict[str, any]) -> Iterator[Item]:
+    """Turn packed units into Item instances with their original UIDs.
+
+    Args:
+        item_name: The name of the units.
+        packed_units: Units as returned by decode_units.
+
+    Returns:
+        An iterator over the Item instances, in snapshot order.
+    """
+    uids = packed_units['uids']
+    prices = packed_units['prices']
+    for offset, price_index in zip(range(0, len(uids), UID_SIZE), packed_units['price_indices']):
+        yield Item(item_name, prices[price_index], uid_from_bytes(uids[offset:offset + UID_SIZE]))
+
+
+def _encode_units(item_group: Dict[str, any]) -> Tuple[array, array, bytes]:
+    """Encode the instances and packed units of a group as prices, price indices and UIDs."""
+    instances = item_group['instances']
+    packed_units = item_group['packed']
+    instance_prices = list(map(_get_price, instances))
+
+    # The packed units' prices come first so that their indices stay valid
+    price_positions = dict.fromkeys(packed_units['prices'] if packed_units else ())
+    price_positions.update(dict.fromkeys(instance_prices))
+    price_positions = {price: position for position, price in enumerate(price_positions)}
+
+    typecode = _index_typecode(len(price_positions))
+    if len(price_positions) == 1:
+        price_indices = array(typecode, bytes(len(instances)))
+    else:
+        price_indices = array(typecode, map(price_positions.__getitem__, instance_prices))
+
+    # Read the UIDs straight from the slot unless some were never generated
+    instance_uids = list(map(_get_raw_uid, instances))
+    if None in instance_uids:
+        instance_uids = [item.uid for item in instances]
+    uids = b''.join(map(_uid_bytes, instance_uids))
+    if packed_units:
+        price_indices.extend(array(price_indices.typecode, packed_units['price_indices']))
+        uids += packed_units['uids']
+    return array('d', price_positions), price_indices, uids
+
+
+def _index_typecode(price_count: int) -> str:
+    """Get the array typecode of the smallest unsigned type indexing price_count prices."""
+    if price_count <= 1 << 8:
+        return 'B'
+    if price_count <= 1 << 16:
+        return 'H'
+    return 'I'
+
+
+def _lines_offset(price_count: int, unit_count: int) -> int:
+    """Get the position of a group's counted lines relative to the start of its data."""
+    return price_count * 8 + unit_count * (_INDEX_SIZES[_index_typecode(price_count)] + UID_SIZE)
+
+
+def _read_array(typecode: str, buffer: bytes, position: int, count: int) -> array:
+    """Read count little-endian values of the given type from the buffer."""
+    values = array(typecode)
+    values.frombytes(buffer[position:position + count * values.itemsize])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _little_endian(values: any) -> bytes:
+    """Get the little-endian bytes of an array, or bytes as they are."""
+    if isinstance(values, bytes) or sys.byteorder == 'little':
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
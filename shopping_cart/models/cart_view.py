@@ -0,0 +1,196 @@
+from typing import Dict, List, Optional, Sequence
+import logging
+import mmap
+from shopping_cart.models.cart_snapshot import (
+    SnapshotGroup, decode_lines, decode_units, read_group_table, read_snapshot_totals, unpack_units
+)
+from shopping_cart.models.frozen_items import FrozenInstances, iter_group_units
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from shopping_cart.models.receipts.receipt_strategy_factory import get_receipt_strategy
+
+logger = logging.getLogger(__name__)
+
+
+class CartView:
+    """A read-only cart backed by a memory-mapped snapshot file.
+
+    Opening a view only reads the snapshot's fixed-size header, which holds
+    the cart's totals. The group table is read the first time a name is
+    looked up, and the units of a name are only decoded when they are listed
+    or put on a receipt, so scanning the totals of many archived carts
+    touches little more than their first bytes.
+
+    Units that were added with a quantity are listed with the UIDs derived
+    from their line, the same ones the cart listed them with.
+    """
+
+    def __init__(self, file_path: str):
+        """Open a view over a snapshot file saved with ShoppingCart.save_snapshot.
+
+        Args:
+            file_path: The path of the snapshot file.
+
+        Raises:
+            IOError: If the file cannot be read.
+            ValueError: If the file is not a valid snapshot of a supported version.
+        """
+        try:
+            with open(file_path, 'rb') as file:
+                self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            # mmap refuses empty files
+            raise ValueError("Not a shopping cart snapshot: the file is empty.") from e
+        except IOError as e:
+            raise IOError(f"Unable to read file: {file_path}") from e
+
+        try:
+            self._total_quantity, self._total_price_cents, self._group_count = read_snapshot_totals(self._buffer)
+        except ValueError:
+            self._buffer.close()
+            raise
+        self._groups: Optional[Dict[str, SnapshotGroup]] = None
+        self._instances: Dict[str, List[Item]] = {}
+        self._receipt_cache: Dict[BaseReceiptStrategy, str] = {}
+
+    def close(self) -> None:
+        """Unmap the snapshot file. Items already listed remain usable."""
+        self._buffer.close()
+
+    def __enter__(self) -> 'CartView':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def list_item_names(self) -> List[str]:
+        """List the names of the items in the cart.
+
+        Returns:
+            The item names, in the order they were added.
+        """
+        return list(self._load_groups())
+
+    def list_items_by_name(self, item_name: str) -> Sequence[Item]:
+        """List all item instances in the cart that have the specified name.
+
+        Args:
+            item_name: The name of the items to list.
+
+        Returns:
+            A read-only sequence of Item instances.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        return FrozenInstances(self._instances_of(item_name))
+
+    def get_total_quantity_by_name(self, item_name: str) -> int:
+        """Get the total quantity of items with the specified name.
+
+        Args:
+            item_name: The name of the items.
+
+        Returns:
+            The total quantity as an integer.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        return self._group(item_name).total_quantity
+
+    @property
+    def total_price(self) -> float:
+        """Get the total price of all items in the cart.
+
+        Returns:
+            The total price as a float with two decimals.
+        """
+        return self._total_price_cents / 100
+
+    @property
+    def total_price_cents(self) -> int:
+        """Get the exact total price of all items in the cart.
+
+        Returns:
+            The total price in cents as an integer.
+        """
+        return self._total_price_cents
+
+    @property
+    def total_quantity(self) -> int:
+        """Get the total quantity of all items in the cart.
+
+        Returns:
+            The total quantity as an integer.
+        """
+        return self._total_quantity
+
+    def generate_receipt(self, format_type: str = 'text', file_path: Optional[str] = None, **options) -> str:
+        """Generate a receipt using the specified format.
+
+        Grouped receipts only read the group table; per-unit receipts decode
+        every unit. Receipts are cached per format and options.
+
+        Args:
+            format_type: The format type ('csv', 'text', 'json', 'yaml').
+            file_path: Optional file path to save the receipt.
+            **options: Options for the format's strategy, e.g. grouped=True.
+
+        Returns:
+            The receipt content as a string.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        strategy = get_receipt_strategy(format_type, **options)
+        receipt_content = self._receipt_cache.get(strategy)
+        if receipt_content is None:
+            receipt_content = strategy.generate(self._receipt_data(strategy.grouped))
+            self._receipt_cache[strategy] = receipt_content
+            logger.debug(f"Receipt generated in {format_type} format.")
+        if file_path:
+            strategy.save(receipt_content, file_path)
+        return receipt_content
+
+    def _load_groups(self) -> Dict[str, SnapshotGroup]:
+        """Read the group table on first use."""
+        if self._groups is None:
+            groups = read_group_table(self._buffer, self._group_count)
+            self._groups = {group.name: group for group in groups}
+        return self._groups
+
+    def _group(self, item_name: str) -> SnapshotGroup:
+        """Get the group table entry of a name.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        group = self._load_groups().get(item_name)
+        if group is None:
+            raise KeyError(f"Item '{item_name}' not found in the cart.")
+        return group
+
+    def _instances_of(self, item_name: str) -> List[Item]:
+        """Decode the units of a name into Item instances, once."""
+        instances = self._instances.get(item_name)
+        if instances is None:
+            group = self._group(item_name)
+            instances = list(unpack_units(item_name, decode_units(self._buffer, group)))
+            instances.extend(iter_group_units(item_name, {'lines': decode_lines(self._buffer, group)}))
+            self._instances[item_name] = instances
+        return instances
+
+    def _receipt_data(self, grouped: bool) -> Dict[str, any]:
+        """Collect the data handed to receipt strategies, with units unless grouped."""
+        items = {
+            item_name: {
+                'instances': [] if grouped else self._instances_of(item_name),
+                'lines': {},
+                'packed': None,
+                'total_quantity': group.total_quantity,
+                'total_price_cents': group.total_price_cents
+            }
+            for item_name, group in self._load_groups().items()
+        }
+        return {'items': items, 'total_price': self.total_price}
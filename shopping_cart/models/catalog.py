@@ -0,0 +1,367 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import starmap
+from operator import attrgetter
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import csv
+import json
+import logging
+import math
+import sys
+from shopping_cart.models.item import Item, item_from_template, to_cents
+from shopping_cart.models.search import SearchIndex
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_price_cents = attrgetter('price_cents')
+_new_tuple = tuple.__new__
+
+CSV_HEADER = ['SKU', 'Name', 'Price']
+
+
+class ItemTemplate(NamedTuple):
+    """A product of the catalog, from which cart items are built."""
+
+    sku: str
+    name: str
+    price: float
+    price_cents: int
+
+    def new_item(self) -> Item:
+        """Build a new Item, with its own UID, for a unit of this product."""
+        return item_from_template(self.name, self.price, self.price_cents)
+
+
+class Catalog:
+    """The products items can be made of, indexed by SKU, by name and by price.
+
+    SKUs and names are looked up in hash indexes. A price index, sorted by
+    price in cents, answers range queries with two binary searches, and a
+    SearchIndex answers type-ahead queries on names. Bulk loads only fill
+    the SKU index: the other indexes are built on their first query after
+    one, then kept up to date by single additions and removals. Names are
+    interned, so every template of a name and every Item built from them
+    share a single string.
+    """
+
+    def __init__(self, templates: Iterable[Tuple[str, str, float]] = ()):
+        """Initialize the catalog.
+
+        Args:
+            templates: (sku, name, price) tuples to add, as with add_many.
+        """
+        self._templates: Dict[str, ItemTemplate] = {}
+        # Each name maps to its template, or to a list of them when several
+        # SKUs share it, which saves a list per name in large catalogs.
+        # None until needed after a bulk load, like the price index
+        self._by_name: Optional[Dict[str, Union[ItemTemplate, List[ItemTemplate]]]] = None
+        # Sorted price index: prices in cents, and the templates in the same order
+        self._price_keys: Optional[array] = None
+        self._price_templates: Optional[List[ItemTemplate]] = None
+        self._search: Optional[SearchIndex] = None
+        self._next_sku = 1
+        self.add_many(templates)
+
+    def add(self, name: str, price: float, sku: Optional[str] = None) -> ItemTemplate:
+        """Add a product to the catalog.
+
+        Args:
+            name: The name of the product.
+            price: The unit price of the product.
+            sku: The product's SKU. Defaults to the next free number.
+
+        Returns:
+            The product's template.
+
+        Raises:
+            TypeError: If the name or SKU is not a string or the price is not a float.
+            ValueError: If the name is empty, the price is negative or not
+                finite, or the SKU is already in the catalog.
+        """
+        template = self._new_template(self._free_sku() if sku is None else sku, name, price)
+        if template.sku in self._templates:
+            raise ValueError(f"SKU '{template.sku}' is already in the catalog.")
+        self._templates[template.sku] = template
+        if self._by_name is not None:
+            _index_name(self._by_name, template)
+        if self._price_keys is not None:
+            position = bisect_right(self._price_keys, template.price_cents)
+            self._price_keys.insert(position, template.price_cents)
+            self._price_templates.insert(position, template)
+        if self._search is not None:
+            self._search.add(template.name)
+        logger.debug(f"Added '{template.name}' (SKU: {template.sku}) to the catalog.")
+        return template
+
+    def add_many(self, templates: Iterable[Tuple[str, str, float]]) -> int:
+        """Add products to the catalog in a single operation.
+
+        The whole batch is validated before the catalog is modified, so either
+        every product is added or none of them are. The name, price and search
+        indexes are rebuilt on their next query rather than updated row by row.
+
+        Args:
+            templates: (sku, name, price) tuples.
+
+        Returns:
+            The number of products added.
+
+        Raises:
+            TypeError: If a field has the wrong type.
+            ValueError: If a field is invalid, or if a SKU is already in the
+                catalog or repeated in the batch.
+        """
+        existing = self._templates
+        batch = {}
+        for template in starmap(self._new_template, templates):
+            sku = template.sku
+            if sku in batch or sku in existing:
+                raise ValueError(f"SKU '{sku}' is already in the catalog.")
+            batch[sku] = template
+        if not batch:
+            return 0
+
+        existing.update(batch)
+        self._by_name = self._price_keys = self._price_templates = self._search = None
+        logger.debug(f"Added {len(batch)} products to the catalog.")
+        return len(batch)
+
+    def remove(self, sku: str) -> ItemTemplate:
+        """Remove a product from the catalog.
+
+        Args:
+            sku: The SKU of the product.
+
+        Returns:
+            The removed template.
+
+        Raises:
+            KeyError: If the SKU is not in the catalog.
+        """
+        template = self.get(sku)
+        del self._templates[sku]
+        if self._by_name is not None:
+            _unindex_name(self._by_name, template)
+        if self._price_keys is not None:
+            position = bisect_left(self._price_keys, template.price_cents)
+            while self._price_templates[position] is not template:
+                position += 1
+            del self._price_keys[position]
+            del self._price_templates[position]
+        if self._search is not None:
+            self._search.remove(template.name)
+        logger.debug(f"Removed '{template.name}' (SKU: {sku}) from the catalog.")
+        return template
+
+    def get(self, sku: str) -> ItemTemplate:
+        """Get the template of a product by its SKU.
+
+        Raises:
+            KeyError: If the SKU is not in the catalog.
+        """
+        template = self._templates.get(sku)
+        if template is None:
+            raise KeyError(f"SKU '{sku}' not found in the catalog.")
+        return template
+
+    def find_by_name(self, name: str) -> List[ItemTemplate]:
+        """Get the templates of every product with a name, in the order they were added.
+
+        Raises:
+            KeyError: If no product has the name.
+        """
+        if self._by_name is None:
+            self._build_name_index()
+        named = self._by_name.get(name)
+        if named is None:
+            raise KeyError(f"Item '{name}' not found in the catalog.")
+        return [named] if named.__class__ is ItemTemplate else list(named)
+
+    def in_price_range(self, low: float, high: float) -> List[ItemTemplate]:
+        """Get the templates of every product priced between two bounds, cheapest first.
+
+        Args:
+            low: The lowest price, included.
+            high: The highest price, included.
+
+        Returns:
+            The templates, sorted by price.
+        """
+        if self._price_keys is None:
+            self._build_price_index()
+        start = bisect_left(self._price_keys, to_cents(low))
+        stop = bisect_right(self._price_keys, to_cents(high))
+        return self._price_templates[start:stop]
+
+    def search(self, query: str, limit: int = 20) -> List[ItemTemplate]:
+        """Find the products matching what has been typed in a search box.
+
+        Products whose name has a word starting with the query come first,
+        followed by those matching the query with its typos corrected. See
+        SearchIndex.search.
+
+        Args:
+            query: The text typed so far.
+            limit: The maximum number of templates to return.
+
+        Returns:
+            The templates of the matching products.
+        """
+        if self._search is None:
+            self._search = SearchIndex(template.name for template in self._templates.values())
+        if self._by_name is None:
+            self._build_name_index()
+        templates = []
+        for name in self._search.search(query, limit):
+            named = self._by_name[name]
+            if named.__class__ is ItemTemplate:
+                templates.append(named)
+            else:
+                templates.extend(named)
+            if len(templates) >= limit:
+                break
+        return templates[:limit]
+
+    def new_item(self, sku: str) -> Item:
+        """Build a new Item, with its own UID, for a unit of a product.
+
+        Raises:
+            KeyError: If the SKU is not in the catalog.
+        """
+        return self.get(sku).new_item()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, sku: str) -> bool:
+        return sku in self._templates
+
+    def __iter__(self) -> Iterator[ItemTemplate]:
+        """Iterate over the templates in the order they were added."""
+        return iter(self._templates.values())
+
+    @classmethod
+    def from_csv(cls, source: Union[str, IO[str]], dialect: str = 'excel') -> 'Catalog':
+        """Load a catalog from CSV rows with a 'SKU', 'Name', 'Price' header.
+
+        Args:
+            source: A file path or a readable text stream.
+            dialect: The csv dialect of the file.
+
+        Returns:
+            The loaded Catalog.
+
+        Raises:
+            IOError: If the file cannot be read.
+            ValueError: If the header or a row is invalid.
+        """
+        if isinstance(source, str):
+            try:
+                with open(source, newline='', encoding='utf-8') as file:
+                    return cls.from_csv(file, dialect)
+            except IOError as e:
+                raise IOError(f"Unable to read file: {source}") from e
+
+        rows = csv.reader(source, dialect)
+        if next(rows, None) != CSV_HEADER:
+            raise ValueError("Not a CSV catalog: unexpected header row.")
+        try:
+            return cls((sku, name, float(price)) for sku, name, price in rows)
+        except ValueError as e:
+            raise ValueError(f"Invalid CSV catalog row {rows.line_num}: {e}") from e
+
+    @classmethod
+    def from_json(cls, source: Union[str, IO]) -> 'Catalog':
+        """Load a catalog from a JSON array of {"sku", "name", "price"} objects.
+
+        The document is parsed with orjson when it is installed.
+
+        Args:
+            source: A file path or a readable text or binary stream.
+
+        Returns:
+            The loaded Catalog.
+
+        Raises:
+            IOError: If the file cannot be read.
+            ValueError: If the document or a product is invalid.
+        """
+        if isinstance(source, str):
+            try:
+                with open(source, 'rb') as file:
+                    return cls.from_json(file)
+            except IOError as e:
+                raise IOError(f"Unable to read file: {source}") from e
+
+        content = source.read()
+        products = orjson.loads(content) if orjson is not None else json.loads(content)
+        if not isinstance(products, list):
+            raise ValueError("Not a JSON catalog: expected an array of products.")
+        try:
+            return cls((product['sku'], product['name'], float(product['price'])) for product in products)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid JSON catalog product: {e!r}") from e
+
+    @staticmethod
+    def _new_template(sku: str, name: str, price: float) -> ItemTemplate:
+        """Validate the fields of a product, the way Item does, and build its template."""
+        if not isinstance(sku, str):
+            raise TypeError("SKU must be a string.")
+        if not isinstance(name, str):
+            raise TypeError("Item name must be a string.")
+        elif not name:
+            raise ValueError("Item name must be a non-empty string.")
+        if not isinstance(price, float):
+            raise TypeError("Item price must be a float.")
+        elif not math.isfinite(price):
+            raise ValueError("Price must be a finite float.")
+        elif price < 0:
+            raise ValueError("Price must be a non-negative float.")
+        # tuple.__new__ skips the Python-level __new__ of the named tuple
+        return _new_tuple(ItemTemplate, (sku, sys.intern(name), price, to_cents(price)))
+
+    def _free_sku(self) -> str:
+        """Find the next number that is not a SKU yet."""
+        while str(self._next_sku) in self._templates:
+            self._next_sku += 1
+        return str(self._next_sku)
+
+    def _build_name_index(self) -> None:
+        """Index every template by name."""
+        self._by_name = {}
+        for template in self._templates.values():
+            _index_name(self._by_name, template)
+        logger.debug(f"Built the name index of {len(self._templates)} products.")
+
+    def _build_price_index(self) -> None:
+        """Sort every template by price, for range queries."""
+        self._price_templates = sorted(self._templates.values(), key=_price_cents)
+        self._price_keys = array('q', map(_price_cents, self._price_templates))
+        logger.debug(f"Built the price index of {len(self._price_templates)} products.")
+
+
+def _index_name(by_name: Dict[str, any], template: ItemTemplate) -> None:
+    """Add a template to a name index."""
+    named = by_name.get(template.name)
+    if named is None:
+        by_name[template.name] = template
+    elif named.__class__ is ItemTemplate:
+        by_name[template.name] = [named, template]
+    else:
+        named.append(template)
+
+
+def _unindex_name(by_name: Dict[str, any], template: ItemTemplate) -> None:
+    """Take a template out of a name index."""
+    named = by_name[template.name]
+    if named is template:
+        del by_name[template.name]
+    else:
+        named.remove(template)
+        if len(named) == 1:
+            by_name[template.name] = named[0]
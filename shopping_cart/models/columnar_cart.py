@@ -0,0 +1,639 @@
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from heapq import nlargest
+from operator import attrgetter
+from typing import IO, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+import logging
+import uuid
+from shopping_cart.models.cart_receipts import CartReceiptsMixin
+from shopping_cart.models.cart_snapshot import (
+    UID_SIZE, decode_lines, decode_units, read_snapshot_header, read_snapshot_source
+)
+from shopping_cart.models.frozen_items import FrozenInstances, FrozenItems, GroupTotals, iter_group_units
+from shopping_cart.models.item import Item, find_counted_unit, item_from_template, to_cents, uid_from_bytes
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+# NumPy is optional: when it is installed, aggregations run on zero-copy
+# views of the columns instead of iterating over them.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarShoppingCart(CartReceiptsMixin):
+    """A shopping cart that stores its units column by column.
+
+    Instead of one Item object per unit in per-name lists, the cart keeps one
+    row per unit spread over contiguous columns: the code of its name (each
+    name is interned once), its price, its price in cents and its raw 16-byte
+    UID. A unit costs 36 bytes plus its entry in the UID index, and scans over
+    prices or names run over packed arrays rather than Python objects. The
+    quantity and subtotal of every name are kept up to date as units come and
+    go, so totals, per-name totals and grouped receipts never scan the rows.
+
+    The cart has the API of ShoppingCart, snapshots and receipts included,
+    but no promotions, taxes or receipt line cache. Item instances are
+    rebuilt from the columns when they are listed or retrieved: they are
+    equal to the items that were added, but not the same objects, and
+    listings cost O(units) rather than ShoppingCart's O(1). Units added with
+    a quantity stay counted and get no row. Like in ShoppingCart, removing a
+    unit moves another one into its row, so the remaining units of a name do
+    not keep their insertion order.
+    """
+
+    def __init__(self):
+        """Initialize an empty cart."""
+        # Interned names: a name's code is its index in _names
+        self._names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        # One row per unit; row i of every column describes the same unit
+        self._name_codes = array('I')
+        self._prices = array('d')
+        self._price_cents = array('q')
+        self._uids = bytearray()
+        # Maps each UID, as an integer, to its row
+        self._uid_index: Dict[int, int] = {}
+        # Per name code: the number of units, their subtotal in cents and the
+        # counted lines added with a quantity, which have no rows
+        self._quantities = array('q')
+        self._subtotals_cents = array('q')
+        self._lines: Dict[int, Dict[float, int]] = {}
+        # Codes of the names in the cart, in the order they were added
+        self._name_order: Dict[int, None] = {}
+        self._total_price_cents: int = 0
+        self._total_quantity: int = 0
+        self._version: int = 0
+        self._receipt_cache: Dict[BaseReceiptStrategy, Tuple[int, str]] = {}
+
+    def add_item(self, item: Item, quantity: Optional[int] = None) -> None:
+        """Add an item to the cart. See ShoppingCart.add_item.
+
+        Raises:
+            TypeError: If the item is not an Item instance or the quantity is not an integer.
+            ValueError: If an item with the same UID is already in the cart,
+                or if the quantity is not positive.
+        """
+        if not isinstance(item, Item):
+            raise TypeError("Only Item instances can be added to the cart.")
+        if quantity is not None:
+            quantity = ShoppingCart._validate_quantity(quantity)
+            code = self._intern(item.name)
+            lines = self._lines.setdefault(code, {})
+            lines[item.price] = lines.get(item.price, 0) + quantity
+            self._count_units(code, quantity, item.price_cents * quantity)
+            logger.debug(f"Added {quantity} x '{item.name}' to cart.")
+            return
+        if item.uid.int in self._uid_index or self._is_counted_unit(item):
+            raise ValueError(f"Item with UID '{item.uid}' is already in the cart.")
+
+        code = self._intern(item.name)
+        self._append_rows(array('I', [code]), [item])
+        self._count_units(code, 1, item.price_cents)
+        logger.debug(f"Added '{item.name}' (UID: {item.uid}) to cart.")
+
+    def add_items(self, items: Iterable[Item]) -> None:
+        """Add several items to the cart in a single operation.
+
+        The batch is validated before the cart is modified, so either every
+        item is added or none of them are. The rows are appended to every
+        column at once, and the units and subtotal of each name are added up
+        over the batch's columns.
+
+        Raises:
+            TypeError: If any item is not an Item instance.
+            ValueError: If any UID is already in the cart or repeated in the batch.
+        """
+        batch = list(items)
+        batch_uids = set()
+        for item in batch:
+            if not isinstance(item, Item):
+                raise TypeError("Only Item instances can be added to the cart.")
+            uid = item.uid.int
+            if uid in self._uid_index or uid in batch_uids or self._is_counted_unit(item):
+                raise ValueError(f"Item with UID '{item.uid}' is already in the cart.")
+            batch_uids.add(uid)
+
+        intern = self._intern
+        codes = array('I', [intern(item.name) for item in batch])
+        price_cents = self._append_rows(codes, batch)
+        for code, (quantity, subtotal_cents) in _sum_by_code(codes, price_cents).items():
+            self._count_units(code, quantity, subtotal_cents)
+        logger.debug(f"Added {len(batch)} items to cart.")
+
+    def remove_item(self, item: Item, quantity: Optional[int] = None) -> None:
+        """Remove an item instance, or quantity units of a counted line. See ShoppingCart.remove_item.
+
+        Raises:
+            KeyError: If the item is not found in the cart, or if its line
+                holds fewer units than the requested quantity.
+        """
+        if not isinstance(item, Item):
+            raise TypeError("Only Item instances can be removed from the cart.")
+        if quantity is not None:
+            self._remove_quantity(item, ShoppingCart._validate_quantity(quantity))
+            return
+        if item.uid.int not in self._uid_index and self._is_counted_unit(item):
+            self._remove_quantity(item, 1)
+            return
+
+        row = self._locate_row(item)
+        code = self._name_codes[row]
+        price_cents = self._price_cents[row]
+        self._pop_row(row)
+        self._uncount_units(code, 1, price_cents)
+        logger.debug(f"Removed '{item.name}' (UID: {item.uid}) from cart.")
+
+    def _remove_quantity(self, item: Item, quantity: int) -> None:
+        """Remove quantity units from the counted line of the item's name and price."""
+        code = self._code_in_cart(item.name)
+        lines = self._lines.get(code, {})
+        line_quantity = lines.get(item.price, 0)
+        if line_quantity < quantity:
+            raise KeyError(
+                f"Only {line_quantity} x '{item.name}' at {item.price:.2f} in the cart, "
+                f"cannot remove {quantity}."
+            )
+
+        if line_quantity == quantity:
+            del lines[item.price]
+        else:
+            lines[item.price] = line_quantity - quantity
+        self._uncount_units(code, quantity, item.price_cents * quantity)
+        logger.debug(f"Removed {quantity} x '{item.name}' from cart.")
+
+    def remove_items(self, items: Iterable[Item]) -> None:
+        """Remove several item instances from the cart in a single operation.
+
+        Either every item is removed or none of them are.
+
+        Raises:
+            TypeError: If any item is not an Item instance.
+            KeyError: If any item is not found in the cart or repeated in the batch.
+        """
+        batch = list(items)
+        batch_uids = set()
+        for item in batch:
+            if not isinstance(item, Item):
+                raise TypeError("Only Item instances can be removed from the cart.")
+            self._locate_row(item)
+            if item.uid.int in batch_uids:
+                raise KeyError(f"Item '{item.name}' with UID '{item.uid}' is repeated in the batch.")
+            batch_uids.add(item.uid.int)
+
+        removed: Dict[int, List[int]] = {}
+        for uid in batch_uids:
+            # Rows move as others are removed, so look each one up when its turn comes
+            row = self._uid_index[uid]
+            totals = removed.setdefault(self._name_codes[row], [0, 0])
+            totals[0] += 1
+            totals[1] += self._price_cents[row]
+            self._pop_row(row)
+        for code, (quantity, subtotal_cents) in removed.items():
+            self._uncount_units(code, quantity, subtotal_cents)
+        logger.debug(f"Removed {len(batch)} items from cart.")
+
+    def clear_cart(self) -> None:
+        """Remove all items from the cart. Interned names are kept."""
+        for column in (self._name_codes, self._prices, self._price_cents):
+            del column[:]
+        self._uids.clear()
+        self._uid_index.clear()
+        self._quantities = array('q', bytes(len(self._names) * self._quantities.itemsize))
+        self._subtotals_cents = array('q', bytes(len(self._names) * self._subtotals_cents.itemsize))
+        self._lines.clear()
+        self._name_order.clear()
+        self._total_price_cents = 0
+        self._total_quantity = 0
+        self._version += 1
+        logger.debug("Cleared all items from the cart.")
+
+    def get_item(self, item_name: str, item_uid: Union[str, uuid.UUID]) -> Item:
+        """Retrieve an item from the cart by its name and UID.
+
+        Returns:
+            An Item equal to the one that was added.
+
+        Raises:
+            KeyError: If the item is not found in the cart.
+        """
+        code = self._code_in_cart(item_name)
+        try:
+            uid = item_uid if isinstance(item_uid, uuid.UUID) else uuid.UUID(item_uid)
+        except (TypeError, ValueError):
+            uid = None
+
+        row = None if uid is None else self._uid_index.get(uid.int)
+        if row is None and uid is not None:
+            price = find_counted_unit(item_name, self._lines.get(code, {}), uid)
+            if price is not None:
+                return item_from_template(item_name, price, to_cents(price), uid)
+        if row is None or self._name_codes[row] != code:
+            raise KeyError(f"Item with UID '{item_uid}' not found under name '{item_name}'.")
+        return self._item_at(row)
+
+    def list_items(self) -> Mapping[str, Mapping[str, any]]:
+        """List all items in the cart with their details.
+
+        The groups are rebuilt from the columns, with the layout of
+        ShoppingCart's, and handed out as a read-only view that later
+        changes to the cart do not affect. Unlike ShoppingCart's, the listing
+        costs O(units).
+
+        Returns:
+            A read-only mapping of item names to their item groups.
+        """
+        rows_by_code = _group_rows(self._name_codes, self._name_order)
+        item_at = self._item_at
+        return FrozenItems({
+            self._names[code]: {
+                'instances': [item_at(row) for row in rows_by_code[code]],
+                'lines': dict(self._lines.get(code, {})),
+                'packed': None,
+                'total_quantity': self._quantities[code],
+                'total_price_cents': self._subtotals_cents[code]
+            }
+            for code in self._name_order
+        })
+
+    def list_items_by_name(self, item_name: str) -> Sequence[Item]:
+        """List all item instances in the cart that have the specified name.
+
+        The rows of the name are found by scanning the name code column. Units
+        added with a quantity follow, as Item instances built for the listing
+        that the cart does not keep.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        code = self._code_in_cart(item_name)
+        if numpy is not None:
+            rows = numpy.flatnonzero(_view(self._name_codes) == code).tolist()
+        else:
+            rows = [row for row, row_code in enumerate(self._name_codes) if row_code == code]
+        instances = [self._item_at(row) for row in rows]
+        instances += iter_group_units(item_name, {'lines': self._lines.get(code, {})})
+        return FrozenInstances(instances)
+
+    def iter_items(self) -> Iterator[Item]:
+        """Iterate over every item instance in the cart, name by name.
+
+        The columns are copied by the call, so the cart can change during
+        iteration. Units added with a quantity are yielded as short-lived
+        Item instances, without giving them rows.
+        """
+        lines = {code: dict(code_lines) for code, code_lines in self._lines.items()}
+        return self._iter_rows(self._name_codes[:], self._prices[:], bytes(self._uids), list(self._name_order),
+                               lines)
+
+    def iter_groups(self) -> Iterator[GroupTotals]:
+        """Iterate over the quantity and subtotal of every item name in the cart, without scanning any row."""
+        return iter([
+            GroupTotals(self._names[code], self._quantities[code], self._subtotals_cents[code])
+            for code in self._name_order
+        ])
+
+    def iter_items_by_name(self, item_name: str) -> Iterator[Item]:
+        """Iterate over the item instances in the cart that have the specified name.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        return iter(self.list_items_by_name(item_name))
+
+    def get_total_quantity_by_name(self, item_name: str) -> int:
+        """Get the total quantity of items with the specified name.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        return self._quantities[self._code_in_cart(item_name)]
+
+    @property
+    def total_price(self) -> float:
+        """Get the total price of all items in the cart.
+
+        Returns:
+            The total price as a float with two decimals.
+        """
+        return self._total_price_cents / 100
+
+    @property
+    def total_price_cents(self) -> int:
+        """Get the exact total price of all items in the cart.
+
+        Returns:
+            The total price in cents as an integer.
+        """
+        return self._total_price_cents
+
+    @property
+    def total_quantity(self) -> int:
+        """Get the total quantity of all items in the cart.
+
+        Returns:
+            The total quantity as an integer.
+        """
+        return self._total_quantity
+
+    def price_histogram(self, bin_edges: Sequence[float]) -> List[int]:
+        """Count the units whose unit price falls in each price range.
+
+        Ranges are half-open, [edges[i], edges[i + 1]), except for the last
+        one which includes its upper edge, like numpy.histogram. Units priced
+        outside the edges are not counted. The price column is counted at C
+        speed (with numpy.histogram when NumPy is installed); counted lines
+        add one entry per distinct price.
+
+        Args:
+            bin_edges: The increasing edges of the price ranges.
+
+        Returns:
+            The number of units in each range.
+
+        Raises:
+            ValueError: If there are fewer than two edges or they do not increase.
+        """
+        edges = [float(edge) for edge in bin_edges]
+        if len(edges) < 2 or any(lower >= upper for lower, upper in zip(edges, edges[1:])):
+            raise ValueError("Bin edges must be at least two increasing prices.")
+
+        price_counts = Counter()
+        for lines in self._lines.values():
+            price_counts.update(lines)
+        if numpy is not None:
+            histogram = numpy.histogram(_view(self._prices), bins=edges)[0].tolist()
+        else:
+            histogram = [0] * (len(edges) - 1)
+            price_counts.update(self._prices)
+
+        last_edge = edges[-1]
+        for price, count in price_counts.items():
+            index = len(edges) - 2 if price == last_edge else bisect_right(edges, price) - 1
+            if 0 <= index < len(histogram):
+                histogram[index] += count
+        return histogram
+
+    def top_names(self, count: int, by: str = 'quantity') -> List[GroupTotals]:
+        """Get the names with the most units, or the highest subtotals.
+
+        Args:
+            count: The number of names to return, at most.
+            by: 'quantity' or 'subtotal_cents'.
+
+        Returns:
+            GroupTotals tuples, largest first.
+
+        Raises:
+            ValueError: If by is not 'quantity' or 'subtotal_cents'.
+        """
+        if by not in ('quantity', 'subtotal_cents'):
+            raise ValueError(f"Cannot rank names by '{by}'.")
+        return nlargest(count, self.iter_groups(), key=attrgetter(by))
+
+    @classmethod
+    def load_snapshot(cls, source: Union[str, bytes, IO[bytes]]) -> 'ColumnarShoppingCart':
+        """Restore a cart saved with save_snapshot, by either cart type.
+
+        Units keep their UIDs and are decoded straight into the columns.
+
+        Args:
+            source: A file path, the snapshot's bytes, or a readable binary stream.
+
+        Returns:
+            The restored ColumnarShoppingCart.
+
+        Raises:
+            IOError: If the file cannot be read.
+            ValueError: If the data is not a valid snapshot of a supported
+                version, or holds the same UID twice.
+        """
+        buffer = read_snapshot_source(source)
+        total_quantity, _, groups = read_snapshot_header(buffer)
+        cart = cls()
+        for group in groups:
+            code = cart._intern(group.name)
+            if group.unit_count:
+                cart._append_packed_rows(code, decode_units(buffer, group))
+            lines = decode_lines(buffer, group)
+            if lines:
+                cart._lines[code] = lines
+            cart._count_units(code, group.total_quantity, group.total_price_cents)
+        if len(cart._uid_index) != len(cart._prices):
+            raise ValueError("Corrupted shopping cart snapshot: repeated UIDs.")
+        logger.debug(f"Loaded snapshot of {total_quantity} items under {len(groups)} names.")
+        return cart
+
+    def _receipt_version(self) -> int:
+        """Get the cart's version, bumped by every mutation."""
+        return self._version
+
+    def _receipt_data(self, grouped: bool = False) -> Dict[str, any]:
+        """Collect the data handed to receipt strategies, with units unless grouped."""
+        if not grouped:
+            return {'items': self.list_items(), 'total_price': self.total_price}
+        items = {
+            self._names[code]: {
+                'instances': [],
+                'lines': {},
+                'packed': None,
+                'total_quantity': self._quantities[code],
+                'total_price_cents': self._subtotals_cents[code]
+            }
+            for code in self._name_order
+        }
+        return {'items': items, 'total_price': self.total_price}
+
+    def _intern(self, item_name: str) -> int:
+        """Get the code of a name, assigning the next one to a new name."""
+        code = self._codes.get(item_name)
+        if code is None:
+            code = self._codes[item_name] = len(self._names)
+            self._names.append(item_name)
+            self._quantities.append(0)
+            self._subtotals_cents.append(0)
+        return code
+
+    def _code_in_cart(self, item_name: str) -> int:
+        """Get the code of a name that has units in the cart.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        code = self._codes.get(item_name)
+        if code is None or code not in self._name_order:
+            raise KeyError(f"Item '{item_name}' not found in the cart.")
+        return code
+
+    def _is_counted_unit(self, item: Item) -> bool:
+        """Tell whether an item is a unit of one of the cart's counted lines, as listed by the cart."""
+        code = self._codes.get(item.name)
+        if code is None or code not in self._name_order:
+            return False
+        return find_counted_unit(item.name, self._lines.get(code, {}), item.uid) == item.price
+
+    def _locate_row(self, item: Item) -> int:
+        """Find the row of an item instance through the UID index.
+
+        Raises:
+            KeyError: If the item is not found in the cart.
+        """
+        code = self._code_in_cart(item.name)
+        row = self._uid_index.get(item.uid.int)
+        if row is None or self._name_codes[row] != code:
+            raise KeyError(f"Item '{item.name}' with UID '{item.uid}' not in the cart.")
+        return row
+
+    def _append_rows(self, codes: array, items: List[Item]) -> array:
+        """Append one row per item to every column and index their UIDs.
+
+        Returns:
+            The price column of the new rows, in cents.
+        """
+        first_row = len(self._prices)
+        uids = [item.uid for item in items]
+        price_cents = array('q', [item.price_cents for item in items])
+        self._name_codes.extend(codes)
+        self._prices.extend([item.price for item in items])
+        self._price_cents.extend(price_cents)
+        self._uids += b''.join([uid.bytes for uid in uids])
+        self._uid_index.update(zip([uid.int for uid in uids], range(first_row, first_row + len(items))))
+        return price_cents
+
+    def _append_packed_rows(self, code: int, packed_units: Dict[str, any]) -> None:
+        """Append the rows of units decoded from a snapshot, indexing their UIDs."""
+        first_row = len(self._prices)
+        prices = packed_units['prices']
+        price_cents = [to_cents(price) for price in prices]
+        price_indices = packed_units['price_indices']
+        uids = packed_units['uids']
+        self._name_codes.extend(array('I', [code]) * len(price_indices))
+        self._prices.extend([prices[index] for index in price_indices])
+        self._price_cents.extend([price_cents[index] for index in price_indices])
+        self._uids += uids
+        self._uid_index.update(zip(
+            [int.from_bytes(uids[offset:offset + UID_SIZE], 'big') for offset in range(0, len(uids), UID_SIZE)],
+            range(first_row, first_row + len(price_indices))
+        ))
+
+    def _snapshot_contents(self) -> Tuple[Dict[str, Dict[str, any]], int, int]:
+        """Lay the columns out as the packed groups written to snapshots, with the totals.
+
+        The units of every name are taken straight from the columns, without
+        rebuilding their Items.
+        """
+        groups = {}
+        for code, rows in _group_rows(self._name_codes, self._name_order).items():
+            positions = {}
+            price_indices = [positions.setdefault(self._prices[row], len(positions)) for row in rows]
+            groups[self._names[code]] = {
+                'instances': [],
+                'lines': self._lines.get(code, {}),
+                'packed': {
+                    'uids': b''.join([self._uids[row * UID_SIZE:(row + 1) * UID_SIZE] for row in rows]),
+                    'prices': tuple(positions),
+                    'price_indices': price_indices,
+                },
+                'total_quantity': self._quantities[code],
+                'total_price_cents': self._subtotals_cents[code]
+            }
+        return groups, self._total_quantity, self._total_price_cents
+
+    def _pop_row(self, row: int) -> None:
+        """Remove a row by moving the last row into its place."""
+        last_row = len(self._prices) - 1
+        start = row * UID_SIZE
+        removed_uid = int.from_bytes(self._uids[start:start + UID_SIZE], 'big')
+        if row != last_row:
+            for column in (self._name_codes, self._prices, self._price_cents):
+                column[row] = column[last_row]
+            moved_uid = self._uids[last_row * UID_SIZE:]
+            self._uids[start:start + UID_SIZE] = moved_uid
+            self._uid_index[int.from_bytes(moved_uid, 'big')] = row
+        for column in (self._name_codes, self._prices, self._price_cents):
+            column.pop()
+        del self._uids[last_row * UID_SIZE:]
+        del self._uid_index[removed_uid]
+
+    def _count_units(self, code: int, quantity: int, price_cents: int) -> None:
+        """Add units to the totals of a name and of the cart."""
+        if code not in self._name_order:
+            self._name_order[code] = None
+        self._quantities[code] += quantity
+        self._subtotals_cents[code] += price_cents
+        self._total_quantity += quantity
+        self._total_price_cents += price_cents
+        self._version += 1
+
+    def _uncount_units(self, code: int, quantity: int, price_cents: int) -> None:
+        """Take units off the totals of a name and of the cart, forgetting the name once it has none."""
+        self._quantities[code] -= quantity
+        self._subtotals_cents[code] -= price_cents
+        self._total_quantity -= quantity
+        self._total_price_cents -= price_cents
+        self._version += 1
+        if self._quantities[code] == 0:
+            del self._name_order[code]
+            self._lines.pop(code, None)
+            logger.debug(f"All instances of '{self._names[code]}' removed from cart.")
+
+    def _item_at(self, row: int) -> Item:
+        """Rebuild the Item of a row."""
+        start = row * UID_SIZE
+        return Item(self._names[self._name_codes[row]], self._prices[row],
+                    uid_from_bytes(self._uids[start:start + UID_SIZE]))
+
+    def _iter_rows(self, codes: array, prices: array, uids: bytes, name_order: List[int],
+                   lines: Dict[int, Dict[float, int]]) -> Iterator[Item]:
+        """Rebuild the Items of copied columns and counted lines, name by name."""
+        rows_by_code = _group_rows(codes, name_order)
+        for code in name_order:
+            item_name = self._names[code]
+            for row in rows_by_code[code]:
+                start = row * UID_SIZE
+                yield Item(item_name, prices[row], uid_from_bytes(uids[start:start + UID_SIZE]))
+            yield from iter_group_units(item_name, {'lines': lines.get(code, {})})
+
+
+def _view(column: array):
+    """View an array column as a NumPy array, without copying it."""
+    return numpy.frombuffer(column, dtype=column.typecode)
+
+
+def _sum_by_code(codes: array, values: array) -> Dict[int, Tuple[int, int]]:
+    """Count the rows of every code and add up their values.
+
+    Returns:
+        A dictionary mapping each code to its row count and sum, codes in
+        the order they first appear.
+    """
+    if not codes:
+        return {}
+    if numpy is not None:
+        unique_codes, first_rows, inverse, counts = numpy.unique(
+            _view(codes), return_index=True, return_inverse=True, return_counts=True
+        )
+        sums = numpy.zeros(len(unique_codes), dtype=numpy.int64)
+        numpy.add.at(sums, inverse, _view(values))
+        return {
+            int(unique_codes[index]): (int(counts[index]), int(sums[index]))
+            for index in numpy.argsort(first_rows)
+        }
+
+    counts = Counter(codes)
+    sums = dict.fromkeys(counts, 0)
+    for code, value in zip(codes, values):
+        sums[code] += value
+    return {code: (count, sums[code]) for code, count in counts.items()}
+
+
+def _group_rows(codes: array, name_order: Iterable[int]) -> Dict[int, List[int]]:
+    """Collect the rows of every code, in row order."""
+    rows_by_code = {code: [] for code in name_order}
+    for row, code in enumerate(codes):
+        rows_by_code[code].append(row)
+    return rows_by_code
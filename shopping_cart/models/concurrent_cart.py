@@ -0,0 +1,358 @@
+from contextlib import ExitStack, contextmanager
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+import logging
+import threading
+import uuid
+from shopping_cart.models.cart_receipts import CartReceiptsMixin
+from shopping_cart.models.frozen_items import GroupTotals, iter_group_totals, iter_instances
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrentShoppingCart(CartReceiptsMixin):
+    """A shopping cart that can be shared by several threads.
+
+    Item names are spread over `stripes` shards by hash. Each shard is a
+    ShoppingCart guarded by its own lock, so operations on names that fall
+    in different shards never wait for each other. Operations on several
+    names, like add_items, take the locks of the shards involved in a fixed
+    order and stay all-or-nothing.
+
+    The totals are the sums of the shards' totals. Receipts, saved
+    snapshots, list_items and snapshot see every shard at the same point in
+    time: they briefly hold all the locks to take a frozen view of every
+    shard, which costs O(1) per shard, and render the views after releasing
+    them.
+
+    Names are listed in the order they were added, like in ShoppingCart.
+    UIDs are unique across the whole cart, like in ShoppingCart: the UIDs of
+    all shards are kept in a set guarded by a lock of its own, taken after
+    the shards' locks and only while UIDs are checked and recorded. The
+    order names were added in is kept the same way.
+    """
+
+    def __init__(self, stripes: int = 16):
+        """Initialize an empty cart.
+
+        Args:
+            stripes: The number of shards, and of locks, names are spread over.
+
+        Raises:
+            ValueError: If stripes is not a positive integer.
+        """
+        if not isinstance(stripes, int) or stripes < 1:
+            raise ValueError("The number of stripes must be a positive integer.")
+        self._shards = [ShoppingCart() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # Maps each name in the cart to when it was first added, to list names in that order
+        # Names of different stripes are added and removed concurrently, so it has a lock of its own
+        self._name_order: Dict[str, int] = {}
+        self._name_order_lock = threading.Lock()
+        self._sequence = count()
+        # The UIDs of the instances in every shard
+        self._uids: Set[uuid.UUID] = set()
+        self._uids_lock = threading.Lock()
+        # Rendered receipts, with the shard versions they were rendered at (see CartReceiptsMixin)
+        self._receipt_cache: Dict[BaseReceiptStrategy, Tuple[Tuple[int, ...], str]] = {}
+
+    def add_item(self, item: Item, quantity: Optional[int] = None) -> None:
+        """Add an item to the cart. See ShoppingCart.add_item.
+
+        Raises:
+            TypeError: If the item is not an Item instance or the quantity is not an integer.
+            ValueError: If an item with the same UID is already in the cart,
+                or if the quantity is not positive.
+        """
+        index = self._stripe_of(item)
+        with self._locks[index]:
+            if quantity is None:
+                self._reserve_uids([item])
+            try:
+                self._shards[index].add_item(item, quantity)
+            except (TypeError, ValueError):
+                if quantity is None:
+                    self._release_uids([item])
+                raise
+            self._register_name(item.name)
+
+    def add_items(self, items: Iterable[Item]) -> None:
+        """Add several items to the cart in a single operation.
+
+        Either every item is added or none of them are.
+
+        Raises:
+            TypeError: If any item is not an Item instance.
+            ValueError: If any UID is already in the cart or repeated in the batch.
+        """
+        batch = list(items)
+        stripes = self._split_by_stripe(batch)
+        with self._locked(sorted(stripes)):
+            self._reserve_uids(batch)
+            added = []
+            try:
+                for index, stripe_items in stripes.items():
+                    self._shards[index].add_items(stripe_items)
+                    added.append(index)
+            except ValueError:
+                # The items just added are the last of their groups, so removing
+                # them last first leaves the groups as they were
+                for index in added:
+                    self._shards[index].remove_items(reversed(stripes[index]))
+                self._release_uids(batch)
+                raise
+            for item in batch:
+                self._register_name(item.name)
+        logger.debug(f"Added {len(batch)} items over {len(stripes)} stripes to cart.")
+
+    def remove_item(self, item: Item, quantity: Optional[int] = None) -> None:
+        """Remove an item instance, or quantity units of a counted line. See ShoppingCart.remove_item.
+
+        Raises:
+            KeyError: If the item is not found in the cart, or if its line
+                holds fewer units than the requested quantity.
+        """
+        index = self._stripe_of(item)
+        with self._locks[index]:
+            shard = self._shards[index]
+            shard.remove_item(item, quantity)
+            if quantity is None:
+                self._release_uids([item])
+            self._forget_name_if_gone(shard, item.name)
+
+    def remove_items(self, items: Iterable[Item]) -> None:
+        """Remove several item instances in a single operation.
+
+        Either every item is removed or none of them are.
+
+        Raises:
+            TypeError: If any item is not an Item instance.
+            KeyError: If any item is not found in the cart or repeated in the batch.
+        """
+        batch = list(items)
+        stripes = self._split_by_stripe(batch)
+        with self._locked(sorted(stripes)):
+            # Every shard checks its own items; check them all before removing any
+            batch_uids = set()
+            for index, stripe_items in stripes.items():
+                for item in stripe_items:
+                    self._shards[index]._locate_item(item)
+                    if item.uid in batch_uids:
+                        raise KeyError(f"Item '{item.name}' with UID '{item.uid}' is repeated in the batch.")
+                    batch_uids.add(item.uid)
+            for index, stripe_items in stripes.items():
+                shard = self._shards[index]
+                shard.remove_items(stripe_items)
+                for item in stripe_items:
+                    self._forget_name_if_gone(shard, item.name)
+            self._release_uids(batch)
+        logger.debug(f"Removed {len(batch)} items over {len(stripes)} stripes from cart.")
+
+    def clear_cart(self) -> None:
+        """Remove all items from the cart."""
+        with self._locked(range(len(self._shards))):
+            for shard in self._shards:
+                shard.clear_cart()
+            with self._name_order_lock:
+                self._name_order.clear()
+            with self._uids_lock:
+                self._uids.clear()
+        logger.debug("Cleared all items from the cart.")
+
+    def get_item(self, item_name: str, item_uid: Union[str, uuid.UUID]) -> Item:
+        """Retrieve an item from the cart by its name and UID.
+
+        Raises:
+            KeyError: If the item is not found in the cart.
+        """
+        index = self._stripe(item_name)
+        with self._locks[index]:
+            return self._shards[index].get_item(item_name, item_uid)
+
+    def list_items(self) -> Dict[str, Dict[str, any]]:
+        """List all items in the cart with their details, at a single point in time.
+
+        Returns:
+            A dictionary mapping item names to frozen views of their item groups.
+        """
+        return self.snapshot()['items']
+
+    def list_items_by_name(self, item_name: str) -> Sequence[Item]:
+        """List all item instances in the cart that have the specified name.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        index = self._stripe(item_name)
+        with self._locks[index]:
+            return self._shards[index].list_items_by_name(item_name)
+
+    def iter_items(self) -> Iterator[Item]:
+        """Iterate over every item instance in the cart, as of a single point in time.
+
+        The locks are only held while taking the frozen views iterated over.
+        """
+        data = self._snapshot()
+        return iter_instances(data['items'])
+
+    def iter_groups(self) -> Iterator[GroupTotals]:
+        """Iterate over the quantity and subtotal of every item name, as of a single point in time."""
+        data = self._snapshot()
+        return iter_group_totals(data['items'])
+
+    def iter_items_by_name(self, item_name: str) -> Iterator[Item]:
+        """Iterate over the item instances in the cart that have the specified name.
+
+        Like iter_items, counted units are yielded without being stored.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        index = self._stripe(item_name)
+        with self._locks[index]:
+            return self._shards[index].iter_items_by_name(item_name)
+
+    def get_total_quantity_by_name(self, item_name: str) -> int:
+        """Get the total quantity of items with the specified name.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        index = self._stripe(item_name)
+        with self._locks[index]:
+            return self._shards[index].get_total_quantity_by_name(item_name)
+
+    @property
+    def total_price(self) -> float:
+        """Get the total price of all items in the cart.
+
+        Returns:
+            The total price as a float with two decimals.
+        """
+        return self.total_price_cents / 100
+
+    @property
+    def total_price_cents(self) -> int:
+        """Get the exact total price of all items in the cart.
+
+        The shards are added up without locking; each one is read as of a
+        completed operation. Use snapshot for totals consistent with the items.
+
+        Returns:
+            The total price in cents as an integer.
+        """
+        return sum(shard.total_price_cents for shard in self._shards)
+
+    @property
+    def total_quantity(self) -> int:
+        """Get the total quantity of all items in the cart.
+
+        Returns:
+            The total quantity as an integer.
+        """
+        return sum(shard.total_quantity for shard in self._shards)
+
+    def snapshot(self) -> Dict[str, any]:
+        """Take the cart's contents at a single point in time.
+
+        Returns:
+            A dictionary with the 'items' and 'total_price' of the cart, laid
+            out like the data handed to receipt strategies. Item groups are
+            read-only frozen views, which later changes do not affect.
+        """
+        return self._snapshot()
+
+    def _stripe(self, item_name: str) -> int:
+        """Get the index of the shard, and lock, of a name."""
+        return hash(item_name) % len(self._shards)
+
+    def _stripe_of(self, item: Item) -> int:
+        """Get the shard index of an item's name.
+
+        Raises:
+            TypeError: If the item is not an Item instance.
+        """
+        if not isinstance(item, Item):
+            raise TypeError("Only Item instances can be added to or removed from the cart.")
+        return self._stripe(item.name)
+
+    def _split_by_stripe(self, items: Sequence[Item]) -> Dict[int, List[Item]]:
+        """Group items by the shard index of their name, keeping their order."""
+        stripes: Dict[int, List[Item]] = {}
+        for item in items:
+            stripes.setdefault(self._stripe_of(item), []).append(item)
+        return stripes
+
+    @contextmanager
+    def _locked(self, indices: Iterable[int]) -> Iterator[None]:
+        """Hold the locks of several shards, taken in increasing index order to avoid deadlocks."""
+        with ExitStack() as stack:
+            for index in indices:
+                stack.enter_context(self._locks[index])
+            yield
+
+    def _reserve_uids(self, items: Sequence[Item]) -> None:
+        """Record the UIDs of items about to be added. Called with their names' locks held.
+
+        Raises:
+            ValueError: If any UID is already in the cart or repeated in the batch.
+        """
+        uids = [item.uid for item in items]
+        with self._uids_lock:
+            batch_uids = set()
+            for uid in uids:
+                if uid in self._uids or uid in batch_uids:
+                    raise ValueError(f"Item with UID '{uid}' is already in the cart.")
+                batch_uids.add(uid)
+            self._uids |= batch_uids
+
+    def _release_uids(self, items: Iterable[Item]) -> None:
+        """Forget the UIDs of removed items, or of items that could not be added."""
+        with self._uids_lock:
+            self._uids.difference_update(item.uid for item in items)
+
+    def _register_name(self, item_name: str) -> None:
+        """Record when a name was first added. Called with the name's lock held."""
+        with self._name_order_lock:
+            if item_name not in self._name_order:
+                self._name_order[item_name] = next(self._sequence)
+
+    def _forget_name_if_gone(self, shard: ShoppingCart, item_name: str) -> None:
+        """Forget a name once its last unit is removed. Called with the name's lock held."""
+        if item_name not in shard._items:
+            with self._name_order_lock:
+                self._name_order.pop(item_name, None)
+
+    def _snapshot(self) -> Dict[str, any]:
+        """Take a frozen view of every shard under all the locks, laid out as receipt data."""
+        with self._locked(range(len(self._shards))):
+            items = {}
+            for shard in self._shards:
+                items.update(shard.list_items())
+            total_price_cents = sum(shard.total_price_cents for shard in self._shards)
+            with self._name_order_lock:
+                name_order = self._name_order.copy()
+
+        items = {item_name: items[item_name] for item_name in sorted(items, key=name_order.__getitem__)}
+        return {'items': items, 'total_price': total_price_cents / 100}
+
+    def _receipt_version(self) -> Tuple[int, ...]:
+        """Get the versions of the shards.
+
+        They are read without the locks: each version only grows, so the
+        data collected afterwards is never older than the versions read.
+        """
+        return tuple(shard._version for shard in self._shards)
+
+    def _receipt_data(self, grouped: bool = False) -> Dict[str, any]:
+        """Collect the data handed to receipt strategies, from a snapshot of the cart."""
+        return self._snapshot()
+
+    def _snapshot_contents(self) -> Tuple[Dict[str, Dict[str, any]], int, int]:
+        """Get the item groups, total quantity and total price in cents written to snapshots."""
+        items = self._snapshot()['items']
+        return (items, sum(item_group['total_quantity'] for item_group in items.values()),
+                sum(item_group['total_price_cents'] for item_group in items.values()))
@@ -0,0 +1,205 @@
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from shopping_cart.models.cart_snapshot import unpack_units
+from shopping_cart.models.item import Item, counted_uid_prefix, item_from_template, to_cents, uid_from_int
+
+
+class GroupTotals(NamedTuple):
+    """The quantity and subtotal of all the units of an item name."""
+
+    name: str
+    quantity: int
+    subtotal_cents: int
+
+    @property
+    def subtotal(self) -> float:
+        """The subtotal as a float with two decimals."""
+        return self.subtotal_cents / 100
+
+
+class FrozenItems(Mapping):
+    """A read-only view of a cart's item groups, frozen at the time it was taken.
+
+    Taking the view costs O(1): it shares the cart's dictionaries and lists
+    instead of copying them. The cart copies a dictionary or an instance
+    list before modifying one that a live view still shows (copy on write),
+    so a view never changes, and can be handed to a receipt renderer or to
+    another thread while the cart keeps changing.
+    """
+
+    __slots__ = ('_items', '__weakref__')
+
+    def __init__(self, items: Dict[str, Dict[str, any]]):
+        self._items = items
+
+    def __getitem__(self, item_name: str) -> 'FrozenGroup':
+        return FrozenGroup(self._items[item_name], self)
+
+    def __iter__(self) -> Iterator[str]:
+        # A generator rather than the dictionary's iterator keeps the view,
+        # and so the dictionary it shows, alive until iteration ends
+        yield from self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_name: object) -> bool:
+        return item_name in self._items
+
+    def shows(self, item_name: str, item_group: Dict[str, any]) -> bool:
+        """Tell whether this view shows the given group dictionary under a name."""
+        return self._items.get(item_name) is item_group
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._items)!r})"
+
+    def __reduce__(self):
+        # Pickled, e.g. to cross a process boundary, as plain dictionaries
+        return dict, ({item_name: self[item_name] for item_name in self._items},)
+
+
+class FrozenGroup(Mapping):
+    """A read-only view of an item group: its instances, lines and totals.
+
+    Views of a group and of its instances keep the listing they come from
+    alive, which is what tells the cart to copy the group before modifying it.
+    Groups keep their subtotal in integer cents as 'total_price_cents'; the
+    view also shows it as the float 'total_price', as listings always have.
+    """
+
+    __slots__ = ('_group', '_owner')
+
+    def __init__(self, item_group: Dict[str, any], owner: FrozenItems):
+        self._group = item_group
+        self._owner = owner
+
+    def __getitem__(self, key: str) -> any:
+        if key == 'total_price':
+            return self._group['total_price_cents'] / 100
+        value = self._group[key]
+        if key == 'instances':
+            return FrozenInstances(value, self._owner)
+        if key == 'lines':
+            # Lines hold one entry per distinct price, so they are simply copied
+            return MappingProxyType(value.copy())
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._group
+        yield 'total_price'
+
+    def __len__(self) -> int:
+        return len(self._group) + 1
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        group = self._group
+        return dict, ({**group, 'instances': list(group['instances']), 'lines': dict(group['lines']),
+                       'total_price': group['total_price_cents'] / 100},)
+
+
+class FrozenInstances(Sequence):
+    """A read-only view of the item instances of a name."""
+
+    __slots__ = ('_instances', '_owner')
+
+    def __init__(self, instances: List[Item], owner: Optional[FrozenItems] = None):
+        self._instances = instances
+        self._owner = owner
+
+    def __getitem__(self, index):
+        return self._instances[index]
+
+    def __iter__(self) -> Iterator[Item]:
+        yield from self._instances
+
+    def __reversed__(self) -> Iterator[Item]:
+        return reversed(self._instances)
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._instances
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenInstances):
+            return self._instances == other._instances
+        if isinstance(other, (list, tuple)):
+            return self._instances == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._instances!r})"
+
+    def __reduce__(self):
+        return list, (self._instances,)
+
+
+def iter_instances(item_groups: Mapping) -> Iterator[Item]:
+    """Iterate over every unit of a mapping of item groups, group by group, as Item instances.
+
+    Stored instances come first in each group, followed by the group's
+    counted and packed units (see iter_group_units).
+
+    Args:
+        item_groups: The cart's groups, a frozen view of them, or any mapping
+            of names to groups holding 'instances', and optionally 'lines'
+            and 'packed'.
+
+    Returns:
+        An iterator over the Item instances. Nothing is copied.
+    """
+    # The groups of a frozen view are read directly rather than through
+    # wrappers; item_groups keeps the view alive until iteration ends.
+    groups = item_groups._items if isinstance(item_groups, FrozenItems) else item_groups
+    for item_name, item_group in groups.items():
+        yield from item_group['instances']
+        yield from iter_group_units(item_name, item_group)
+
+
+def iter_group_units(item_name: str, item_group: Mapping) -> Iterator[Item]:
+    """Iterate over the units of a group that are not stored as instances.
+
+    Units restored from a snapshot come with their original UIDs. Units of
+    counted lines get a new Item each time they are iterated over, with a
+    UID derived from their line and position in it (see counted_uid_prefix),
+    so they keep the same UIDs from one read to the next. Neither is stored
+    back into the group, so reading a cart never makes it hold one Item per
+    unit.
+
+    Args:
+        item_name: The name of the group.
+        item_group: The group, holding optional 'lines' and 'packed'.
+
+    Returns:
+        An iterator over short-lived Item instances.
+    """
+    packed_units = item_group.get('packed')
+    if packed_units is not None:
+        yield from unpack_units(item_name, packed_units)
+    for price, quantity in item_group.get('lines', {}).items():
+        price_cents = to_cents(price)
+        prefix = counted_uid_prefix(item_name, price)
+        for position in range(quantity):
+            yield item_from_template(item_name, price, price_cents, uid_from_int(prefix | position))
+
+
+def iter_group_totals(item_groups: Mapping) -> Iterator[GroupTotals]:
+    """Iterate over the quantity and subtotal of every name in a mapping of item groups.
+
+    Args:
+        item_groups: The cart's groups, a frozen view of them, or any mapping
+            of names to groups holding 'total_quantity' and 'total_price_cents'.
+
+    Returns:
+        An iterator over GroupTotals tuples, in the mapping's order.
+    """
+    groups = item_groups._items if isinstance(item_groups, FrozenItems) else item_groups
+    for item_name, item_group in groups.items():
+        yield GroupTotals(item_name, item_group['total_quantity'], item_group['total_price_cents'])
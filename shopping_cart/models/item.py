@@ -1,19 +1,181 @@
-from dataclasses import dataclass, field
+from dataclasses import FrozenInstanceError
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Mapping, Optional
+import math
+import os
+import random
+import threading
 import uuid
 
-@dataclass(frozen=True)
+# UIDs come from a seeded generator rather than uuid.uuid4(), which reads
+# os.urandom on every call. The generator is reseeded in forked children so
+# that processes never hand out the same sequence.
+_uid_random = random.Random()
+_uid_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_uid_random.seed)
+
+# Variant and version bits of a version 4 UUID (RFC 4122)
+_UID_CLEAR_MASK = ~((0xc000 << 48) | (0xf000 << 64))
+_UID_VERSION_4 = (0x8000 << 48) | (4 << 76)
+
+_set_attribute = object.__setattr__
+
+# Floats from this one up are all whole numbers
+_WHOLE_FLOATS = 2.0 ** 52
+
+# Units added with a quantity are counted rather than stored, so their UIDs
+# are derived instead of drawn: the version 5 UUID of their name and price,
+# with the unit's position in its line in the node field. Every read gives a
+# unit the same UID, and a UID leads back to its line.
+_COUNTED_NAMESPACE = uuid.UUID('6f1c0e2a-5b7d-4c3e-9a8f-2d4b6c8e0f13')
+_POSITION_MASK = (1 << 48) - 1
+
+
+def _generate_uid() -> uuid.UUID:
+    """Generate a random version 4 UUID.
+
+    The instance is filled in directly, the same way uuid.UUID.__setstate__
+    does, which skips the argument handling of uuid.UUID.__init__.
+    """
+    uid = object.__new__(uuid.UUID)
+    _set_attribute(uid, 'int', (_uid_random.getrandbits(128) & _UID_CLEAR_MASK) | _UID_VERSION_4)
+    _set_attribute(uid, 'is_safe', uuid.SafeUUID.unknown)
+    return uid
+
+
+def uid_from_bytes(raw: bytes) -> uuid.UUID:
+    """Rebuild a UID from its 16 bytes, like uuid.UUID(bytes=raw) but faster."""
+    uid = object.__new__(uuid.UUID)
+    _set_attribute(uid, 'int', int.from_bytes(raw, 'big'))
+    _set_attribute(uid, 'is_safe', uuid.SafeUUID.unknown)
+    return uid
+
+
+def uid_from_int(value: int) -> uuid.UUID:
+    """Build a UID from its 128-bit integer, like uuid.UUID(int=value) but faster."""
+    uid = object.__new__(uuid.UUID)
+    _set_attribute(uid, 'int', value)
+    _set_attribute(uid, 'is_safe', uuid.SafeUUID.unknown)
+    return uid
+
+
+def counted_uid_prefix(name: str, price: float) -> int:
+    """Get the bits shared by the UIDs of the counted units of a name and price.
+
+    The UID of the unit at a position of the line is uid_from_int(prefix | position).
+    """
+    return uuid.uuid5(_COUNTED_NAMESPACE, f"{name}\x1f{price!r}").int & ~_POSITION_MASK
+
+
+def find_counted_unit(name: str, lines: Mapping[float, int], uid: uuid.UUID) -> Optional[float]:
+    """Find the counted line a UID was derived for.
+
+    Args:
+        name: The name of the lines.
+        lines: The counted lines of the name, mapping unit prices to quantities.
+        uid: The UID to look for.
+
+    Returns:
+        The unit price of the line holding a unit with that UID, or None.
+    """
+    # Drawn UIDs are version 4, which rules them out without hashing anything
+    if not lines or uid.version != 5:
+        return None
+    position = uid.int & _POSITION_MASK
+    prefix = uid.int - position
+    for price, quantity in lines.items():
+        if position < quantity and counted_uid_prefix(name, price) == prefix:
+            return price
+    return None
+
+
+def to_cents(price: float) -> int:
+    """Convert a price to an integer number of cents, rounding half up.
+
+    Prices that are a whole number of cents up to float noise, which is
+    nearly all of them, skip the Decimal conversion.
+    """
+    if price >= _WHOLE_FLOATS:
+        # Scaling would round, or overflow to inf near the float maximum
+        return int(price) * 100
+    scaled = price * 100
+    cents = round(scaled)
+    if abs(scaled - cents) < 1e-6:
+        return int(cents)
+    return int((Decimal(repr(price)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
 class Item:
-    """Class representing an item/product."""
-    name: str
-    price: float
-    uid: uuid.UUID = field(default_factory=uuid.uuid4)
+    """Class representing an item/product.
+
+    Items are immutable and slotted. The UID is only generated the first time
+    it is read, so creating an item does not pay for it until it is needed.
+    The price is also kept as an exact number of cents, which is what the
+    cart adds up.
+    """
+    __slots__ = ('name', 'price', 'price_cents', '_uid')
 
-    def __post_init__(self):
-        if not isinstance(self.name, str):
+    def __init__(self, name: str, price: float, uid: Optional[uuid.UUID] = None):
+        if not isinstance(name, str):
             raise TypeError("Item name nust be a string.")
-        elif not self.name:
+        elif not name:
             raise ValueError("Item name must be a non-empty string.")
-        if not isinstance(self.price, float):
+        if not isinstance(price, float):
             raise TypeError("Item price must be a float.")
-        elif self.price < 0:
+        elif not math.isfinite(price):
+            raise ValueError("Price must be a finite float.")
+        elif price < 0:
             raise ValueError("Price must be a non-negative float.")
+
+        _set_attribute(self, 'name', name)
+        _set_attribute(self, 'price', price)
+        _set_attribute(self, 'price_cents', to_cents(price))
+        _set_attribute(self, '_uid', uid)
+
+    @property
+    def uid(self) -> uuid.UUID:
+        """The unique identifier of the item, generated on first access."""
+        uid = self._uid
+        if uid is None:
+            with _uid_lock:
+                uid = self._uid
+                if uid is None:
+                    uid = _generate_uid()
+                    _set_attribute(self, '_uid', uid)
+        return uid
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return (self.name, self.price, self.uid) == (other.name, other.price, other.uid)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.name, self.price, self.uid))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(name={self.name!r}, price={self.price!r}, uid={self.uid!r})"
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, self.price, self.uid))
+
+
+def item_from_template(name: str, price: float, price_cents: int, uid: Optional[uuid.UUID] = None) -> Item:
+    """Build an Item from fields that were validated once already, e.g. those of a catalog template.
+
+    This skips the checks and the cents conversion of Item.__init__, and the
+    item shares the template's name string.
+    """
+    item = object.__new__(Item)
+    _set_attribute(item, 'name', name)
+    _set_attribute(item, 'price', price)
+    _set_attribute(item, 'price_cents', price_cents)
+    _set_attribute(item, '_uid', uid)
+    return item
@@ -0,0 +1,345 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+import logging
+from shopping_cart.models.item import to_cents
+
+logger = logging.getLogger(__name__)
+
+
+class DiscountLine(NamedTuple):
+    """A discount granted by a promotion, as printed on receipts."""
+
+    description: str
+    # The item name the discount applies to, or None for the whole cart
+    item_name: Optional[str]
+    amount_cents: int
+
+    @property
+    def amount(self) -> float:
+        """The amount as a float with two decimals."""
+        return self.amount_cents / 100
+
+
+class ItemPromotion(ABC):
+    """A promotion on the units of a single item name.
+
+    Its discount only depends on the units of that name, given as the
+    number of units at each unit price, so it is re-evaluated only when
+    units of that name are added or removed.
+    """
+
+    def __init__(self, item_name: str, description: Optional[str] = None):
+        if not isinstance(item_name, str) or not item_name:
+            raise ValueError("The item name of a promotion must be a non-empty string.")
+        self.item_name = item_name
+        self.description = description or self.default_description()
+
+    @abstractmethod
+    def default_description(self) -> str:
+        """Describe the promotion, for receipts."""
+        pass
+
+    @abstractmethod
+    def discount_cents(self, price_counts: Mapping[int, int], quantity: int, subtotal_cents: int) -> int:
+        """Compute the discount on the units of the promotion's name.
+
+        Args:
+            price_counts: The number of units at each unit price, in cents.
+            quantity: The number of units.
+            subtotal_cents: The price of all the units, in cents.
+
+        Returns:
+            The discount in cents, between 0 and subtotal_cents.
+        """
+        pass
+
+
+class CartPromotion(ABC):
+    """A promotion on the whole cart, such as a spending threshold."""
+
+    item_name = None
+
+    def __init__(self, description: Optional[str] = None):
+        self.description = description or self.default_description()
+
+    @abstractmethod
+    def default_description(self) -> str:
+        """Describe the promotion, for receipts."""
+        pass
+
+    @abstractmethod
+    def discount_cents(self, subtotal_cents: int) -> int:
+        """Compute the discount on the cart.
+
+        Args:
+            subtotal_cents: The cart's total, in cents, after item discounts.
+
+        Returns:
+            The discount in cents, between 0 and subtotal_cents.
+        """
+        pass
+
+
+class BuyOneGetOneFree(ItemPromotion):
+    """Every second unit of a name is free, the cheapest units first."""
+
+    def default_description(self) -> str:
+        return f"{self.item_name}: buy one, get one free"
+
+    def discount_cents(self, price_counts: Mapping[int, int], quantity: int, subtotal_cents: int) -> int:
+        return _cheapest_cents(price_counts, quantity // 2)
+
+
+class MultiBuy(ItemPromotion):
+    """N units of a name for a fixed price ("3 for $5")."""
+
+    def __init__(self, item_name: str, quantity: int, price: float, description: Optional[str] = None):
+        """Initialize the promotion.
+
+        Args:
+            item_name: The name of the items.
+            quantity: The number of units sold together, at least 2.
+            price: The price of those units together.
+            description: Overrides the description printed on receipts.
+
+        Raises:
+            ValueError: If the quantity or the price is invalid.
+        """
+        if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 2:
+            raise ValueError("A multi-buy needs a quantity of at least 2.")
+        if not isinstance(price, (int, float)) or price < 0:
+            raise ValueError("A multi-buy needs a non-negative price.")
+        self.quantity = quantity
+        self.price_cents = to_cents(float(price))
+        super().__init__(item_name, description)
+
+    def default_description(self) -> str:
+        return f"{self.item_name}: {self.quantity} for {_dollars(self.price_cents)}"
+
+    def discount_cents(self, price_counts: Mapping[int, int], quantity: int, subtotal_cents: int) -> int:
+        bundles = quantity // self.quantity
+        if not bundles:
+            return 0
+        # Bundles are made of the priciest units, which is what they save the most on
+        bundled_cents = subtotal_cents - _cheapest_cents(price_counts, quantity - bundles * self.quantity)
+        return max(0, bundled_cents - bundles * self.price_cents)
+
+
+class PercentOff(ItemPromotion):
+    """A percentage off every unit of a name."""
+
+    def __init__(self, item_name: str, percent: float, description: Optional[str] = None):
+        """Initialize the promotion.
+
+        Raises:
+            ValueError: If the percentage is not within (0, 100].
+        """
+        if not isinstance(percent, (int, float)) or not 0 < percent <= 100:
+            raise ValueError("A percentage off must be greater than 0 and at most 100.")
+        self.percent = percent
+        super().__init__(item_name, description)
+
+    def default_description(self) -> str:
+        return f"{self.item_name}: {self.percent:g}% off"
+
+    def discount_cents(self, price_counts: Mapping[int, int], quantity: int, subtotal_cents: int) -> int:
+        return _percent_of(subtotal_cents, self.percent)
+
+
+class SpendThreshold(CartPromotion):
+    """An amount, or a percentage, off carts that reach a total."""
+
+    def __init__(self, threshold: float, amount_off: float = 0.0, percent_off: float = 0.0,
+                 description: Optional[str] = None):
+        """Initialize the promotion.
+
+        Args:
+            threshold: The total, after item discounts, from which the promotion applies.
+            amount_off: The amount taken off.
+            percent_off: The percentage taken off, instead of an amount.
+            description: Overrides the description printed on receipts.
+
+        Raises:
+            ValueError: If the threshold is negative, or unless exactly one of
+                amount_off and percent_off is given and valid.
+        """
+        if not isinstance(threshold, (int, float)) or threshold < 0:
+            raise ValueError("The threshold must be a non-negative price.")
+        if (amount_off > 0) == (percent_off > 0) or amount_off < 0 or not 0 <= percent_off <= 100:
+            raise ValueError("Exactly one of amount_off and percent_off must be given.")
+        self.threshold_cents = to_cents(float(threshold))
+        self.amount_off_cents = to_cents(float(amount_off))
+        self.percent_off = percent_off
+        super().__init__(description)
+
+    def default_description(self) -> str:
+        if self.percent_off:
+            return f"{self.percent_off:g}% off orders of {_dollars(self.threshold_cents)} or more"
+        return f"{_dollars(self.amount_off_cents)} off orders of {_dollars(self.threshold_cents)} or more"
+
+    def discount_cents(self, subtotal_cents: int) -> int:
+        if subtotal_cents < self.threshold_cents:
+            return 0
+        if self.percent_off:
+            return _percent_of(subtotal_cents, self.percent_off)
+        return min(self.amount_off_cents, subtotal_cents)
+
+
+class PromotionEngine:
+    """Keeps the discounts of a cart's promotions up to date as units come and go.
+
+    Item promotions are indexed by name, and the engine keeps the number of
+    units at each price of the names they cover. When units of a name are
+    added or removed, only the promotions of that name are evaluated again,
+    against those counts, which costs one step per distinct unit price. Cart
+    promotions are then evaluated against the total after item discounts;
+    the best one applies. The discount is kept as a running total, so
+    reading it costs O(1).
+    """
+
+    def __init__(self, promotions: Iterable[Union[ItemPromotion, CartPromotion]]):
+        """Index the promotions.
+
+        Args:
+            promotions: ItemPromotion and CartPromotion instances.
+
+        Raises:
+            TypeError: If a promotion is of neither kind.
+        """
+        self.promotions = list(promotions)
+        self._item_promotions: Dict[str, List[ItemPromotion]] = {}
+        self._cart_promotions: List[CartPromotion] = []
+        for promotion in self.promotions:
+            if isinstance(promotion, ItemPromotion):
+                self._item_promotions.setdefault(promotion.item_name, []).append(promotion)
+            elif isinstance(promotion, CartPromotion):
+                self._cart_promotions.append(promotion)
+            else:
+                raise TypeError("Promotions must be ItemPromotion or CartPromotion instances.")
+        logger.debug(f"Indexed {len(self.promotions)} promotions on {len(self._item_promotions)} item names.")
+
+        # For the names that have promotions: units per unit price in cents,
+        # and the quantity and subtotal in cents of those units
+        self._price_counts: Dict[str, Dict[int, int]] = {}
+        self._name_totals: Dict[str, List[int]] = {}
+        # The amount of each promotion of a name, for the names that have a discount
+        self._item_amounts: Dict[str, List[int]] = {}
+        self._name_discount_cents: Dict[str, int] = {}
+        self._item_discount_cents = 0
+        self._cart_discount: Optional[Tuple[CartPromotion, int]] = None
+        self.discount_cents = 0
+
+    def covers(self, item_name: str) -> bool:
+        """Tell whether a name has promotions of its own."""
+        return item_name in self._item_promotions
+
+    def units_changed(self, item_name: str, price_deltas: Mapping[int, int], total_price_cents: int) -> None:
+        """Re-evaluate the promotions touched by added or removed units of a name.
+
+        Args:
+            item_name: The name whose units changed.
+            price_deltas: The number of units added, or removed if negative,
+                at each unit price in cents.
+            total_price_cents: The cart's total after the change.
+        """
+        promotions = self._item_promotions.get(item_name)
+        if promotions is not None:
+            price_counts = self._price_counts.get(item_name)
+            if price_counts is None:
+                price_counts = self._price_counts[item_name] = {}
+                totals = self._name_totals[item_name] = [0, 0]
+            else:
+                totals = self._name_totals[item_name]
+            for price_cents, delta in price_deltas.items():
+                count = price_counts.get(price_cents, 0) + delta
+                if count:
+                    price_counts[price_cents] = count
+                else:
+                    del price_counts[price_cents]
+                totals[0] += delta
+                totals[1] += price_cents * delta
+            self._evaluate_name(item_name, promotions, price_counts, totals[0], totals[1])
+        self.total_changed(total_price_cents)
+
+    def total_changed(self, total_price_cents: int) -> None:
+        """Re-evaluate the cart promotions against a new cart total.
+
+        Args:
+            total_price_cents: The cart's total, before discounts.
+        """
+        subtotal_cents = total_price_cents - self._item_discount_cents
+        best = None
+        best_cents = 0
+        for promotion in self._cart_promotions:
+            amount_cents = min(promotion.discount_cents(subtotal_cents), subtotal_cents)
+            if amount_cents > best_cents:
+                best, best_cents = promotion, amount_cents
+        self._cart_discount = None if best is None else (best, best_cents)
+        self.discount_cents = self._item_discount_cents + best_cents
+
+    def reset(self) -> None:
+        """Forget every unit, as when the cart is cleared."""
+        self._price_counts.clear()
+        self._name_totals.clear()
+        self._item_amounts.clear()
+        self._name_discount_cents.clear()
+        self._item_discount_cents = 0
+        self._cart_discount = None
+        self.discount_cents = 0
+
+    def discount_lines(self) -> List[DiscountLine]:
+        """List the discounts currently granted, item discounts first, in the order of the promotions."""
+        lines = [
+            DiscountLine(promotion.description, item_name, amount_cents)
+            for item_name, promotions in self._item_promotions.items()
+            for promotion, amount_cents in zip(promotions, self._item_amounts.get(item_name, ()))
+            if amount_cents
+        ]
+        if self._cart_discount is not None:
+            promotion, amount_cents = self._cart_discount
+            lines.append(DiscountLine(promotion.description, None, amount_cents))
+        return lines
+
+    def _evaluate_name(self, item_name: str, promotions: List[ItemPromotion], price_counts: Dict[int, int],
+                       quantity: int, subtotal_cents: int) -> None:
+        """Recompute the discounts of a name from its unit counts."""
+        amounts = []
+        remaining_cents = subtotal_cents
+        for promotion in promotions:
+            # Promotions of the same name add up, but never beyond the name's subtotal
+            amount_cents = min(promotion.discount_cents(price_counts, quantity, subtotal_cents), remaining_cents)
+            amount_cents = max(amount_cents, 0)
+            amounts.append(amount_cents)
+            remaining_cents -= amount_cents
+
+        discount_cents = subtotal_cents - remaining_cents
+        previous_cents = self._name_discount_cents.pop(item_name, 0)
+        self._item_amounts.pop(item_name, None)
+        if discount_cents:
+            self._name_discount_cents[item_name] = discount_cents
+            self._item_amounts[item_name] = amounts
+        if not quantity:
+            del self._price_counts[item_name]
+            del self._name_totals[item_name]
+        self._item_discount_cents += discount_cents - previous_cents
+
+
+def _cheapest_cents(price_counts: Mapping[int, int], quantity: int) -> int:
+    """Add up the prices of the quantity cheapest units."""
+    total_cents = 0
+    for price_cents in sorted(price_counts):
+        if quantity <= 0:
+            break
+        taken = min(quantity, price_counts[price_cents])
+        total_cents += taken * price_cents
+        quantity -= taken
+    return total_cents
+
+
+def _dollars(cents: int) -> str:
+    return f"${cents // 100}.{cents % 100:02d}"
+
+
+def _percent_of(cents: int, percent: float) -> int:
+    """Take a percentage of an amount in cents, rounding half up."""
+    return to_cents(cents * percent / 10000)
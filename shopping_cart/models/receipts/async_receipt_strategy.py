@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from shopping_cart.models.receipts.receipt_strategy_factory import get_receipt_strategy
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class ConcurrencyLimiter:
+    """Limit on the receipt operations running at once in each event loop.
+
+    Async strategies sharing a limiter share its slots, so the bound holds
+    across every format using it rather than per format.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        """Initialize the limiter.
+
+        Args:
+            max_concurrency: The number of operations allowed to run at once.
+
+        Raises:
+            ValueError: If max_concurrency is not positive.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+        self.max_concurrency = max_concurrency
+        # Semaphores are bound to the event loop they are used in
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+# Limiters shared by the async strategies of every format, one per bound
+_limiters: Dict[int, ConcurrencyLimiter] = {}
+# Async strategies, one per strategy, limiter and executor
+_async_strategies: Dict[Tuple[BaseReceiptStrategy, ConcurrencyLimiter, Optional[Executor]],
+                        'AsyncReceiptStrategy'] = {}
+_lock = threading.Lock()
+
+
+def get_limiter(max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> ConcurrencyLimiter:
+    """Get the limiter shared by the async strategies allowing max_concurrency operations.
+
+    Args:
+        max_concurrency: The number of operations allowed to run at once.
+
+    Returns:
+        The shared instance of ConcurrencyLimiter.
+
+    Raises:
+        ValueError: If max_concurrency is not positive.
+    """
+    with _lock:
+        limiter = _limiters.get(max_concurrency)
+        if limiter is None:
+            limiter = _limiters[max_concurrency] = ConcurrencyLimiter(max_concurrency)
+    return limiter
+
+
+def _resolve_limiter(max_concurrency: Optional[int], limiter: Optional[ConcurrencyLimiter]) -> ConcurrencyLimiter:
+    """Get the given limiter, or the shared one of max_concurrency."""
+    if limiter is None:
+        return get_limiter(DEFAULT_MAX_CONCURRENCY if max_concurrency is None else max_concurrency)
+    if max_concurrency is not None:
+        raise ValueError("max_concurrency cannot be given with a limiter.")
+    return limiter
+
+
+class AsyncReceiptStrategy:
+    """Asynchronous counterpart of a receipt strategy.
+
+    Receipts are formatted and written in an executor (the event loop's
+    default one unless another is given), so the event loop is never
+    blocked. At most `max_concurrency` operations run at a time per event
+    loop; the others wait their turn without occupying a worker. Unless
+    given their own limiter, async strategies share the limiter of their
+    max_concurrency with those of every other format.
+
+    The receipt data is read from the executor's threads, so it must not be
+    modified until the operation completes.
+    """
+
+    def __init__(self, strategy: BaseReceiptStrategy, max_concurrency: Optional[int] = None,
+                 executor: Optional[Executor] = None, limiter: Optional[ConcurrencyLimiter] = None):
+        """Initialize the async strategy.
+
+        Args:
+            strategy: The strategy formatting the receipts.
+            max_concurrency: The number of operations allowed to run at once,
+                counted with every async strategy of the same limit.
+            executor: The executor running the formatting and writing.
+            limiter: A limiter to use instead of the shared one.
+
+        Raises:
+            ValueError: If max_concurrency is not positive, or is given with a limiter.
+        """
+        limiter = _resolve_limiter(max_concurrency, limiter)
+        self.strategy = strategy
+        self.executor = executor
+        self.limiter = limiter
+
+    @property
+    def max_concurrency(self) -> int:
+        """The number of operations allowed to run at once."""
+        return self.limiter.max_concurrency
+
+    async def generate(self, data: Dict[str, any], file_path: Optional[str] = None,
+                       atomic: bool = False) -> str:
+        """Generate the receipt without blocking the event loop.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+            file_path: Optional file path to save the receipt.
+            atomic: Whether to save the receipt through a temporary file
+                renamed over the file path.
+
+        Returns:
+            The receipt content as a string.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        return await self._run(self.strategy.generate, data, file_path, None, atomic)
+
+    async def save(self, receipt_content: str, file_path: str, atomic: bool = False) -> None:
+        """Save an already rendered receipt without blocking the event loop.
+
+        Args:
+            receipt_content: The receipt content as a string.
+            file_path: The file path to save the receipt.
+            atomic: Whether to write a temporary file and rename it over the file path.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        await self._run(self.strategy.save, receipt_content, file_path, atomic)
+
+    async def write_file(self, data: Dict[str, any], file_path: str, atomic: bool = False) -> None:
+        """Stream the receipt to a file without blocking the event loop.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+            file_path: The file path to save the receipt.
+            atomic: Whether to write a temporary file and rename it over the file path.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        await self._run(self.strategy.write_file, data, file_path, None, atomic)
+
+    async def _run(self, function: Callable, *args) -> any:
+        """Run a blocking call in the executor once a slot is free."""
+        async with self.limiter.semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(function, *args))
+
+
+def get_async_receipt_strategy(format_type: str, max_concurrency: Optional[int] = None,
+                               executor: Optional[Executor] = None,
+                               limiter: Optional[ConcurrencyLimiter] = None, **options) -> AsyncReceiptStrategy:
+    """Get the async strategy of a format.
+
+    Like get_receipt_strategy, instances are shared. Their limit on
+    concurrent operations is shared across formats as well, so at most
+    max_concurrency receipts are formatted or written at once whatever
+    their format.
+
+    Args:
+        format_type: The desired format ('csv', 'text', 'json', 'yaml').
+        max_concurrency: The number of operations allowed to run at once (8 by default).
+        executor: The executor running the formatting and writing, the
+            event loop's default one if not given.
+        limiter: A limiter to use instead of the shared one.
+        **options: Keyword arguments for the strategy's constructor.
+
+    Returns:
+        An instance of AsyncReceiptStrategy.
+
+    Raises:
+        ValueError: If the format_type is not supported, if max_concurrency is
+            not positive, or if it is given with a limiter.
+    """
+    strategy = get_receipt_strategy(format_type, **options)
+    limiter = _resolve_limiter(max_concurrency, limiter)
+    key = (strategy, limiter, executor)
+    with _lock:
+        async_strategy = _async_strategies.get(key)
+        if async_strategy is None:
+            async_strategy = _async_strategies[key] = AsyncReceiptStrategy(strategy, executor=executor,
+                                                                           limiter=limiter)
+    return async_strategy
@@ -1,17 +1,167 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from contextlib import contextmanager, suppress
+from typing import IO, Dict, Iterable, Iterator, Optional
+import io
+import os
 import uuid
+from shopping_cart.models.frozen_items import GroupTotals, iter_group_totals, iter_group_units, iter_instances
+from shopping_cart.models.item import Item
+
+# Chunks are collected into blocks of roughly this many characters before
+# being written, so streaming stays in bounded memory without issuing one
+# write call per receipt line.
+WRITE_BLOCK_SIZE = 64 * 1024
+
 
 class BaseReceiptStrategy(ABC):
-    """Abstract base class for receipt generation strategies."""
+    """Abstract base class for receipt generation strategies.
+
+    A receipt is rendered as a header, one fragment per item and a footer.
+    Fragments only depend on their item, which lets callers cache them by UID
+    and re-render a receipt without formatting unchanged items again.
+
+    Grouped receipts have one fragment per item name instead, rendered from
+    the quantity and subtotal the cart keeps for each name, so their cost
+    depends on the number of names rather than the number of units.
+    """
+
+    # Newline handling used when opening receipt files (see open()).
+    newline: Optional[str] = None
+    encoding: str = 'utf-8'
+    # Text inserted between consecutive item fragments.
+    item_separator: str = ''
+    # Whether the receipt lists names with their quantity and subtotal instead of units.
+    grouped: bool = False
+
+    @abstractmethod
+    def render_header(self, data: Dict[str, any]) -> str:
+        """Render the part of the receipt that precedes the items.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+
+        Returns:
+            The receipt header.
+        """
+        pass
+
+    @abstractmethod
+    def render_item(self, item: Item) -> str:
+        """Render the fragment of the receipt for a single item.
+
+        Args:
+            item: The Item instance to render.
+
+        Returns:
+            The item fragment.
+        """
+        pass
 
     @abstractmethod
-    def generate(self, data: Dict[str, any], file_path: Optional[str] = None) -> str:
+    def render_footer(self, data: Dict[str, any]) -> str:
+        """Render the part of the receipt that follows the items.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+
+        Returns:
+            The receipt footer.
+        """
+        pass
+
+    def render_items(self, items: Iterable[Item]) -> Iterator[str]:
+        """Render the fragments for a sequence of items.
+
+        Strategies can override this to format items in batches; the
+        concatenation of what it yields must equal the item fragments
+        joined with item_separator.
+        """
+        separator = self.item_separator
+        first = True
+        for item in items:
+            if separator and not first:
+                yield separator
+            yield self.render_item(item)
+            first = False
+
+    def render_group(self, group: GroupTotals) -> str:
+        """Render the fragment of a grouped receipt for all the units of a name.
+
+        Args:
+            group: The name with its quantity and subtotal.
+
+        Returns:
+            The group fragment.
+
+        Raises:
+            NotImplementedError: If the strategy has no grouped layout.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support grouped receipts.")
+
+    def render_groups(self, groups: Iterable[GroupTotals]) -> Iterator[str]:
+        """Render the fragments for a sequence of GroupTotals.
+
+        Like render_items, strategies can override this to format groups in batches.
+        """
+        separator = self.item_separator
+        first = True
+        for group in groups:
+            if separator and not first:
+                yield separator
+            yield self.render_group(group)
+            first = False
+
+    def iter_chunks(self, data: Dict[str, any],
+                    fragment_cache: Optional[Dict[uuid.UUID, str]] = None) -> Iterator[str]:
+        """Render the receipt as a sequence of text chunks.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+            fragment_cache: Optional mapping of UIDs to item fragments rendered
+                earlier by this strategy. Missing fragments are rendered and
+                added. Ignored by grouped receipts.
+
+        Returns:
+            An iterator over the pieces of the receipt, in order.
+        """
+        yield self.render_header(data)
+
+        if self.grouped:
+            yield from self.render_groups(iter_receipt_groups(data))
+        elif fragment_cache is None:
+            yield from self.render_items(iter_receipt_items(data))
+        else:
+            separator = self.item_separator
+            first = True
+            for item_name, item_group in data['items'].items():
+                # Counted units are not stored, and caching their fragments
+                # would make memory grow with them again
+                for item in item_group['instances']:
+                    fragment = fragment_cache.get(item.uid)
+                    if fragment is None:
+                        fragment = fragment_cache[item.uid] = self.render_item(item)
+                    if separator and not first:
+                        yield separator
+                    yield fragment
+                    first = False
+                for item in iter_group_units(item_name, item_group):
+                    if separator and not first:
+                        yield separator
+                    yield self.render_item(item)
+                    first = False
+
+        yield self.render_footer(data)
+
+    def generate(self, data: Dict[str, any], file_path: Optional[str] = None,
+                 fragment_cache: Optional[Dict[uuid.UUID, str]] = None, atomic: bool = False) -> str:
         """Generate the receipt.
 
         Args:
-            cart_items: A dictionary of cart items and their details.
+            data: A dictionary containing 'items' and 'total_price'.
             file_path: Optional file path to save the receipt.
+            fragment_cache: Optional cache of item fragments (see iter_chunks).
+            atomic: Whether to save the receipt through a temporary file
+                renamed over the file path.
 
         Returns:
             The receipt content as a string.
@@ -19,4 +169,181 @@ class BaseReceiptStrategy(ABC):
         Raises:
             IOError: If the file cannot be written to the specified path.
         """
-        pass
+        receipt_content = ''.join(self.iter_chunks(data, fragment_cache))
+        if file_path:
+            self.save(receipt_content, file_path, atomic)
+        return receipt_content
+
+    def iter_byte_chunks(self, data: Dict[str, any],
+                         fragment_cache: Optional[Dict[uuid.UUID, str]] = None) -> Iterator[bytes]:
+        """Render the receipt as a sequence of encoded chunks.
+
+        Strategies whose encoders produce bytes natively can override this to
+        skip the round trip through str.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+            fragment_cache: Optional cache of item fragments (see iter_chunks).
+
+        Returns:
+            An iterator over the pieces of the receipt, encoded with the strategy's encoding.
+        """
+        encoding = self.encoding
+        for chunk in self.iter_chunks(data, fragment_cache):
+            yield chunk.encode(encoding)
+
+    def generate_bytes(self, data: Dict[str, any],
+                       fragment_cache: Optional[Dict[uuid.UUID, str]] = None) -> bytes:
+        """Generate the receipt as bytes, ready for a socket or a binary file.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+            fragment_cache: Optional cache of item fragments (see iter_chunks).
+
+        Returns:
+            The receipt content, encoded with the strategy's encoding.
+        """
+        return b''.join(self.iter_byte_chunks(data, fragment_cache))
+
+    def save(self, receipt_content: str, file_path: str, atomic: bool = False) -> None:
+        """Save an already rendered receipt.
+
+        Args:
+            receipt_content: The receipt content as a string.
+            file_path: The file path to save the receipt.
+            atomic: Whether to write a temporary file and rename it over the
+                file path, so that the file is never seen half written.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        try:
+            with self._open_file(file_path, atomic) as file:
+                file.write(receipt_content)
+        except IOError as e:
+            raise IOError(f"Unable to write to file: {file_path}") from e
+
+    def write(self, data: Dict[str, any], stream: IO,
+              fragment_cache: Optional[Dict[uuid.UUID, str]] = None) -> None:
+        """Write the receipt to a stream incrementally, without building it in memory.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+            stream: A writable text or binary stream. Text written to a binary
+                stream is encoded with the strategy's encoding.
+            fragment_cache: Optional cache of item fragments (see iter_chunks).
+        """
+        if is_binary_stream(stream):
+            chunks, empty = self.iter_byte_chunks(data, fragment_cache), b''
+        else:
+            chunks, empty = self.iter_chunks(data, fragment_cache), ''
+
+        block = []
+        block_size = 0
+        for chunk in chunks:
+            block.append(chunk)
+            block_size += len(chunk)
+            if block_size >= WRITE_BLOCK_SIZE:
+                stream.write(empty.join(block))
+                block = []
+                block_size = 0
+        if block:
+            stream.write(empty.join(block))
+
+    def write_file(self, data: Dict[str, any], file_path: str,
+                   fragment_cache: Optional[Dict[uuid.UUID, str]] = None, atomic: bool = False) -> None:
+        """Stream the receipt to a file.
+
+        Args:
+            data: A dictionary containing 'items' and 'total_price'.
+            file_path: The file path to save the receipt.
+            fragment_cache: Optional cache of item fragments (see iter_chunks).
+            atomic: Whether to write a temporary file and rename it over the
+                file path, so that the file is never seen half written.
+
+        Raises:
+            IOError: If the file cannot be written to the specified path.
+        """
+        try:
+            with self._open_file(file_path, atomic) as file:
+                self.write(data, file, fragment_cache)
+        except IOError as e:
+            raise IOError(f"Unable to write to file: {file_path}") from e
+
+    @contextmanager
+    def _open_file(self, file_path: str, atomic: bool) -> Iterator[IO]:
+        """Open a receipt file for writing, through a temporary file when atomic."""
+        if not atomic:
+            with open(file_path, 'w', newline=self.newline, encoding=self.encoding) as file:
+                yield file
+            return
+
+        # The temporary file lives next to the target so that the rename stays on one file system.
+        # It is created like open() would, so the kernel applies the current umask to new receipts
+        directory, name = os.path.split(os.path.abspath(file_path))
+        while True:
+            temporary_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+            try:
+                descriptor = os.open(temporary_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+                break
+            except FileExistsError:
+                continue
+        try:
+            with open(descriptor, 'w', newline=self.newline, encoding=self.encoding) as file:
+                yield file
+                file.flush()
+                os.fsync(file.fileno())
+            # A replaced receipt keeps its mode
+            with suppress(FileNotFoundError):
+                os.chmod(temporary_path, os.stat(file_path).st_mode & 0o7777)
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(temporary_path)
+            raise
+
+
+def iter_receipt_items(data: Dict[str, any]) -> Iterator[Item]:
+    """Iterate over every item instance in the receipt data, group by group."""
+    return iter_instances(data['items'])
+
+
+def iter_receipt_groups(data: Dict[str, any]) -> Iterator[GroupTotals]:
+    """Iterate over the quantity and subtotal of every name in the receipt data."""
+    return iter_group_totals(data['items'])
+
+
+def receipt_adjustments(data: Dict[str, any]) -> Dict[str, any]:
+    """Collect the fields that follow the total price, the way they appear on receipts.
+
+    Receipt data only has 'discounts' when the cart has promotions, 'taxes'
+    when it has a tax table, and 'total_due' when it has either.
+    """
+    fields = {}
+    if 'discounts' in data:
+        fields['discounts'] = [
+            {'description': discount.description, 'name': discount.item_name, 'amount': discount.amount}
+            for discount in data['discounts']
+        ]
+    if 'taxes' in data:
+        fields['taxes'] = [
+            {'category': tax.category, 'rate': tax.rate, 'taxable': tax.taxable_cents / 100, 'amount': tax.tax}
+            for tax in data['taxes']
+        ]
+    if 'total_due' in data:
+        fields['total_due'] = data['total_due']
+    return fields
+
+
+def format_cents(cents: int) -> str:
+    """Format an amount in cents with two decimals."""
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def is_binary_stream(stream: IO) -> bool:
+    """Tell whether a stream expects bytes rather than text."""
+    if isinstance(stream, io.TextIOBase):
+        return False
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    return 'b' in getattr(stream, 'mode', '')
@@ -0,0 +1,159 @@
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice, repeat
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+import logging
+import os
+from shopping_cart.models.item import Item, uid_from_bytes
+from shopping_cart.models.receipts.receipt_strategy_factory import get_receipt_strategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = {'process': ProcessPoolExecutor, 'thread': ThreadPoolExecutor}
+
+# What a worker needs to render a cart's receipts: for each name, the raw
+# 16-byte UIDs and the prices of its units followed by its quantity and
+# subtotal in cents; then the cart's total in cents, and its discounts, taxes
+# and total due when it has any. It pickles to a fraction of the size of the
+# Item objects.
+GroupSnapshot = Tuple[str, bytes, array, int, int]
+CartSnapshot = Tuple[Tuple[GroupSnapshot, ...], int, Dict[str, any]]
+
+Carts = Union[Mapping[any, ShoppingCart], Iterable[ShoppingCart]]
+Formats = Union[Iterable[str], Mapping[str, Dict[str, any]]]
+
+
+def render_receipts(carts: Carts, formats: Formats, output_dir: str,
+                    executor: Union[str, Executor] = 'process', max_workers: Optional[int] = None,
+                    chunksize: int = 16) -> List[str]:
+    """Render the receipts of many carts in many formats in parallel.
+
+    Carts are reduced to compact snapshots in the calling process and
+    rendered by the workers, each receipt streamed to
+    '<output_dir>/<cart id>.<format>'. With a process pool, formats
+    registered at runtime must also be registered in the worker processes,
+    which is the case when they are forked.
+
+    Args:
+        carts: A mapping of cart ids to carts, or carts identified by their position.
+        formats: Format names, or a mapping of format names to strategy
+            options, e.g. {'json': {'compact': True}, 'csv': {}}.
+        output_dir: The directory receipts are written to, created if missing.
+        executor: 'process' or 'thread' for a pool created for the call, or
+            an existing Executor to submit the work to.
+        max_workers: The number of workers of the pool created for the call;
+            the executor's default if omitted.
+        chunksize: The number of carts handed to a worker at a time.
+
+    Returns:
+        The paths of the written receipts, cart by cart, in format order.
+
+    Raises:
+        ValueError: If the executor or a format is not supported, or if a
+            cart id would put its receipts outside the output directory.
+    """
+    format_options = dict(formats) if isinstance(formats, Mapping) else {format_type: {} for format_type in formats}
+    # Getting the strategies checks the formats before any work is sent out
+    with_units = any(
+        not get_receipt_strategy(format_type, **options).grouped for format_type, options in format_options.items()
+    )
+    if not isinstance(carts, Mapping):
+        carts = dict(enumerate(carts))
+    cart_ids = [str(cart_id) for cart_id in carts]
+    for cart_id in cart_ids:
+        _check_cart_id(cart_id)
+
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = ((cart_id, snapshot_cart(cart, with_units)) for cart_id, cart in zip(cart_ids, carts.values()))
+    chunks = iter(lambda: list(islice(tasks, chunksize)), [])
+
+    if isinstance(executor, Executor):
+        paths = _render_all(executor, chunks, format_options, output_dir)
+    elif executor in EXECUTORS:
+        with EXECUTORS[executor](max_workers=max_workers) as pool:
+            paths = _render_all(pool, chunks, format_options, output_dir)
+    else:
+        raise ValueError(f"Unsupported executor '{executor}'. Supported executors are: {list(EXECUTORS)}")
+
+    logger.debug(f"Rendered {len(paths)} receipts for {len(carts)} carts to {output_dir}.")
+    return paths
+
+
+def snapshot_cart(cart: ShoppingCart, with_units: bool = True) -> CartSnapshot:
+    """Reduce a cart to the compact form handed to workers.
+
+    Args:
+        cart: The cart to snapshot.
+        with_units: Whether to include every unit, which per-unit receipts
+            need. Units added with a quantity are included with the UIDs
+            derived from their line, as generate_receipt lists them.
+            Grouped receipts only need the totals.
+
+    Returns:
+        The cart snapshot.
+    """
+    groups = []
+    for item_name, item_group in cart.list_items().items():
+        if with_units:
+            instances = cart.list_items_by_name(item_name)
+            uids = b''.join([item.uid.bytes for item in instances])
+            prices = array('d', [item.price for item in instances])
+        else:
+            uids, prices = b'', array('d')
+        groups.append((item_name, uids, prices, item_group['total_quantity'], item_group['total_price_cents']))
+    return tuple(groups), cart.total_price_cents, cart.receipt_adjustments()
+
+
+def restore_receipt_data(snapshot: CartSnapshot) -> Dict[str, any]:
+    """Rebuild the data handed to receipt strategies from a cart snapshot.
+
+    Args:
+        snapshot: A snapshot made by snapshot_cart.
+
+    Returns:
+        A dictionary containing 'items' and 'total_price', and the
+        'discounts', 'taxes' and 'total_due' of the cart if it had any.
+    """
+    groups, total_price_cents, adjustments = snapshot
+    items = {}
+    for item_name, uids, prices, total_quantity, group_price_cents in groups:
+        items[item_name] = {
+            'instances': [
+                Item(item_name, price, uid_from_bytes(uids[offset:offset + 16]))
+                for offset, price in zip(range(0, len(uids), 16), prices)
+            ],
+            'lines': {},
+            'total_quantity': total_quantity,
+            'total_price_cents': group_price_cents
+        }
+    return {'items': items, 'total_price': total_price_cents / 100, **adjustments}
+
+
+def _check_cart_id(cart_id: str) -> None:
+    """Check that a cart id names a file directly inside the output directory."""
+    separators = [separator for separator in (os.sep, os.altsep) if separator]
+    if not cart_id or any(separator in cart_id for separator in separators) or os.path.splitdrive(cart_id)[0]:
+        raise ValueError(f"Invalid cart id '{cart_id}': cart ids cannot be empty or contain path separators.")
+
+
+def _render_all(executor: Executor, chunks: Iterable[list], format_options: Dict[str, Dict[str, any]],
+                output_dir: str) -> List[str]:
+    """Spread the chunks of carts over the executor and collect the written paths."""
+    paths = []
+    for chunk_paths in executor.map(_render_chunk, chunks, repeat(format_options), repeat(output_dir)):
+        paths.extend(chunk_paths)
+    return paths
+
+
+def _render_chunk(chunk: List[Tuple[str, CartSnapshot]], format_options: Dict[str, Dict[str, any]],
+                  output_dir: str) -> List[str]:
+    """Write the receipts of a chunk of carts, in a worker."""
+    paths = []
+    for cart_id, snapshot in chunk:
+        data = restore_receipt_data(snapshot)
+        for format_type, options in format_options.items():
+            file_path = os.path.join(output_dir, f"{cart_id}.{format_type}")
+            get_receipt_strategy(format_type, **options).write_file(data, file_path)
+            paths.append(file_path)
+    return paths
@@ -1,46 +1,138 @@
-from typing import Dict, Optional
-from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+import csv
+import io
+import threading
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Type, Union
+import uuid
+from shopping_cart.models.frozen_items import GroupTotals
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.base_receipt_strategy import (
+    BaseReceiptStrategy, format_cents, is_binary_stream, iter_receipt_groups, iter_receipt_items
+)
 
 
 class CSVReceiptStrategy(BaseReceiptStrategy):
-    """Receipt generation strategy for CSV format."""
+    """Receipt generation strategy for CSV format.
 
-    def generate(self, data: Dict[str, any], file_path: Optional[str] = None) -> str:
-        """Generate a receipt in CSV format.
+    Every row goes through csv.writer, so every field is quoted as the
+    dialect requires (RFC 4180 with the default 'excel' dialect). Unit rows
+    are written `batch_size` at a time with writerows.
+    """
+
+    newline = ''
+    batch_size = 1000
+
+    def __init__(self, dialect: Union[str, Type[csv.Dialect]] = 'excel', grouped: bool = False):
+        """Initialize the strategy.
+
+        Args:
+            dialect: The csv dialect, by name or as a csv.Dialect subclass.
+            grouped: Whether to emit one row per item name with its quantity
+                and subtotal, instead of one row per unit.
+        """
+        self.dialect = dialect
+        self.grouped = grouped
+        self._local = threading.local()
+
+    def render_header(self, data: Dict[str, any]) -> str:
+        """Render the CSV header row."""
+        return self._format_row(self._header_row())
+
+    def render_item(self, item: Item) -> str:
+        """Render an item as a CSV row."""
+        return self._format_row(self._item_row(item))
+
+    def render_items(self, items: Iterable[Item]) -> Iterator[str]:
+        """Render the item rows in batches, each written with a single writerows call."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, self.dialect)
+        rows = map(self._item_row, items)
+        batch = list(islice(rows, self.batch_size))
+        while batch:
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            batch = list(islice(rows, self.batch_size))
+
+    def render_footer(self, data: Dict[str, any]) -> str:
+        """Render the total price row, then the discount, tax and total due rows if any."""
+        return ''.join(map(self._format_row, self._footer_rows(data)))
+
+    def render_group(self, group: GroupTotals) -> str:
+        """Render the quantity and subtotal of a name as a CSV row."""
+        return self._format_row(self._group_row(group))
+
+    def render_groups(self, groups: Iterable[GroupTotals]) -> Iterator[str]:
+        """Render the group rows in a single writerows call."""
+        buffer = io.StringIO()
+        csv.writer(buffer, self.dialect).writerows(map(self._group_row, groups))
+        yield buffer.getvalue()
+
+    def iter_rows(self, data: Dict[str, any]) -> Iterator[List[str]]:
+        """Iterate over the rows of the receipt.
 
         Args:
             data: A dictionary containing 'items' and 'total_price'.
-            file_path: Optional file path to save the receipt.
 
         Returns:
-            The receipt content as a CSV-formatted string.
+            An iterator over the receipt rows, header and total included.
+        """
+        yield self._header_row()
+        if self.grouped:
+            yield from map(self._group_row, iter_receipt_groups(data))
+        else:
+            yield from map(self._item_row, iter_receipt_items(data))
+        yield from self._footer_rows(data)
+
+    def write(self, data: Dict[str, any], stream: IO,
+              fragment_cache: Optional[Dict[uuid.UUID, str]] = None) -> None:
+        """Write the receipt to a stream, handing text streams straight to csv.writer."""
+        if fragment_cache is not None or is_binary_stream(stream):
+            super().write(data, stream, fragment_cache)
+            return
+        csv.writer(stream, self.dialect).writerows(self.iter_rows(data))
+
+    def _header_row(self) -> List[str]:
+        """Build the header row."""
+        if self.grouped:
+            return ['Name', 'Quantity', 'Subtotal']
+        return ['UID', 'Name', 'Unit Price']
 
-        Raises:
-            IOError: If the file cannot be written to the specified path.
+    @staticmethod
+    def _item_row(item: Item) -> List[str]:
+        """Build the row of a single unit."""
+        return [str(item.uid), item.name, f"{item.price:.2f}"]
+
+    @staticmethod
+    def _group_row(group: GroupTotals) -> List[str]:
+        """Build the row of all the units of a name."""
+        return [group.name, str(group.quantity), format_cents(group.subtotal_cents)]
+
+    @staticmethod
+    def _footer_rows(data: Dict[str, any]) -> List[List[str]]:
+        """Build the total price row, followed by the discount, tax and total due rows if any.
+
+        They come after the total price row, where readers of plain receipts stop.
         """
-        output = []
-        header = ['UID', 'Name', 'Unit Price']
-        output.append(','.join(header))
-
-        for item_name, item_group in data['items'].items():
-            for item in item_group['instances']:
-                row = [
-                    str(item.uid),
-                    item.name,
-                    f"{item.price:.2f}"
-                ]
-                output.append(','.join(row))
-
-        # Add total price
-        output.append(f"Total Price,,{data['total_price']:.2f}")
-
-        receipt_content = '\n'.join(output)
-
-        if file_path:
-            try:
-                with open(file_path, 'w', newline='') as file:
-                    file.write(receipt_content)
-            except IOError as e:
-                raise IOError(f"Unable to write to file: {file_path}") from e
-
-        return receipt_content
+        rows = [['Total Price', '', f"{data['total_price']:.2f}"]]
+        rows.extend(['Discount', discount.description, f"-{format_cents(discount.amount_cents)}"]
+                    for discount in data.get('discounts', ()))
+        rows.extend(['Tax', f"{tax.category} {tax.rate:g}%", format_cents(tax.tax_cents)]
+                    for tax in data.get('taxes', ()))
+        if 'total_due' in data:
+            rows.append(['Total Due', '', f"{data['total_due']:.2f}"])
+        return rows
+
+    def _format_row(self, row: List[str]) -> str:
+        """Format a single row with a writer reused within the current thread."""
+        local = self._local
+        if not hasattr(local, 'writer'):
+            local.buffer = io.StringIO()
+            local.writer = csv.writer(local.buffer, self.dialect)
+        local.writer.writerow(row)
+        content = local.buffer.getvalue()
+        local.buffer.seek(0)
+        local.buffer.truncate()
+        return content
+
@@ -1,42 +1,183 @@
 import json
-from typing import Dict, Optional
-from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional
+import uuid
+from shopping_cart.models.frozen_items import GroupTotals
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.base_receipt_strategy import (
+    BaseReceiptStrategy, iter_receipt_groups, iter_receipt_items, receipt_adjustments
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Accelerated encoders first: 'auto' picks the first one installed.
+ENCODERS = ('orjson', 'ujson', 'json')
 
 
 class JSONReceiptStrategy(BaseReceiptStrategy):
-    """Receipt generation strategy for JSON format."""
+    """Receipt generation strategy for JSON format.
 
-    def generate(self, data: Dict[str, any], file_path: Optional[str] = None) -> str:
-        """Generate a receipt in JSON format.
+    By default the receipt is laid out exactly as json.dumps(receipt, indent=4)
+    would, but each item is encoded on its own so the document can be streamed.
 
-        Args:
-            data: A dictionary containing 'items' and 'total_price'.
-            file_path: Optional file path to save the receipt.
+    In compact mode the receipt is minified, non-ASCII text is written as is,
+    and items are encoded in batches of `batch_size` with the fastest encoder
+    available: orjson or ujson when installed, the standard library otherwise.
+
+    Grouped receipts list each name with its quantity and subtotal in place
+    of the units.
+    """
+
+    item_separator = ',\n'
+    batch_size = 1000
 
-        Returns:
-            The receipt content as a JSON-formatted string.
+    def __init__(self, compact: bool = False, encoder: str = 'auto', grouped: bool = False):
+        """Initialize the strategy.
+
+        Args:
+            compact: Whether to produce minified JSON instead of the indented layout.
+            encoder: The library encoding compact receipts ('orjson', 'ujson',
+                'json'), or 'auto' for the fastest one installed.
+            grouped: Whether to list one entry per item name with its quantity
+                and subtotal, instead of one entry per unit.
 
         Raises:
-            IOError: If the file cannot be written to the specified path.
+            ValueError: If the encoder is unknown or not installed.
         """
-        receipt = {
-            'items': [],
-            'total_price': data['total_price']
+        self.compact = compact
+        self.grouped = grouped
+        self.encoder = _select_encoder(encoder)
+        self._dumps, self._dumps_bytes = _compact_encoders(self.encoder)
+        # orjson serializes UUIDs natively, faster than str() does
+        self._uid_field = (lambda uid: uid) if compact and self.encoder == 'orjson' else str
+        if compact:
+            self.item_separator = ','
+
+    def render_header(self, data: Dict[str, any]) -> str:
+        """Render the opening of the JSON document up to the first item."""
+        if self.compact:
+            return '{"items":['
+        return '{\n    "items": [\n' if data['items'] else '{\n    "items": ['
+
+    def render_item(self, item: Item) -> str:
+        """Render an item as a JSON object."""
+        if self.compact:
+            return self._dumps(self._receipt_item(item))
+        return (
+            f'        {{\n'
+            f'            "uid": "{item.uid}",\n'
+            f'            "name": {json.dumps(item.name)},\n'
+            f'            "unit_price": {json.dumps(item.price)}\n'
+            f'        }}'
+        )
+
+    def render_items(self, items: Iterable[Item]) -> Iterator[str]:
+        """Render the item list, in batches in compact mode."""
+        if not self.compact:
+            yield from super().render_items(items)
+            return
+        yield from self._iter_batches(map(self._receipt_item, items), self._dumps, ',')
+
+    def render_group(self, group: GroupTotals) -> str:
+        """Render the quantity and subtotal of a name as a JSON object."""
+        if self.compact:
+            return self._dumps(self._receipt_group(group))
+        return (
+            f'        {{\n'
+            f'            "name": {json.dumps(group.name)},\n'
+            f'            "quantity": {group.quantity},\n'
+            f'            "subtotal": {json.dumps(group.subtotal)}\n'
+            f'        }}'
+        )
+
+    def render_groups(self, groups: Iterable[GroupTotals]) -> Iterator[str]:
+        """Render the group list, in batches in compact mode."""
+        if not self.compact:
+            yield from super().render_groups(groups)
+            return
+        yield from self._iter_batches(map(self._receipt_group, groups), self._dumps, ',')
+
+    def render_footer(self, data: Dict[str, any]) -> str:
+        """Render the end of the item list and the total price, then the discounts, taxes and total due if any."""
+        adjustments = receipt_adjustments(data)
+        if self.compact:
+            tail = ',' + self._dumps(adjustments)[1:-1] if adjustments else ''
+            return f'],"total_price":{self._dumps(data["total_price"])}{tail}}}'
+        # Drop the braces of the indented object, keeping its fields' indentation
+        tail = ',\n' + json.dumps(adjustments, indent=4)[2:-2] if adjustments else ''
+        closing = '\n    ]' if data['items'] else ']'
+        return f'{closing},\n    "total_price": {json.dumps(data["total_price"])}{tail}\n}}'
+
+    def iter_byte_chunks(self, data: Dict[str, any],
+                         fragment_cache: Optional[Dict[uuid.UUID, str]] = None) -> Iterator[bytes]:
+        """Render the receipt as encoded chunks, straight from the encoder in compact mode."""
+        if not self.compact or fragment_cache is not None:
+            yield from super().iter_byte_chunks(data, fragment_cache)
+            return
+        if self.grouped:
+            records = map(self._receipt_group, iter_receipt_groups(data))
+        else:
+            records = map(self._receipt_item, iter_receipt_items(data))
+        yield self.render_header(data).encode(self.encoding)
+        yield from self._iter_batches(records, self._dumps_bytes, b',')
+        yield self.render_footer(data).encode(self.encoding)
+
+    def _iter_batches(self, records: Iterator[Dict[str, any]], dumps: Callable, separator) -> Iterator:
+        """Encode receipt entries in batches, each a run of comma-separated objects without brackets."""
+        batch = list(islice(records, self.batch_size))
+        first = True
+        while batch:
+            if not first:
+                yield separator
+            yield dumps(batch)[1:-1]
+            first = False
+            batch = list(islice(records, self.batch_size))
+
+    def _receipt_item(self, item: Item) -> Dict[str, any]:
+        """Describe an item the way it appears in the receipt."""
+        return {
+            'uid': self._uid_field(item.uid),
+            'name': item.name,
+            'unit_price': item.price
         }
-        for item_name, item_group in data['items'].items():
-            for item in item_group['instances']:
-                receipt['items'].append({
-                    'uid': str(item.uid),
-                    'name': item.name,
-                    'unit_price': item.price
-                })
-        receipt_content = json.dumps(receipt, indent=4)
-
-        if file_path:
-            try:
-                with open(file_path, 'w') as file:
-                    file.write(receipt_content)
-            except IOError as e:
-                raise IOError(f"Unable to write to file: {file_path}") from e
-
-        return receipt_content
+
+    @staticmethod
+    def _receipt_group(group: GroupTotals) -> Dict[str, any]:
+        """Describe the units of a name the way they appear in a grouped receipt."""
+        return {
+            'name': group.name,
+            'quantity': group.quantity,
+            'subtotal': group.subtotal
+        }
+
+
+def _select_encoder(encoder: str) -> str:
+    """Resolve the encoder name, checking that it is installed."""
+    available = {'orjson': orjson is not None, 'ujson': ujson is not None, 'json': True}
+    if encoder == 'auto':
+        return next(name for name in ENCODERS if available[name])
+    if encoder not in available:
+        raise ValueError(f"Unknown JSON encoder '{encoder}'. Supported encoders are: {list(ENCODERS)}")
+    if not available[encoder]:
+        raise ValueError(f"JSON encoder '{encoder}' is not installed.")
+    return encoder
+
+
+def _compact_encoders(encoder: str) -> tuple:
+    """Build the minifying str and bytes encoding functions of an encoder."""
+    if encoder == 'orjson':
+        return (lambda obj: orjson.dumps(obj).decode()), orjson.dumps
+    if encoder == 'ujson':
+        def dumps(obj):
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+    else:
+        dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+    return dumps, (lambda obj: dumps(obj).encode('utf-8'))
@@ -0,0 +1,344 @@
+import csv
+import io
+import json
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from importlib import import_module
+from typing import IO, Dict, Hashable, Iterator, Optional, Tuple, Type, Union
+from shopping_cart.models.item import Item, to_cents
+from shopping_cart.models.receipts.base_receipt_strategy import is_binary_stream
+
+# A unit of a receipt as read from it: its UID, name and unit price
+ReceiptRecord = Tuple[str, str, float]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters that can continue a JSON number
+_NUMBER_CHARACTERS = frozenset('0123456789.eE+-')
+
+
+class BaseReceiptParser(ABC):
+    """Abstract base class for receipt parsers.
+
+    A parser reads back the per-unit receipts of the strategy of the same
+    format, one unit at a time, so a receipt never has to be held in memory
+    as a whole. Every unit keeps the UID printed on the receipt, and the
+    receipt's total price is checked against the sum of its units.
+
+    Grouped receipts cannot be parsed: they do not list the units.
+    """
+
+    # Newline handling used when opening receipt files, as for the strategies
+    newline: Optional[str] = None
+    encoding: str = 'utf-8'
+
+    @abstractmethod
+    def iter_records(self, stream: IO[str]) -> Iterator[ReceiptRecord]:
+        """Read the units of a receipt.
+
+        Args:
+            stream: A readable text stream positioned at the start of the receipt.
+
+        Returns:
+            A generator over the (uid, name, unit_price) of every unit, in
+            receipt order, whose return value is the receipt's total price.
+
+        Raises:
+            ValueError: If the stream is not a per-unit receipt of the format.
+        """
+        pass
+
+    def iter_items(self, stream: IO) -> Iterator[Item]:
+        """Read the units of a receipt as Item instances.
+
+        Args:
+            stream: A readable text or binary stream. Binary streams are
+                decoded with the parser's encoding.
+
+        Returns:
+            An iterator over the items, in receipt order.
+
+        Raises:
+            ValueError: If the stream is not a per-unit receipt of the format,
+                if an entry is invalid, or if the total price does not match
+                the units.
+        """
+        if is_binary_stream(stream):
+            text_stream = io.TextIOWrapper(stream, encoding=self.encoding, newline=self.newline)
+            try:
+                yield from self.iter_items(text_stream)
+            finally:
+                text_stream.detach()
+            return
+
+        records = self.iter_records(stream)
+        price_cents = 0
+        while True:
+            try:
+                uid, name, price = next(records)
+            except StopIteration as stop:
+                total_price = stop.value
+                break
+            item = _build_item(uid, name, price)
+            price_cents += item.price_cents
+            yield item
+
+        if total_price is None:
+            raise ValueError("Invalid receipt: the total price is missing.")
+        if to_cents(_to_price(total_price)) != price_cents:
+            raise ValueError(f"Invalid receipt: the total price {total_price} does not match its items.")
+
+    def open(self, file_path: str) -> IO[str]:
+        """Open a receipt file for reading.
+
+        Raises:
+            IOError: If the file cannot be read.
+        """
+        try:
+            return open(file_path, 'r', newline=self.newline, encoding=self.encoding)
+        except IOError as e:
+            raise IOError(f"Unable to read file: {file_path}") from e
+
+
+class CSVReceiptParser(BaseReceiptParser):
+    """Receipt parser for CSV format, reading the receipt row by row.
+
+    Unit prices are printed with two decimals, so units keep their price in
+    cents but not sub-cent digits. A receipt of units with sub-cent prices
+    does not add up to its total and is rejected.
+    """
+
+    newline = ''
+
+    def __init__(self, dialect: Union[str, Type[csv.Dialect]] = 'excel'):
+        """Initialize the parser.
+
+        Args:
+            dialect: The csv dialect the receipt was written with.
+        """
+        self.dialect = dialect
+
+    def iter_records(self, stream: IO[str]) -> Iterator[ReceiptRecord]:
+        """Read the unit rows of a receipt, up to the total price row."""
+        rows = csv.reader(stream, self.dialect)
+        header = next(rows, None)
+        if header == ['Name', 'Quantity', 'Subtotal']:
+            raise ValueError("Grouped receipts cannot be parsed: they do not list the units.")
+        if header != ['UID', 'Name', 'Unit Price']:
+            raise ValueError("Not a CSV receipt: unexpected header row.")
+
+        try:
+            for row in rows:
+                uid, name, price = row
+                if uid == 'Total Price':
+                    break
+                yield uid, name, float(price)
+            else:
+                return None
+        except (ValueError, csv.Error) as e:
+            raise ValueError(f"Invalid CSV receipt row {rows.line_num}: {e}") from e
+
+        # Only the discount, tax and total due rows of carts with promotions or taxes may follow
+        if any(row and row[0] not in ('Discount', 'Tax', 'Total Due') for row in rows):
+            raise ValueError("Invalid CSV receipt: rows follow the total price.")
+        return price
+
+
+class JSONReceiptParser(BaseReceiptParser):
+    """Receipt parser for JSON format, compact or indented.
+
+    The document is read in chunks of `chunk_size` characters and the item
+    list is decoded one entry at a time, so memory stays bounded by the
+    chunk size rather than by the size of the receipt.
+    """
+
+    chunk_size = 64 * 1024
+
+    def iter_records(self, stream: IO[str]) -> Iterator[ReceiptRecord]:
+        """Read the entries of the item list as they are decoded."""
+        reader = _JSONReader(stream, self.chunk_size)
+        total_price = None
+        reader.expect('{')
+        if reader.peek() == '}':
+            reader.advance()
+        else:
+            while True:
+                key = reader.decode()
+                reader.expect(':')
+                if key == 'items':
+                    reader.expect('[')
+                    if reader.peek() == ']':
+                        reader.advance()
+                    else:
+                        while True:
+                            yield record_from_entry(reader.decode())
+                            if reader.expect(',', ']') == ']':
+                                break
+                elif key == 'total_price':
+                    total_price = reader.decode()
+                else:
+                    reader.decode()
+                if reader.expect(',', '}') == '}':
+                    break
+        if reader.peek() is not None:
+            raise ValueError("Invalid JSON receipt: data follows the document.")
+        return total_price
+
+
+# Maps formats to their parser class, or to a 'module:ClassName' import path
+# for parsers whose backend is only imported on first use
+_registry: Dict[str, Union[str, Type[BaseReceiptParser]]] = {
+    'csv': CSVReceiptParser,
+    'json': JSONReceiptParser,
+    'yaml': 'shopping_cart.models.receipts.yaml_receipt_parser:YAMLReceiptParser',
+}
+# Parser instances, keyed by format and the options they were built with
+_instances: Dict[Hashable, BaseReceiptParser] = {}
+# Formats of receipt files, by extension
+_extensions = {'.csv': 'csv', '.json': 'json', '.yaml': 'yaml', '.yml': 'yaml'}
+
+
+def get_receipt_parser(format_type: str, **options) -> BaseReceiptParser:
+    """Factory function to get the parser of a receipt format.
+
+    Like strategies, parsers are stateless and shared per format and options.
+
+    Args:
+        format_type: The receipt format ('csv', 'json', 'yaml').
+        **options: Keyword arguments for the parser's constructor, e.g. the
+            dialect of CSV receipts.
+
+    Returns:
+        An instance of a ReceiptParser.
+
+    Raises:
+        ValueError: If the format cannot be parsed.
+    """
+    format_type = format_type.lower()
+    key = (format_type, tuple(sorted(options.items()))) if options else format_type
+    parser = _instances.get(key)
+    if parser is not None:
+        return parser
+
+    parser_class = _registry.get(format_type)
+    if parser_class is None:
+        raise ValueError(f"Unsupported format '{format_type}'. Receipts can be parsed from: {list(_registry)}")
+    if isinstance(parser_class, str):
+        module_name, _, class_name = parser_class.partition(':')
+        parser_class = getattr(import_module(module_name), class_name)
+    return _instances.setdefault(key, parser_class(**options))
+
+
+def format_of_file(file_path: str) -> str:
+    """Work out the format of a receipt file from its extension.
+
+    Raises:
+        ValueError: If the extension is not one of a parsable format.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    format_type = _extensions.get(extension)
+    if format_type is None:
+        raise ValueError(f"Cannot tell the receipt format of '{file_path}'; pass format_type.")
+    return format_type
+
+
+class _JSONReader:
+    """Decodes the values of a JSON document one at a time, reading it in chunks."""
+
+    def __init__(self, stream: IO[str], chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.at_end = False
+        self.decoder = json.JSONDecoder()
+
+    def read_more(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was consumed."""
+        if self.at_end:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.at_end = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> Optional[str]:
+        """Skip whitespace and get the next character, or None at the end of the document."""
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read_more():
+                return None
+
+    def advance(self) -> None:
+        """Consume the character returned by peek."""
+        self.position += 1
+
+    def expect(self, *tokens: str) -> str:
+        """Consume one of the given structural characters and return it."""
+        character = self.peek()
+        if character not in tokens:
+            found = 'the end of the document' if character is None else repr(character)
+            raise ValueError(f"Invalid JSON receipt: expected {' or '.join(map(repr, tokens))}, found {found}.")
+        self.advance()
+        return character
+
+    def decode(self) -> any:
+        """Decode the next value, reading more of the document until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as e:
+                # Only a value cut by the end of the buffer can be completed by the next chunk
+                if _is_truncation(e) and self.read_more():
+                    continue
+                raise ValueError(f"Invalid JSON receipt: {e}") from e
+            # A number cut by the end of the buffer may go on in the next chunk
+            if (end == len(self.buffer) or self.buffer[end] in _NUMBER_CHARACTERS) and self.read_more():
+                continue
+            self.position = end
+            return value
+
+
+def _is_truncation(error: json.JSONDecodeError) -> bool:
+    """Tell whether a decoding error could come from the value running past the end of the buffer."""
+    # Errors are reported at the start of an unterminated string, and at the
+    # start of a cut literal or escape sequence, which are at most 6 characters
+    return error.msg.startswith('Unterminated string') or error.pos >= len(error.doc) - 6
+
+
+def record_from_entry(entry: any) -> ReceiptRecord:
+    """Get the UID, name and unit price of an entry of the item list."""
+    if not isinstance(entry, dict):
+        raise ValueError("Invalid receipt: the item list holds something other than entries.")
+    if 'quantity' in entry:
+        raise ValueError("Grouped receipts cannot be parsed: they do not list the units.")
+    try:
+        return entry['uid'], entry['name'], entry['unit_price']
+    except KeyError as e:
+        raise ValueError(f"Invalid receipt entry: missing {e}.") from None
+
+
+def _build_item(uid: str, name: str, price: any) -> Item:
+    """Build the Item of a receipt unit, with the UID printed on the receipt."""
+    try:
+        return Item(name, _to_price(price), uuid.UUID(uid))
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid receipt entry {name!r} (UID: {uid}): {e}") from e
+
+
+def _to_price(value: any) -> float:
+    """Read a price written as a number or, by YAML, as a string."""
+    if isinstance(value, float):
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid price: {value!r}")
+    if isinstance(value, (int, str)):
+        return float(value)
+    raise ValueError(f"Invalid price: {value!r}")
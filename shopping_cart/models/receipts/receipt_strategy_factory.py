@@ -1,15 +1,67 @@
-from typing import Dict
+from importlib import import_module
+from typing import Dict, Hashable, List, Type, Union
 from .base_receipt_strategy import BaseReceiptStrategy
-from shopping_cart.models.receipts.csv_receipt_strategy import CSVReceiptStrategy
-from shopping_cart.models.receipts.text_receipt_strategy import TextReceiptStrategy
-from shopping_cart.models.receipts.json_receipt_strategy import JSONReceiptStrategy
-from shopping_cart.models.receipts.yaml_receipt_strategy import YAMLReceiptStrategy
 
-def get_receipt_strategy(format_type: str) -> BaseReceiptStrategy:
+# Third-party packages can provide formats through this entry point group, e.g.
+#     entry_points={'shopping_cart.receipt_strategies': ['xml = my_pkg.xml:XMLReceiptStrategy']}
+ENTRY_POINT_GROUP = 'shopping_cart.receipt_strategies'
+
+StrategySource = Union[str, Type[BaseReceiptStrategy]]
+
+# Maps formats to a strategy class, a 'module:ClassName' import path or an
+# entry point. Built-in formats are registered by path and imported on first use.
+_registry: Dict[str, any] = {
+    'csv': 'shopping_cart.models.receipts.csv_receipt_strategy:CSVReceiptStrategy',
+    'text': 'shopping_cart.models.receipts.text_receipt_strategy:TextReceiptStrategy',
+    'json': 'shopping_cart.models.receipts.json_receipt_strategy:JSONReceiptStrategy',
+    'yaml': 'shopping_cart.models.receipts.yaml_receipt_strategy:YAMLReceiptStrategy',
+}
+# Strategy instances, keyed by format and the options they were built with
+_instances: Dict[Hashable, BaseReceiptStrategy] = {}
+_entry_points_loaded = False
+
+
+def register_receipt_strategy(format_type: str, strategy: StrategySource, replace: bool = False) -> None:
+    """Register a receipt strategy for a format.
+
+    Args:
+        format_type: The format name the strategy is requested by.
+        strategy: A BaseReceiptStrategy subclass, or a 'module:ClassName'
+            import path that is only imported when the format is first used.
+        replace: Whether an existing registration for the format may be replaced.
+
+    Raises:
+        ValueError: If the format is already registered and replace is False.
+    """
+    format_type = format_type.lower()
+    _load_entry_points()
+    if format_type in _registry and not replace:
+        raise ValueError(f"A receipt strategy is already registered for format '{format_type}'.")
+    _registry[format_type] = strategy
+    for key in [key for key in _instances if key == format_type or (isinstance(key, tuple) and key[0] == format_type)]:
+        del _instances[key]
+
+
+def supported_formats() -> List[str]:
+    """List the formats receipts can be generated in.
+
+    Returns:
+        The registered format names.
+    """
+    _load_entry_points()
+    return list(_registry.keys())
+
+
+def get_receipt_strategy(format_type: str, **options) -> BaseReceiptStrategy:
     """Factory function to get the appropriate receipt strategy.
 
+    Strategy instances are stateless and shared: each format's strategy is
+    imported and instantiated on its first request with a given set of
+    options and reused afterwards.
+
     Args:
         format_type: The desired format ('csv', 'text', 'json', 'yaml').
+        **options: Keyword arguments for the strategy's constructor.
 
     Returns:
         An instance of a ReceiptStrategy.
@@ -17,13 +69,52 @@ def get_receipt_strategy(format_type: str) -> BaseReceiptStrategy:
     Raises:
         ValueError: If the format_type is not supported.
     """
-    strategies: Dict[str, BaseReceiptStrategy] = {
-        'csv': CSVReceiptStrategy,
-        'text': TextReceiptStrategy,
-        'json': JSONReceiptStrategy,
-        'yaml': YAMLReceiptStrategy
-    }
-    strategy = strategies.get(format_type.lower())
-    if strategy is None:
-        raise ValueError(f"Unsupported format '{format_type}'. Supported formats are: {list(strategies.keys())}")
-    return strategy()
+    format_type = format_type.lower()
+    key = (format_type, tuple(sorted(options.items()))) if options else format_type
+    strategy = _instances.get(key)
+    if strategy is not None:
+        return strategy
+
+    if format_type not in _registry:
+        _load_entry_points()
+    source = _registry.get(format_type)
+    if source is None:
+        raise ValueError(f"Unsupported format '{format_type}'. Supported formats are: {supported_formats()}")
+
+    strategy_class = _resolve(source)
+    return _instances.setdefault(key, strategy_class(**options))
+
+
+def _resolve(source: any) -> Type[BaseReceiptStrategy]:
+    """Turn a registered strategy source into a strategy class."""
+    if isinstance(source, str):
+        module_name, _, class_name = source.partition(':')
+        return getattr(import_module(module_name), class_name)
+    if isinstance(source, type):
+        return source
+    # An entry point, loaded on first use
+    return source.load()
+
+
+def _load_entry_points() -> None:
+    """Register the formats advertised by installed packages, once."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python 3.7
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return
+
+    discovered = entry_points()
+    if hasattr(discovered, 'select'):
+        group = discovered.select(group=ENTRY_POINT_GROUP)
+    else:
+        group = discovered.get(ENTRY_POINT_GROUP, [])
+    for entry_point in group:
+        _registry.setdefault(entry_point.name.lower(), entry_point)
@@ -1,43 +1,41 @@
-from typing import Dict, Optional
-from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from typing import Dict
+from shopping_cart.models.frozen_items import GroupTotals
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy, format_cents
 
 
 class TextReceiptStrategy(BaseReceiptStrategy):
     """Receipt generation strategy for plain text format."""
 
-    def generate(self, data: Dict[str, any], file_path: Optional[str] = None) -> str:
-        """Generate a receipt in plain text format.
+    def __init__(self, grouped: bool = False):
+        """Initialize the strategy.
 
         Args:
-            data: A dictionary containing 'items' and 'total_price'.
-            file_path: Optional file path to save the receipt.
-
-        Returns:
-            The receipt content as a plain text string.
-
-        Raises:
-            IOError: If the file cannot be written to the specified path.
+            grouped: Whether to print one line per item name with its quantity
+                and subtotal, instead of one entry per unit.
         """
-        lines = []
-        lines.append("Receipt:")
-        lines.append("--------")
-
-        for item_name, item_group in data['items'].items():
-            for item in item_group['instances']:
-                line = f"Name: {item.name} | Price: ${item.price:.2f}"
-                lines.append(line)
-                lines.append(f"    UID: {item.uid}")  # UID on a new line, indented for better readability
-
-        lines.append("--------")
-        lines.append(f"Total Price: ${data['total_price']:.2f}")
-
-        receipt_content = '\n'.join(lines)
-
-        if file_path:
-            try:
-                with open(file_path, 'w') as file:
-                    file.write(receipt_content)
-            except IOError as e:
-                raise IOError(f"Unable to write to file: {file_path}") from e
-
-        return receipt_content
\ No newline at end of file
+        self.grouped = grouped
+
+    def render_header(self, data: Dict[str, any]) -> str:
+        """Render the title of a plain text receipt."""
+        return "Receipt:\n--------"
+
+    def render_item(self, item: Item) -> str:
+        """Render an item as plain text, its UID on a new line, indented for better readability."""
+        return f"\nName: {item.name} | Price: ${item.price:.2f}\n    UID: {item.uid}"
+
+    def render_group(self, group: GroupTotals) -> str:
+        """Render the quantity and subtotal of a name as plain text."""
+        return (f"\nName: {group.name} | Quantity: {group.quantity}"
+                f" | Subtotal: ${format_cents(group.subtotal_cents)}")
+
+    def render_footer(self, data: Dict[str, any]) -> str:
+        """Render the total price of a plain text receipt, then the discounts, taxes and total due if any."""
+        footer = [f"\n--------\nTotal Price: ${data['total_price']:.2f}"]
+        footer.extend(f"\nDiscount: {discount.description} | -${format_cents(discount.amount_cents)}"
+                      for discount in data.get('discounts', ()))
+        footer.extend(f"\nTax: {tax.category} {tax.rate:g}% on ${format_cents(tax.taxable_cents)}"
+                      f" | ${format_cents(tax.tax_cents)}" for tax in data.get('taxes', ()))
+        if 'total_due' in data:
+            footer.append(f"\nTotal Due: ${data['total_due']:.2f}")
+        return ''.join(footer)
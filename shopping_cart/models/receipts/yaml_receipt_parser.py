@@ -0,0 +1,95 @@
+from typing import IO, Dict, Iterator, Optional
+import yaml
+from shopping_cart.models.receipts.receipt_parsers import BaseReceiptParser, ReceiptRecord, record_from_entry
+
+# The libyaml parser is much faster than the pure Python one, but PyYAML can
+# be installed without it.
+try:
+    from yaml import CSafeLoader as LibYAMLLoader
+except ImportError:
+    LibYAMLLoader = None
+
+
+class YAMLReceiptParser(BaseReceiptParser):
+    """Receipt parser for YAML format, block or flow style.
+
+    The document is read as a stream of parser events, so entries of the
+    item list are built one at a time without composing the whole document.
+    Parsing goes through libyaml when it is available.
+    """
+
+    def __init__(self, use_libyaml: bool = True):
+        """Initialize the parser.
+
+        Args:
+            use_libyaml: Whether to use the libyaml parser when it is available.
+        """
+        self.loader = LibYAMLLoader if use_libyaml and LibYAMLLoader is not None else yaml.SafeLoader
+
+    def iter_records(self, stream: IO[str]) -> Iterator[ReceiptRecord]:
+        """Read the entries of the item list from the parser events."""
+        events = yaml.parse(stream, Loader=self.loader)
+        total_price = None
+        try:
+            for event_type in (yaml.StreamStartEvent, yaml.DocumentStartEvent, yaml.MappingStartEvent):
+                _expect_event(next(events), event_type)
+            for key in iter(lambda: _next_scalar(events, yaml.MappingEndEvent), None):
+                if key == 'items':
+                    _expect_event(next(events), yaml.SequenceStartEvent)
+                    yield from map(record_from_entry, _iter_entries(events))
+                elif key == 'total_price':
+                    total_price = _next_scalar(events)
+                else:
+                    _skip_node(events)
+            _expect_event(next(events), yaml.DocumentEndEvent)
+            if not isinstance(next(events), yaml.StreamEndEvent):
+                raise ValueError("Invalid YAML receipt: it holds more than one document.")
+        except StopIteration as e:
+            raise ValueError("Invalid YAML receipt: the document is truncated.") from e
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML receipt: {e}") from e
+        return total_price
+
+
+def _iter_entries(events: Iterator[yaml.Event]) -> Iterator[Dict[str, str]]:
+    """Read the entries of a sequence of flat mappings, up to the end of the sequence."""
+    while True:
+        event = next(events)
+        if event.__class__ is yaml.SequenceEndEvent:
+            return
+        _expect_event(event, yaml.MappingStartEvent)
+        entry = {}
+        event = next(events)
+        while event.__class__ is yaml.ScalarEvent:
+            entry[event.value] = _next_scalar(events)
+            event = next(events)
+        _expect_event(event, yaml.MappingEndEvent)
+        yield entry
+
+
+def _expect_event(event: yaml.Event, *event_types: type) -> yaml.Event:
+    """Check the type of a YAML parser event."""
+    if not isinstance(event, event_types):
+        raise ValueError(f"Invalid YAML receipt: unexpected {type(event).__name__} at {event.start_mark}.")
+    return event
+
+
+def _next_scalar(events: Iterator[yaml.Event], end_type: Optional[type] = None) -> Optional[str]:
+    """Get the value of the next scalar event, or None if the next event is of end_type."""
+    event = next(events)
+    if end_type is not None and isinstance(event, end_type):
+        return None
+    return _expect_event(event, yaml.ScalarEvent).value
+
+
+def _skip_node(events: Iterator[yaml.Event]) -> None:
+    """Skip a whole node, scalar or collection."""
+    depth = 0
+    while True:
+        event = next(events)
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+        if depth == 0:
+            return
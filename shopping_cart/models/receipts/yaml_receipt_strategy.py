@@ -1,43 +1,121 @@
 import yaml
-from typing import Dict, Optional
-from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from itertools import islice
+from typing import Dict, Iterable, Iterator
+from shopping_cart.models.frozen_items import GroupTotals
+from shopping_cart.models.item import Item
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy, receipt_adjustments
+
+# The libyaml emitter is much faster than the pure Python one, but PyYAML can
+# be installed without it.
+try:
+    from yaml import CSafeDumper as LibYAMLDumper
+except ImportError:
+    LibYAMLDumper = None
+
+# Keeps compact (flow style) receipts on a single line.
+FLOW_WIDTH = 1 << 30
 
 
 class YAMLReceiptStrategy(BaseReceiptStrategy):
-    """Receipt generation strategy for YAML format."""
+    """Receipt generation strategy for YAML format.
 
-    def generate(self, data: Dict[str, any], file_path: Optional[str] = None) -> str:
-        """Generate a receipt in YAML format.
+    Items are dumped in batches of `batch_size`, which produces the same
+    document as dumping the whole receipt at once while keeping memory
+    bounded when streaming. Dumping goes through libyaml when it is available.
+    Grouped receipts list each name with its quantity and subtotal in place
+    of the units.
+    """
 
-        Args:
-            data: A dictionary containing 'items' and 'total_price'.
-            file_path: Optional file path to save the receipt.
+    batch_size = 1000
 
-        Returns:
-            The receipt content as a YAML-formatted string.
+    def __init__(self, compact: bool = False, use_libyaml: bool = True, grouped: bool = False):
+        """Initialize the strategy.
 
-        Raises:
-            IOError: If the file cannot be written to the specified path.
+        Args:
+            compact: Whether to produce a single-line, flow style document
+                instead of the block style layout.
+            use_libyaml: Whether to use the libyaml emitter when it is available.
+            grouped: Whether to list one entry per item name with its quantity
+                and subtotal, instead of one entry per unit.
         """
-        receipt = {
-            'items': [],
-            'total_price': data['total_price']
+        self.compact = compact
+        self.grouped = grouped
+        self.dumper = LibYAMLDumper if use_libyaml and LibYAMLDumper is not None else yaml.SafeDumper
+        if compact:
+            self.item_separator = ', '
+
+    def render_header(self, data: Dict[str, any]) -> str:
+        """Render the key of the item list."""
+        if self.compact:
+            return '{items: ['
+        return 'items:\n' if data['items'] else 'items: []\n'
+
+    def render_item(self, item: Item) -> str:
+        """Render an item as an entry of the item list."""
+        return self._render_entry(self._receipt_item(item))
+
+    def render_items(self, items: Iterable[Item]) -> Iterator[str]:
+        """Render the item list in batches."""
+        return self._render_batches(map(self._receipt_item, items))
+
+    def render_group(self, group: GroupTotals) -> str:
+        """Render the quantity and subtotal of a name as an entry of the item list."""
+        return self._render_entry(self._receipt_group(group))
+
+    def render_groups(self, groups: Iterable[GroupTotals]) -> Iterator[str]:
+        """Render the group list in batches."""
+        return self._render_batches(map(self._receipt_group, groups))
+
+    def render_footer(self, data: Dict[str, any]) -> str:
+        """Render the total price, then the discounts, taxes and total due if any."""
+        # One field at a time, as the dumper sorts the keys of a mapping
+        fields = [{'total_price': data['total_price']}]
+        fields += [{key: value} for key, value in receipt_adjustments(data).items()]
+        if self.compact:
+            return f"], {', '.join(self._dump(field)[1:-2] for field in fields)}}}\n"
+        return ''.join(map(self._dump, fields))
+
+    def _render_entry(self, entry: Dict[str, any]) -> str:
+        """Dump a single entry of the item list."""
+        if self.compact:
+            return self._dump(entry)[:-1]
+        return self._dump([entry])
+
+    def _render_batches(self, entries: Iterator[Dict[str, any]]) -> Iterator[str]:
+        """Dump the entries of the item list in batches."""
+        batch = list(islice(entries, self.batch_size))
+        first = True
+        while batch:
+            if not self.compact:
+                yield self._dump(batch)
+            else:
+                # Drop the brackets (and newline) around the flow style list
+                if not first:
+                    yield self.item_separator
+                yield self._dump(batch)[1:-2]
+            first = False
+            batch = list(islice(entries, self.batch_size))
+
+    def _dump(self, data: any) -> str:
+        """Dump a value in the configured style."""
+        if self.compact:
+            return yaml.dump(data, Dumper=self.dumper, default_flow_style=True, width=FLOW_WIDTH)
+        return yaml.dump(data, Dumper=self.dumper, default_flow_style=False)
+
+    @staticmethod
+    def _receipt_item(item: Item) -> Dict[str, any]:
+        """Describe an item the way it appears in the receipt."""
+        return {
+            'uid': str(item.uid),
+            'name': item.name,
+            'unit_price': item.price
+        }
+
+    @staticmethod
+    def _receipt_group(group: GroupTotals) -> Dict[str, any]:
+        """Describe the units of a name the way they appear in a grouped receipt."""
+        return {
+            'name': group.name,
+            'quantity': group.quantity,
+            'subtotal': group.subtotal
         }
-        for item_name, item_group in data['items'].items():
-            for item in item_group['instances']:
-                receipt['items'].append({
-                    'uid': str(item.uid),
-                    'name': item.name,
-                    'unit_price': item.price
-                })
-
-        receipt_content = yaml.dump(receipt, default_flow_style=False)
-
-        if file_path:
-            try:
-                with open(file_path, 'w') as file:
-                    file.write(receipt_content)
-            except IOError as e:
-                raise IOError(f"Unable to write to file: {file_path}") from e
-
-        return receipt_content
@@ -0,0 +1,263 @@
+from bisect import bisect_left, insort
+from heapq import nsmallest
+from itertools import islice, product
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import math
+import re
+
+logger = logging.getLogger(__name__)
+
+# Share of a typed word's trigrams a vocabulary word must contain to correct it
+FUZZY_THRESHOLD = 0.5
+# Corrections tried per typed word, and corrected queries tried per search
+CORRECTIONS_PER_WORD = 3
+MAX_CORRECTED_QUERIES = 6
+
+_WORD = re.compile(r'\w+')
+# Words that start inside a token, e.g. '1kg' in '(1kg)'
+_INNER_WORD = re.compile(r'(?<=\W)\w')
+# Separates a key from the ID of its name. Normalizing splits names on it,
+# and it sorts before every printable character, so 'tea' comes before 'tea bags'
+_TAG = '\x1f'
+
+
+def normalize(text: str) -> str:
+    """Normalize a name or a query: case folded, with single spaces between words."""
+    return ' '.join(text.casefold().split())
+
+
+class SearchIndex:
+    """A type-ahead index over names, for prefix and fuzzy queries.
+
+    Prefix queries match the start of any word of a name, so 'sau' finds
+    'Tomato Sauce'. Rather than a trie of nodes, the index keeps the suffix
+    of every name at each of its words, e.g. 'tomato sauce' and 'sauce', in a
+    sorted list: the names starting with a prefix are then a contiguous run
+    found by a binary search, which answers a query in O(log n + limit) with
+    a fraction of a trie's memory.
+
+    Fuzzy queries correct typos word by word, against the vocabulary of the
+    indexed names rather than the names themselves: a vocabulary word is a
+    correction if it contains enough of the typed word's trigrams. Each
+    corrected query is then answered as a prefix query. The vocabulary is
+    much smaller than the names, so corrections stay fast as names grow.
+
+    Names may be added several times, e.g. once per SKU, and stay indexed
+    until they are removed as many times.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """Initialize the index.
+
+        Args:
+            names: The names to index, in a single sort.
+        """
+        # Each name's ID, and by ID, each name and how many times it was added
+        self._ids: Dict[str, int] = {}
+        self._names: List[Optional[str]] = []
+        self._counts: List[int] = []
+        # Sorted suffixes of the normalized names, each tagged with its name's ID
+        self._keys: List[str] = []
+        # How many names each word appears in, and the words containing each trigram
+        self._words: Dict[str, int] = {}
+        self._word_postings: Dict[str, Set[str]] = {}
+
+        keys = self._keys
+        for name in names:
+            name_id = self._ids.get(name)
+            if name_id is None:
+                keys += self._new_name(name)
+            else:
+                self._counts[name_id] += 1
+        keys.sort()
+        if self._ids:
+            logger.debug(f"Built the search index of {len(self._ids)} names.")
+
+    def add(self, name: str) -> None:
+        """Add a name to the index.
+
+        Raises:
+            TypeError: If the name is not a string.
+        """
+        name_id = self._ids.get(name)
+        if name_id is not None:
+            self._counts[name_id] += 1
+            return
+        for key in self._new_name(name):
+            insort(self._keys, key)
+
+    def remove(self, name: str) -> None:
+        """Remove a name from the index, once.
+
+        Raises:
+            KeyError: If the name is not in the index.
+        """
+        name_id = self._ids.get(name)
+        if name_id is None:
+            raise KeyError(f"Item '{name}' not found in the search index.")
+        self._counts[name_id] -= 1
+        if self._counts[name_id]:
+            return
+        # IDs are not reused, so the tags of the keys stay unique
+        del self._ids[name]
+        self._names[name_id] = None
+        keys, words = _split_name(normalize(name), name_id)
+        for key in keys:
+            del self._keys[bisect_left(self._keys, key)]
+        for word in set(words):
+            self._words[word] -= 1
+            if not self._words[word]:
+                del self._words[word]
+                for gram in _word_trigrams(word):
+                    containing = self._word_postings[gram]
+                    containing.discard(word)
+                    if not containing:
+                        del self._word_postings[gram]
+
+    def search(self, query: str, limit: int = 20, fuzzy: bool = True) -> List[str]:
+        """Find the names matching what has been typed so far.
+
+        Names with a word starting with the query come first, in alphabetical
+        order of the matched text. When there are fewer than the limit, the
+        names matching the query with its typos corrected follow, the closest
+        corrections first.
+
+        Args:
+            query: The text typed so far.
+            limit: The maximum number of names to return.
+            fuzzy: Whether to complete the results with corrected queries.
+
+        Returns:
+            The matching names, without duplicates.
+        """
+        prefix = normalize(query)
+        if not prefix or limit <= 0:
+            return []
+        found = {}
+        self._complete(prefix, limit, found)
+        if fuzzy and len(found) < limit:
+            for corrected in self._corrected_queries(prefix):
+                self._complete(corrected, limit, found)
+                if len(found) >= limit:
+                    break
+        return list(found)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def _new_name(self, name: str) -> List[str]:
+        """Register a new name and add its words to the vocabulary, then return its keys."""
+        if not isinstance(name, str):
+            raise TypeError("Item name must be a string.")
+        name_id = len(self._names)
+        self._ids[name] = name_id
+        self._names.append(name)
+        self._counts.append(1)
+        keys, words = _split_name(normalize(name), name_id)
+        vocabulary, postings = self._words, self._word_postings
+        for word in set(words):
+            count = vocabulary.get(word)
+            if count is not None:
+                vocabulary[word] = count + 1
+                continue
+            vocabulary[word] = 1
+            for gram in _word_trigrams(word):
+                containing = postings.get(gram)
+                if containing is None:
+                    postings[gram] = {word}
+                else:
+                    containing.add(word)
+        return keys
+
+    def _complete(self, prefix: str, limit: int, found: Dict[str, None]) -> None:
+        """Add the names with a word starting with a prefix to the found ones, up to the limit."""
+        keys, names = self._keys, self._names
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and len(found) < limit:
+            key = keys[position]
+            if not key.startswith(prefix):
+                break
+            found[names[int(key[key.rindex(_TAG) + 1:])]] = None
+            position += 1
+
+    def _corrected_queries(self, prefix: str) -> List[str]:
+        """Correct the typos of a query, and return the corrected queries, best first."""
+        words = _WORD.findall(prefix)
+        options = []
+        for position, word in enumerate(words):
+            # The last word may still be being typed
+            corrections = self._corrections(word, as_prefix=position == len(words) - 1)
+            if not corrections:
+                return []
+            options.append(corrections)
+        combinations = sorted(product(*options), key=lambda combination: -sum(score for score, _ in combination))
+        queries = (' '.join(word for _, word in combination) for combination in combinations)
+        return [query for query in islice(queries, MAX_CORRECTED_QUERIES) if query != prefix]
+
+    def _corrections(self, word: str, as_prefix: bool) -> List[Tuple[float, str]]:
+        """Find the vocabulary words a typed word may stand for, with their scores, best first."""
+        if word in self._words or as_prefix and self._has_prefix(word):
+            return [(1.0, word)]
+        grams = list(dict.fromkeys(_word_trigrams(word, closed=not as_prefix)))
+        if len(grams) < 3:
+            return []
+        needed = math.ceil(len(grams) * FUZZY_THRESHOLD)
+        # A word sharing `needed` trigrams has at least one of the
+        # len(grams) - needed + 1 rarest ones
+        postings = sorted((self._word_postings.get(gram, ()) for gram in grams), key=len)
+        scored = []
+        for candidate in set().union(*postings[:len(grams) - needed + 1]):
+            text = f" {candidate} "
+            shared = 0
+            for gram in grams:
+                if gram in text:
+                    shared += 1
+            if shared >= needed:
+                # A typed prefix only has to be contained in the word
+                score = shared / (len(grams) if as_prefix else max(len(grams), len(candidate)))
+                scored.append((-score, abs(len(candidate) - len(word)), candidate))
+        return [(-score, candidate) for score, _, candidate in nsmallest(CORRECTIONS_PER_WORD, scored)]
+
+    def _has_prefix(self, prefix: str) -> bool:
+        """Tell whether a word of a name starts with a prefix."""
+        position = bisect_left(self._keys, prefix)
+        return position < len(self._keys) and self._keys[position].startswith(prefix)
+
+
+def _split_name(text: str, name_id: int) -> Tuple[List[str], List[str]]:
+    """Split a normalized name into its tagged keys and its words.
+
+    The keys are the suffixes of the name at each of its tokens, so that
+    e.g. '#12' is found, and at each word inside a token, such as '1kg' in
+    '(1kg)'. Most tokens are plain words, which skip the regular expressions.
+    """
+    tagged = f"{text}{_TAG}{name_id}"
+    keys, words = [tagged], []
+    start = 0
+    for token in text.split(' '):
+        if token.isalnum():
+            words.append(token)
+        else:
+            keys.extend(tagged[start + match.start():] for match in _INNER_WORD.finditer(token))
+            words += _WORD.findall(token)
+        start += len(token) + 1
+        keys.append(tagged[start:])
+    # The last suffix starts after the end of the name, at the tag
+    keys.pop()
+    return keys, words
+
+
+def _word_trigrams(word: str, closed: bool = True) -> List[str]:
+    """Split a word, padded with spaces, into its overlapping three-character slices.
+
+    Args:
+        word: The word.
+        closed: Whether the word is complete, rather than a prefix, and is
+            padded at the end too.
+    """
+    text = f" {word} " if closed else f" {word}"
+    return [text[i:i + 3] for i in range(len(text) - 2)]
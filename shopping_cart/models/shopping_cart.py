@@ -1,113 +1,459 @@
-from typing import Dict, List, Optional
+from collections import Counter
+from typing import IO, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import logging
-from shopping_cart.models.item import Item
-from shopping_cart.models.receipts.receipt_strategy_factory import get_receipt_strategy
+import uuid
+import weakref
+from shopping_cart.models.cart_receipts import CartReceiptsMixin
+from shopping_cart.models.cart_snapshot import (
+    decode_lines, decode_units, read_snapshot_header, read_snapshot_source, unpack_units
+)
+from shopping_cart.models.frozen_items import (
+    FrozenInstances, FrozenItems, GroupTotals, iter_group_totals, iter_group_units, iter_instances
+)
+from shopping_cart.models.item import Item, find_counted_unit, item_from_template, to_cents
+from shopping_cart.models.promotions import DiscountLine, PromotionEngine
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from shopping_cart.models.taxes import TaxLedger, TaxLine, TaxTable
 
 logger = logging.getLogger(__name__)
 
 
-class ShoppingCart:
+class ShoppingCart(CartReceiptsMixin):
     """A shopping cart that manages items and supports receipt generation."""
 
-    def __init__(self):
-        """Initialize an empty shopping cart."""
+    def __init__(self, cache_receipt_lines: bool = False, promotions: Optional[Iterable] = None,
+                 tax_table: Optional[TaxTable] = None):
+        """Initialize an empty shopping cart.
+
+        Args:
+            cache_receipt_lines: Whether to keep the rendered receipt fragment
+                of every item, per format, so that regenerating a receipt after
+                a mutation only renders the items that were added.
+            promotions: ItemPromotion and CartPromotion instances to apply
+                (see set_promotions).
+            tax_table: The tax rates and categories to apply (see set_tax_table).
+        """
         self._items: Dict[str, Dict[str, any]] = {}
-        self._total_price: float = 0.0
+        # Maps each UID to the position of its instance in its group's list
+        self._uid_index: Dict[uuid.UUID, int] = {}
+        # Money is kept in integer cents so that totals never drift
+        self._total_price_cents: int = 0
         self._total_quantity: int = 0
-
-    def add_item(self, item: Item) -> None:
+        # Units restored from a snapshot that are not Item instances yet
+        self._packed_quantity: int = 0
+        # Bumped by every mutation; rendered receipts are only reused at the same version
+        self._version: int = 0
+        self._receipt_cache: Dict[BaseReceiptStrategy, Tuple[int, str]] = {}
+        self._fragment_cache: Optional[Dict[BaseReceiptStrategy, Dict[uuid.UUID, str]]] = (
+            {} if cache_receipt_lines else None
+        )
+        # Frozen views handed out by list_items that are still alive. While one
+        # of them may show _items or a group, it is copied before being modified
+        self._views: 'weakref.WeakValueDictionary[int, FrozenItems]' = weakref.WeakValueDictionary()
+        self._items_shared: bool = False
+        # Names whose group no live view shows, so that they can be modified in place
+        self._owned_groups: set = set()
+        self._promotions: Optional[PromotionEngine] = None
+        self._taxes: Optional[TaxLedger] = None
+        if promotions is not None:
+            self.set_promotions(promotions)
+        if tax_table is not None:
+            self.set_tax_table(tax_table)
+
+    def add_item(self, item: Item, quantity: Optional[int] = None) -> None:
         """Add an item to the cart.
 
+        Without a quantity the item is stored as a unique instance. With a
+        quantity, that many units of the item's name and price are stored as
+        a single line with a count; per-unit instances for them are only
+        created while they are read (see iter_items and generate_receipt),
+        and are not kept by the cart. Their UIDs are derived from the line
+        and the unit's position in it, so they are the same on every read,
+        and get_item and remove_item accept them.
+
         Args:
             item: The Item instance to add.
             quantity: The quantity of the item to add.
 
         Raises:
-            TypeError: If the item is not an Item instance.
+            TypeError: If the item is not an Item instance or the quantity is not an integer.
+            ValueError: If an item with the same UID is already in the cart,
+                or if the quantity is not positive.
         """
         if not isinstance(item, Item):
             raise TypeError("Only Item instances can be added to the cart.")
+        if quantity is not None:
+            self._add_quantity(item, self._validate_quantity(quantity))
+            return
+        if self._packed_quantity:
+            self._unpack_units()
+        if item.uid in self._uid_index or self._is_counted_unit(item):
+            raise ValueError(f"Item with UID '{item.uid}' is already in the cart.")
 
         item_name = item.name
-
-        if item_name not in self._items:
-            self._items[item_name] = {
-                'instances': [],
-                'total_quantity': 0,
-                'total_price': 0.0
-            }
-
-        item_group = self._items[item_name]
+        item_group = self._writable_group(item_name)
+        self._uid_index[item.uid] = len(item_group['instances'])
         item_group['instances'].append(item)
         item_group['total_quantity'] += 1
-        item_group['total_price'] += item.price
+        item_group['total_price_cents'] += item.price_cents
 
-        self._total_price += item.price
+        self._total_price_cents += item.price_cents
         self._total_quantity += 1
+        self._version += 1
+        if self._promotions is not None or self._taxes is not None:
+            self._units_changed(item_name, {item.price_cents: 1})
 
         logger.debug(f"Added '{item_name}' (UID: {item.uid}) to cart.")
 
-    def remove_item(self, item: Item) -> None:
+    def _add_quantity(self, item: Item, quantity: int) -> None:
+        """Add quantity units of the item's name and price as a counted line."""
+        item_name = item.name
+        item_group = self._writable_group(item_name)
+        lines = item_group['lines']
+        lines[item.price] = lines.get(item.price, 0) + quantity
+        item_group['total_quantity'] += quantity
+        item_group['total_price_cents'] += item.price_cents * quantity
+
+        self._total_price_cents += item.price_cents * quantity
+        self._total_quantity += quantity
+        self._version += 1
+        if self._promotions is not None or self._taxes is not None:
+            self._units_changed(item_name, {item.price_cents: quantity})
+
+        logger.debug(f"Added {quantity} x '{item_name}' to cart.")
+
+    @staticmethod
+    def _validate_quantity(quantity: int) -> int:
+        """Check that a quantity is a positive integer."""
+        if not isinstance(quantity, int) or isinstance(quantity, bool):
+            raise TypeError("Quantity must be an integer.")
+        if quantity < 1:
+            raise ValueError("Quantity must be a positive integer.")
+        return quantity
+
+    def add_items(self, items: Iterable[Item]) -> None:
+        """Add several items to the cart in a single operation.
+
+        The whole batch is validated and grouped by name before the cart is
+        modified, so either every item is added or none of them are.
+
+        Args:
+            items: An iterable of Item instances to add.
+
+        Raises:
+            TypeError: If any item is not an Item instance.
+            ValueError: If any UID is already in the cart or repeated in the batch.
+        """
+        batch = list(items)
+        grouped_items: Dict[str, List[Item]] = {}
+        batch_uids = set()
+        if self._packed_quantity:
+            self._unpack_units()
+
+        for item in batch:
+            if not isinstance(item, Item):
+                raise TypeError("Only Item instances can be added to the cart.")
+            if item.uid in self._uid_index or item.uid in batch_uids or self._is_counted_unit(item):
+                raise ValueError(f"Item with UID '{item.uid}' is already in the cart.")
+            batch_uids.add(item.uid)
+            grouped_items.setdefault(item.name, []).append(item)
+
+        batch_price_cents = 0
+        for item_name, group_items in grouped_items.items():
+            item_group = self._writable_group(item_name)
+            item_instances = item_group['instances']
+            first_position = len(item_instances)
+            item_instances.extend(group_items)
+            self._uid_index.update(
+                zip([item.uid for item in group_items], range(first_position, len(item_instances)))
+            )
+
+            group_price_cents = sum(item.price_cents for item in group_items)
+            item_group['total_quantity'] += len(group_items)
+            item_group['total_price_cents'] += group_price_cents
+            batch_price_cents += group_price_cents
+
+        self._total_price_cents += batch_price_cents
+        self._total_quantity += len(batch)
+        self._version += 1
+        if self._promotions is not None or self._taxes is not None:
+            self._batch_changed(grouped_items, 1)
+
+        logger.debug(f"Added {len(batch)} items under {len(grouped_items)} names to cart.")
+
+    def remove_item(self, item: Item, quantity: Optional[int] = None) -> None:
         """Remove a specific item instance from the cart.
 
+        The instance is located through the UID index and its slot is filled
+        with the last instance of the group, so removal runs in constant time
+        but does not preserve the insertion order of the remaining instances.
+
+        With a quantity, that many units are taken off the counted line
+        matching the item's name and price instead. A unit of a counted line,
+        as listed by the cart, takes one unit off its line: the line's last
+        unit goes, and the UIDs of the others stay as they were.
+
         Args:
             item: The Item instance to remove.
+            quantity: The quantity of the item to remove.
 
         Raises:
-            KeyError: If the item is not found in the cart.
+            KeyError: If the item is not found in the cart, or if its line
+                holds fewer units than the requested quantity.
         """
         if not isinstance(item, Item):
             raise TypeError("Only Item instances can be added to the cart.")
-
+        if quantity is not None:
+            self._remove_quantity(item, self._validate_quantity(quantity))
+            return
+        if item.uid not in self._uid_index and self._is_counted_unit(item):
+            self._remove_quantity(item, 1)
+            return
+
+        _, position = self._locate_item(item)
+        item_group = self._writable_group(item.name)
+        self._pop_instance(item_group['instances'], position)
+
+        self._update_totals_after_removal(item_group, item)
+        if item.name in self._items:
+            logger.debug(f"Removed '{item.name}' (UID: {item.uid}) from cart.")
+
+    def _remove_quantity(self, item: Item, quantity: int) -> None:
+        """Remove quantity units from the counted line of the item's name and price."""
         item_name = item.name
         if item_name not in self._items:
             raise KeyError(f"Item '{item_name}' not in the cart.")
 
-        item_instances = self._items[item_name].get('instances', [])
-        potential_item_instance = [x for x in item_instances if x.uid == item.uid]
+        lines = self._items[item_name]['lines']
+        line_quantity = lines.get(item.price, 0)
+        if line_quantity < quantity:
+            raise KeyError(
+                f"Only {line_quantity} x '{item_name}' at {item.price:.2f} in the cart, "
+                f"cannot remove {quantity}."
+            )
+
+        item_group = self._writable_group(item_name)
+        lines = item_group['lines']
+        if line_quantity == quantity:
+            del lines[item.price]
+        else:
+            lines[item.price] = line_quantity - quantity
 
-        if not potential_item_instance:
-            raise KeyError(f"Item '{item_name}' with UID '{item.uid}' not in the cart.")
+        self._update_totals_after_removal(item_group, item, quantity)
+        if item_name in self._items:
+            logger.debug(f"Removed {quantity} x '{item_name}' from cart.")
 
-        # Remove the specific item instance
-        item_instances.remove(potential_item_instance[0])
+    def remove_items(self, items: Iterable[Item]) -> None:
+        """Remove several item instances from the cart in a single operation.
 
-        # Update total quantity and total price for the item name
-        self._items[item_name]['total_quantity'] -= 1
-        self._items[item_name]['total_price'] -= item.price
+        The whole batch is validated before the cart is modified, so either
+        every item is removed or none of them are.
 
-        # Update the cart's total price and total quantity
-        self._total_price -= item.price
-        self._total_quantity -= 1
+        Args:
+            items: An iterable of Item instances to remove.
 
-        # If there are no more instances of this item, remove the item name from the cart
-        if self._items[item_name]['total_quantity'] == 0:
-            del self._items[item_name]
-            logger.debug(f"All instances of '{item_name}' removed from cart.")
-        else:
-            logger.debug(f"Removed '{item_name}' (UID: {item.uid}) from cart.")
+        Raises:
+            TypeError: If any item is not an Item instance.
+            KeyError: If any item is not found in the cart or repeated in the batch.
+        """
+        batch = list(items)
+        grouped_items: Dict[str, List[Item]] = {}
+        batch_uids = set()
+
+        for item in batch:
+            if not isinstance(item, Item):
+                raise TypeError("Only Item instances can be removed from the cart.")
+            self._locate_item(item)
+            if item.uid in batch_uids:
+                raise KeyError(f"Item '{item.name}' with UID '{item.uid}' is repeated in the batch.")
+            batch_uids.add(item.uid)
+            grouped_items.setdefault(item.name, []).append(item)
+
+        batch_price_cents = 0
+        for item_name, group_items in grouped_items.items():
+            item_group = self._writable_group(item_name)
+            item_instances = item_group['instances']
+            for item in group_items:
+                self._pop_instance(item_instances, self._uid_index[item.uid])
+
+            group_price_cents = sum(item.price_cents for item in group_items)
+            item_group['total_quantity'] -= len(group_items)
+            item_group['total_price_cents'] -= group_price_cents
+            batch_price_cents += group_price_cents
+
+            if item_group['total_quantity'] == 0:
+                del self._items[item_name]
+                self._owned_groups.discard(item_name)
+
+        self._total_price_cents -= batch_price_cents
+        self._total_quantity -= len(batch)
+        self._version += 1
+        if self._promotions is not None or self._taxes is not None:
+            self._batch_changed(grouped_items, -1)
+
+        logger.debug(f"Removed {len(batch)} items under {len(grouped_items)} names from cart.")
+
+    def _units_changed(self, item_name: str, price_deltas: Dict[int, int]) -> None:
+        """Update the discounts and taxes after units of a name were added or removed.
 
+        Args:
+            item_name: The name whose units changed.
+            price_deltas: The number of units added, or removed if negative,
+                at each unit price in cents.
+        """
+        if self._promotions is not None:
+            self._promotions.units_changed(item_name, price_deltas, self._total_price_cents)
+        if self._taxes is not None:
+            self._taxes.units_changed(
+                item_name, sum(price_cents * count for price_cents, count in price_deltas.items())
+            )
+
+    def _batch_changed(self, grouped_items: Dict[str, List[Item]], sign: int) -> None:
+        """Update the discounts and taxes after a batch added (sign 1) or removed (sign -1) units."""
+        promotions, taxes = self._promotions, self._taxes
+        for item_name, group_items in grouped_items.items():
+            if taxes is not None:
+                taxes.units_changed(item_name, sign * sum(item.price_cents for item in group_items))
+            if promotions is not None and promotions.covers(item_name):
+                price_deltas = Counter(item.price_cents for item in group_items)
+                if sign < 0:
+                    price_deltas = {price_cents: -count for price_cents, count in price_deltas.items()}
+                promotions.units_changed(item_name, price_deltas, self._total_price_cents)
+        if promotions is not None:
+            promotions.total_changed(self._total_price_cents)
+
+    @staticmethod
+    def _new_item_group() -> Dict[str, any]:
+        """Create the bookkeeping entry for a new item name."""
+        return {
+            'instances': [],
+            'lines': {},
+            'packed': None,
+            'total_quantity': 0,
+            'total_price_cents': 0
+        }
+
+    def _writable_group(self, item_name: str) -> Dict[str, any]:
+        """Get the group of a name in order to modify it, creating it if needed.
+
+        A group that a live frozen view may still show is replaced by a copy
+        of itself first, with its own instance list and lines.
+        """
+        if self._items_shared:
+            if any(view._items is self._items for view in self._views.values()):
+                self._items = self._items.copy()
+            self._items_shared = False
+
+        item_group = self._items.get(item_name)
+        if item_group is None:
+            item_group = self._items[item_name] = self._new_item_group()
+            self._owned_groups.add(item_name)
+        elif item_name not in self._owned_groups:
+            if any(view.shows(item_name, item_group) for view in self._views.values()):
+                item_group = self._items[item_name] = {
+                    **item_group, 'instances': item_group['instances'].copy(), 'lines': item_group['lines'].copy()
+                }
+            self._owned_groups.add(item_name)
+        return item_group
+
+    def _locate_item(self, item: Item) -> Tuple[Dict[str, any], int]:
+        """Find the group and position of an item instance through the UID index.
 
-    def _update_totals_after_removal(self, item_group: Dict[str, any], removed_item: Item) -> None:
-        """Update cart totals after removing an item."""
-        item_group['total_quantity'] -= 1
-        item_group['total_price'] -= removed_item.price
-        self._total_price -= removed_item.price
-        self._total_quantity -= 1
+        Raises:
+            KeyError: If the item is not found in the cart.
+        """
+        item_name = item.name
+        if item_name not in self._items:
+            raise KeyError(f"Item '{item_name}' not in the cart.")
+
+        item_group = self._items[item_name]
+        if item_group['packed'] is not None:
+            self._unpack_units(item_name)
+        item_instances = item_group['instances']
+        position = self._uid_index.get(item.uid)
+
+        if (position is None or position >= len(item_instances)
+                or item_instances[position].uid != item.uid):
+            raise KeyError(f"Item '{item_name}' with UID '{item.uid}' not in the cart.")
+
+        return item_group, position
+
+    def _is_counted_unit(self, item: Item) -> bool:
+        """Tell whether an item is a unit of one of the cart's counted lines, as listed by the cart."""
+        item_group = self._items.get(item.name)
+        return item_group is not None and find_counted_unit(item.name, item_group['lines'], item.uid) == item.price
+
+    def _pop_instance(self, item_instances: List[Item], position: int) -> None:
+        """Remove the instance at position by moving the last instance into its slot."""
+        removed_uid = item_instances[position].uid
+        last_item = item_instances.pop()
+        if last_item.uid != removed_uid:
+            item_instances[position] = last_item
+            self._uid_index[last_item.uid] = position
+        del self._uid_index[removed_uid]
+        if self._fragment_cache:
+            for fragments in self._fragment_cache.values():
+                fragments.pop(removed_uid, None)
+
+    def _update_totals_after_removal(self, item_group: Dict[str, any], removed_item: Item,
+                                     quantity: int = 1) -> None:
+        """Update cart totals after removing quantity units of an item."""
+        item_group['total_quantity'] -= quantity
+        item_group['total_price_cents'] -= removed_item.price_cents * quantity
+        self._total_price_cents -= removed_item.price_cents * quantity
+        self._total_quantity -= quantity
+        self._version += 1
+        if self._promotions is not None or self._taxes is not None:
+            self._units_changed(removed_item.name, {removed_item.price_cents: -quantity})
 
         # Remove the item name entry if no instances remain
         if item_group['total_quantity'] == 0:
             del self._items[removed_item.name]
+            self._owned_groups.discard(removed_item.name)
             logger.debug(f"All instances of '{removed_item.name}' removed from cart.")
 
+    def _unpack_units(self, item_name: Optional[str] = None) -> None:
+        """Turn units restored from a snapshot into Item instances and index their UIDs.
+
+        Args:
+            item_name: The name whose units to unpack; all names if omitted.
+        """
+        item_names = list(self._items) if item_name is None else [item_name]
+        for name in item_names:
+            packed_units = self._items[name]['packed']
+            if packed_units is None:
+                continue
+
+            item_group = self._writable_group(name)
+            item_instances = item_group['instances']
+            first_position = len(item_instances)
+            item_instances.extend(unpack_units(name, packed_units))
+            self._uid_index.update(
+                zip([item.uid for item in item_instances[first_position:]], range(first_position, len(item_instances)))
+            )
+            item_group['packed'] = None
+            self._packed_quantity -= len(item_instances) - first_position
+            logger.debug(f"Unpacked {len(item_instances) - first_position} x '{name}' from snapshot.")
+
     def clear_cart(self) -> None:
         """Remove all items from the cart."""
-        self._items.clear()
-        self._total_price = 0.0
+        self._items = {}
+        self._items_shared = False
+        self._owned_groups = set()
+        self._uid_index.clear()
+        if self._fragment_cache:
+            self._fragment_cache.clear()
+        self._version += 1
+        self._total_price_cents = 0
         self._total_quantity = 0
+        self._packed_quantity = 0
+        if self._promotions is not None:
+            self._promotions.reset()
+        if self._taxes is not None:
+            self._taxes.reset()
         logger.debug("Cleared all items from the cart.")
 
-    def get_item(self, item_name: str, item_uid: str) -> Optional[Item]:
+    def get_item(self, item_name: str, item_uid: Union[str, uuid.UUID]) -> Optional[Item]:
         """Retrieve an item from the cart by its name and UID.
 
         Args:
@@ -115,7 +461,8 @@ class ShoppingCart:
             item_uid: The UID of the item to retrieve.
 
         Returns:
-            The Item instance if found; otherwise, None.
+            The Item instance if found; otherwise, None. Units of counted
+            lines are found by the UID derived for them.
 
         Raises:
             KeyError: If the item is not found in the cart.
@@ -123,35 +470,109 @@ class ShoppingCart:
         if item_name not in self._items:
             raise KeyError(f"Item '{item_name}' not found in the cart.")
 
-        for item in self._items[item_name]['instances']:
-            if str(item.uid) == item_uid:
-                return item
+        try:
+            uid = item_uid if isinstance(item_uid, uuid.UUID) else uuid.UUID(item_uid)
+        except (TypeError, ValueError):
+            uid = None
+
+        if self._items[item_name]['packed'] is not None:
+            self._unpack_units(item_name)
+        position = self._uid_index.get(uid)
+        if position is not None:
+            item_instances = self._items[item_name]['instances']
+            if position < len(item_instances) and item_instances[position].uid == uid:
+                return item_instances[position]
+        elif uid is not None:
+            price = find_counted_unit(item_name, self._items[item_name]['lines'], uid)
+            if price is not None:
+                return item_from_template(item_name, price, to_cents(price), uid)
 
         raise KeyError(f"Item with UID '{item_uid}' not found under name '{item_name}'.")
 
-    def list_items(self) -> Dict[str, Dict[str, any]]:
+    def list_items(self) -> Mapping[str, Mapping[str, any]]:
         """List all items in the cart with their details.
 
+        The listing is a read-only view frozen at the time of the call, taken
+        in constant time: the cart copies what it modifies afterwards rather
+        than what it lists (copy on write). It can be kept, or handed to
+        another thread, while the cart keeps changing.
+
         Returns:
-            A dictionary mapping item names to their item groups.
+            A read-only mapping of item names to their item groups.
         """
-        return self._items.copy()
+        view = FrozenItems(self._items)
+        self._views[id(view)] = view
+        self._items_shared = True
+        self._owned_groups = set()
+        return view
 
-    def list_items_by_name(self, item_name: str) -> List[Item]:
+    def list_items_by_name(self, item_name: str) -> Sequence[Item]:
         """List all item instances in the cart that have the specified name.
 
+        Like list_items, the listing is a read-only view taken in constant
+        time. Units added with a quantity or restored from a snapshot are
+        listed as Item instances built for the listing, which the cart does
+        not keep (see iter_group_units).
+
         Args:
             item_name: The name of the items to list.
 
         Returns:
-            A list of Item instances.
+            A read-only sequence of Item instances.
 
         Raises:
             KeyError: If the item name is not found in the cart.
         """
         if item_name not in self._items:
             raise KeyError(f"Item '{item_name}' not found in the cart.")
-        return self._items[item_name]['instances'].copy()
+        item_group = self.list_items()[item_name]
+        instances = item_group['instances']
+        if not item_group['lines'] and item_group['packed'] is None:
+            return instances
+        return FrozenInstances([*instances, *iter_group_units(item_name, item_group)])
+
+    def iter_items(self) -> Iterator[Item]:
+        """Iterate over every item instance in the cart, name by name.
+
+        Nothing is copied: the iterator goes through a frozen view of the
+        cart taken by the call, so the cart can change during iteration.
+        Units added with a quantity or restored from a snapshot are yielded
+        as short-lived Item instances that the cart does not keep.
+
+        Returns:
+            An iterator over the Item instances.
+        """
+        return iter_instances(self.list_items())
+
+    def iter_groups(self) -> Iterator[GroupTotals]:
+        """Iterate over the quantity and subtotal of every item name in the cart.
+
+        Units added with a quantity are not turned into instances, so the
+        cost depends on the number of names rather than the number of units.
+
+        Returns:
+            An iterator over (name, quantity, subtotal_cents) GroupTotals
+            tuples, in the order the names were added.
+        """
+        return iter_group_totals(self.list_items())
+
+    def iter_items_by_name(self, item_name: str) -> Iterator[Item]:
+        """Iterate over the item instances in the cart that have the specified name.
+
+        Like iter_items, nothing is copied and the cart is left unchanged.
+
+        Args:
+            item_name: The name of the items to iterate over.
+
+        Returns:
+            An iterator over the Item instances.
+
+        Raises:
+            KeyError: If the item name is not found in the cart.
+        """
+        if item_name not in self._items:
+            raise KeyError(f"Item '{item_name}' not found in the cart.")
+        return iter_instances({item_name: self.list_items()[item_name]})
 
     def get_total_quantity_by_name(self, item_name: str) -> int:
         """Get the total quantity of items with the specified name.
@@ -174,9 +595,148 @@ class ShoppingCart:
         """Get the total price of all items in the cart.
 
         Returns:
-            The total price as a float rounded to two decimals.
+            The total price as a float with two decimals.
+        """
+        return self._total_price_cents / 100
+
+    @property
+    def total_price_cents(self) -> int:
+        """Get the exact total price of all items in the cart.
+
+        Returns:
+            The total price in cents as an integer.
+        """
+        return self._total_price_cents
+
+    def set_promotions(self, promotions: Iterable) -> None:
+        """Apply a set of promotions to the cart, replacing the current one.
+
+        Item promotions are indexed by name: adding or removing units only
+        re-evaluates the promotions of their name, and the cart promotions,
+        so the discounted total is kept up to date as the cart changes and
+        reading it costs O(1). Promotions of the same name add up, capped at
+        the name's subtotal; the best cart promotion applies, to the total
+        after item discounts.
+
+        Args:
+            promotions: ItemPromotion and CartPromotion instances; an empty
+                iterable removes every promotion.
+
+        Raises:
+            TypeError: If a promotion is of neither kind.
+        """
+        engine = PromotionEngine(promotions)
+        for item_name in list(self._items):
+            if not engine.covers(item_name):
+                continue
+            if self._items[item_name]['packed'] is not None:
+                self._unpack_units(item_name)
+            item_group = self._items[item_name]
+            price_counts = Counter(item.price_cents for item in item_group['instances'])
+            for price, quantity in item_group['lines'].items():
+                price_counts[to_cents(price)] += quantity
+            engine.units_changed(item_name, price_counts, self._total_price_cents)
+        engine.total_changed(self._total_price_cents)
+
+        self._promotions = engine if engine.promotions else None
+        self._version += 1
+        logger.debug(f"Applied {len(engine.promotions)} promotions to the cart.")
+
+    @property
+    def promotions(self) -> List:
+        """Get the promotions applied to the cart."""
+        return [] if self._promotions is None else list(self._promotions.promotions)
+
+    def discount_lines(self) -> List[DiscountLine]:
+        """List the discounts the cart's promotions currently grant.
+
+        Returns:
+            (description, item_name, amount_cents) DiscountLine tuples, item
+            discounts first; item_name is None for cart-wide discounts.
         """
-        return round(self._total_price, 2)
+        if self._promotions is None:
+            return []
+        return self._promotions.discount_lines()
+
+    @property
+    def discount_cents(self) -> int:
+        """Get the total discount granted by the cart's promotions, in cents."""
+        return 0 if self._promotions is None else self._promotions.discount_cents
+
+    def set_tax_table(self, tax_table: Optional[TaxTable]) -> None:
+        """Apply tax rates to the cart, replacing the current ones.
+
+        The cart keeps the subtotal of every tax category up to date as units
+        are added and removed, and computes a category's tax again only when
+        its subtotal changes, so tax_cents costs O(1) to read and receipts
+        print the tax lines without going over the units. Taxes apply to
+        prices before discounts.
+
+        Args:
+            tax_table: The rates and categories, or None to remove taxes.
+        """
+        self._version += 1
+        if tax_table is None:
+            self._taxes = None
+            logger.debug("Removed taxes from the cart.")
+            return
+
+        self._taxes = TaxLedger(tax_table)
+        for item_name, item_group in self._items.items():
+            self._taxes.units_changed(item_name, item_group['total_price_cents'])
+        logger.debug(f"Applied {len(tax_table.rates)} tax rates to the cart.")
+
+    @property
+    def tax_table(self) -> Optional[TaxTable]:
+        """Get the tax rates applied to the cart, if any."""
+        return None if self._taxes is None else self._taxes.table
+
+    def tax_lines(self) -> List[TaxLine]:
+        """List the tax of every category the cart has units in.
+
+        Returns:
+            (category, rate, taxable_cents, tax_cents) TaxLine tuples, in the
+            order of the table's rates.
+        """
+        if self._taxes is None:
+            return []
+        return self._taxes.tax_lines()
+
+    @property
+    def tax_cents(self) -> int:
+        """Get the total tax of the cart, in cents."""
+        return 0 if self._taxes is None else self._taxes.tax_cents
+
+    @property
+    def total_due_cents(self) -> int:
+        """Get the total price of the cart after discounts and taxes, in cents."""
+        return self._total_price_cents - self.discount_cents + self.tax_cents
+
+    @property
+    def total_due(self) -> float:
+        """Get the total price of the cart after discounts and taxes.
+
+        Returns:
+            The total due as a float with two decimals.
+        """
+        return self.total_due_cents / 100
+
+    def receipt_adjustments(self) -> Dict[str, any]:
+        """Collect the discounts and taxes printed after the total, with the total due.
+
+        Returns:
+            A dictionary merged into the data handed to receipt strategies:
+            'discounts' is only there when the cart has promotions, 'taxes'
+            when it has a tax table, and 'total_due' when it has either.
+        """
+        data = {}
+        if self._promotions is not None:
+            data['discounts'] = self._promotions.discount_lines()
+        if self._taxes is not None:
+            data['taxes'] = self._taxes.tax_lines()
+        if data:
+            data['total_due'] = self.total_due
+        return data
 
     @property
     def total_quantity(self) -> int:
@@ -187,20 +747,66 @@ class ShoppingCart:
         """
         return self._total_quantity
 
-    def generate_receipt(self, format_type: str = 'text', file_path: Optional[str] = None) -> str:
-        """Generate a receipt using the specified format.
+    @classmethod
+    def load_snapshot(cls, source: Union[str, bytes, IO[bytes]], **kwargs) -> 'ShoppingCart':
+        """Restore a cart saved with save_snapshot.
+
+        Units keep their UIDs. They are held in their packed form and only
+        turned into Item instances when first needed, e.g. to list them, to
+        generate a per-unit receipt or to check a new item's UID, so loading
+        and totals do not pay a per-unit cost.
 
         Args:
-            format_type: The format type ('csv', 'text', 'json', 'yaml').
-            file_path: Optional file path to save the receipt.
+            source: A file path, the snapshot's bytes, or a readable binary stream.
+            **kwargs: Arguments for the cart's constructor.
 
         Returns:
-            The receipt content as a string.
+            The restored ShoppingCart.
 
         Raises:
-            IOError: If the file cannot be written to the specified path.
+            IOError: If the file cannot be read.
+            ValueError: If the data is not a valid snapshot of a supported version.
         """
-        strategy = get_receipt_strategy(format_type)
-        receipt_content = strategy.generate({'items': self._items, 'total_price': self.total_price}, file_path)
-        logger.debug(f"Receipt generated in {format_type} format.")
-        return receipt_content
\ No newline at end of file
+        buffer = read_snapshot_source(source)
+        total_quantity, total_price_cents, groups = read_snapshot_header(buffer)
+        cart = cls(**kwargs)
+        for group in groups:
+            item_group = cart._new_item_group()
+            if group.unit_count:
+                item_group['packed'] = decode_units(buffer, group)
+            item_group['lines'] = decode_lines(buffer, group)
+            item_group['total_quantity'] = group.total_quantity
+            item_group['total_price_cents'] = group.total_price_cents
+            cart._items[group.name] = item_group
+            cart._packed_quantity += group.unit_count
+
+        cart._total_quantity = total_quantity
+        cart._total_price_cents = total_price_cents
+        if cart._promotions is not None:
+            cart.set_promotions(cart._promotions.promotions)
+        if cart._taxes is not None:
+            cart.set_tax_table(cart._taxes.table)
+        logger.debug(f"Loaded snapshot of {total_quantity} items under {len(groups)} names.")
+        return cart
+
+    def _fragments_for(self, strategy: BaseReceiptStrategy) -> Optional[Dict[uuid.UUID, str]]:
+        """Get the item fragment cache of a strategy, if fragments are cached."""
+        if self._fragment_cache is None or strategy.grouped:
+            return None
+        return self._fragment_cache.setdefault(strategy, {})
+
+    def _receipt_version(self) -> int:
+        """Get the cart's version, bumped by every mutation."""
+        return self._version
+
+    def _receipt_data(self, grouped: bool = False) -> Dict[str, any]:
+        """Collect the data handed to receipt strategies."""
+        return {'items': self._items, 'total_price': self.total_price, **self.receipt_adjustments()}
+
+    def _receipt_snapshot(self, grouped: bool = False) -> Dict[str, any]:
+        """Freeze the data handed to receipt strategies, to render it while the cart changes."""
+        return {'items': self.list_items(), 'total_price': self.total_price, **self.receipt_adjustments()}
+
+    def _snapshot_contents(self) -> Tuple[Dict[str, Dict[str, any]], int, int]:
+        """Get the item groups, total quantity and total price in cents written to snapshots."""
+        return self._items, self._total_quantity, self._total_price_cents
\ No newline at end of file
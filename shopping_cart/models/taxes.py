@@ -0,0 +1,108 @@
+from decimal import Decimal
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class TaxLine(NamedTuple):
+    """The tax of a category, as printed on receipts."""
+
+    category: str
+    # The rate as a percentage, e.g. 8.875
+    rate: float
+    taxable_cents: int
+    tax_cents: int
+
+    @property
+    def tax(self) -> float:
+        """The tax as a float with two decimals."""
+        return self.tax_cents / 100
+
+
+class TaxTable:
+    """Tax rates per category, and the category of every item name.
+
+    Names that are not listed take the default category. A category's tax is
+    computed once on the subtotal of all its units, rounded half up to the
+    cent, rather than unit by unit.
+    """
+
+    def __init__(self, rates: Mapping[str, float], categories: Optional[Mapping[str, str]] = None,
+                 default_category: str = 'standard'):
+        """Initialize the table.
+
+        Args:
+            rates: The rate of each category, as a percentage.
+            categories: The category of item names that do not take the default one.
+            default_category: The category of every other name.
+
+        Raises:
+            ValueError: If a rate is negative or not a number, or if a
+                category has no rate.
+        """
+        self.rates = dict(rates)
+        self.categories = dict(categories or {})
+        self.default_category = default_category
+        # Each rate as an exact fraction, so that taxes are computed on integers
+        self._fractions: Dict[str, Tuple[int, int]] = {}
+        for category, rate in self.rates.items():
+            if not isinstance(rate, (int, float)) or isinstance(rate, bool) or not 0 <= rate < float('inf'):
+                raise ValueError(f"The rate of '{category}' must be a non-negative percentage.")
+            numerator, denominator = Decimal(repr(rate)).as_integer_ratio()
+            self._fractions[category] = (numerator, denominator * 100)
+        for category in {default_category, *self.categories.values()}:
+            if category not in self.rates:
+                raise ValueError(f"Tax category '{category}' has no rate.")
+
+    def category_of(self, item_name: str) -> str:
+        """Get the tax category of an item name."""
+        return self.categories.get(item_name, self.default_category)
+
+    def tax_cents(self, category: str, taxable_cents: int) -> int:
+        """Compute the tax of a category on a subtotal, rounded half up to the cent."""
+        numerator, denominator = self._fractions[category]
+        return (2 * taxable_cents * numerator + denominator) // (2 * denominator)
+
+
+class TaxLedger:
+    """Keeps the subtotal and tax of every category up to date as units come and go.
+
+    Adding or removing units of a name only updates the subtotal of its
+    category and computes that category's tax again, so the cart's tax is a
+    running total that costs O(1) to read.
+    """
+
+    def __init__(self, table: TaxTable):
+        self.table = table
+        self._taxable_cents: Dict[str, int] = dict.fromkeys(table.rates, 0)
+        self._tax_cents: Dict[str, int] = dict.fromkeys(table.rates, 0)
+        # The category of each name seen so far, to skip the table lookups
+        self._name_categories: Dict[str, str] = {}
+        self.tax_cents = 0
+
+    def units_changed(self, item_name: str, price_cents: int) -> None:
+        """Update the category of a name after units were added or removed.
+
+        Args:
+            item_name: The name whose units changed.
+            price_cents: The price of the units added, or minus the price of
+                the units removed, in cents.
+        """
+        category = self._name_categories.get(item_name)
+        if category is None:
+            category = self._name_categories[item_name] = self.table.category_of(item_name)
+        taxable_cents = self._taxable_cents[category] = self._taxable_cents[category] + price_cents
+        tax_cents = self.table.tax_cents(category, taxable_cents)
+        self.tax_cents += tax_cents - self._tax_cents[category]
+        self._tax_cents[category] = tax_cents
+
+    def reset(self) -> None:
+        """Forget every unit, as when the cart is cleared."""
+        self._taxable_cents = dict.fromkeys(self.table.rates, 0)
+        self._tax_cents = dict.fromkeys(self.table.rates, 0)
+        self.tax_cents = 0
+
+    def tax_lines(self) -> List[TaxLine]:
+        """List the categories that have units, in the order of the table's rates."""
+        return [
+            TaxLine(category, self.table.rates[category], taxable_cents, self._tax_cents[category])
+            for category, taxable_cents in self._taxable_cents.items() if taxable_cents
+        ]
@@ -0,0 +1,65 @@
+import asyncio
+import io
+import unittest
+from shopping_cart.models.columnar_cart import ColumnarShoppingCart
+from shopping_cart.models.concurrent_cart import ConcurrentShoppingCart
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class TestCartReceipts(unittest.TestCase):
+    """Unit tests for the receipts and snapshots shared by every cart type."""
+
+    def setUp(self):
+        """Set up the same contents in a cart of every type."""
+        items = [Item(name=f"Item {i % 3}", price=0.25 * (i % 4 + 1)) for i in range(12)]
+        self.carts = [ShoppingCart(), ColumnarShoppingCart(), ConcurrentShoppingCart(stripes=2)]
+        for cart in self.carts:
+            cart.add_items(items)
+            cart.add_item(Item(name='Banana', price=0.50), quantity=3)
+
+    def test_receipts_match(self):
+        """Test that every cart type renders the same receipts, cached until it changes."""
+        for format_type in ('text', 'csv', 'json', 'yaml'):
+            for options in ({}, {'grouped': True}):
+                with self.subTest(format_type=format_type, **options):
+                    receipts = [cart.generate_receipt(format_type, **options) for cart in self.carts]
+                    self.assertEqual(receipts[1:], receipts[:1] * 2)
+                    for cart, receipt_content in zip(self.carts, receipts):
+                        self.assertIs(cart.generate_receipt(format_type, **options), receipt_content)
+                        self.assertEqual(asyncio.run(cart.agenerate_receipt(format_type, **options)),
+                                         receipt_content)
+                        stream = io.StringIO()
+                        cart.write_receipt(stream, format_type, **options)
+                        self.assertEqual(stream.getvalue(), receipt_content)
+
+        for cart in self.carts:
+            receipt_content = cart.generate_receipt('json')
+            cart.add_item(Item(name='Cherry', price=0.10))
+            self.assertNotEqual(cart.generate_receipt('json'), receipt_content)
+
+    def test_snapshots_match(self):
+        """Test that every cart type saves the same snapshot, loadable by the others."""
+        snapshots = []
+        for cart in self.carts:
+            stream = io.BytesIO()
+            cart.save_snapshot(stream)
+            snapshots.append(stream.getvalue())
+        self.assertEqual(snapshots[1:], snapshots[:1] * 2)
+        for cart_type in (ShoppingCart, ColumnarShoppingCart):
+            self.assertEqual(cart_type.load_snapshot(snapshots[2]).generate_receipt('json'),
+                             self.carts[0].generate_receipt('json'))
+
+    def test_load_receipt(self):
+        """Test that every cart type rebuilds itself from a per-unit receipt."""
+        receipt_content = self.carts[0].generate_receipt('csv')
+        for cart in self.carts:
+            with self.subTest(cart_type=type(cart).__name__):
+                loaded = type(cart).load_receipt(io.StringIO(receipt_content), 'csv')
+                self.assertIsInstance(loaded, type(cart))
+                self.assertEqual(loaded.generate_receipt('csv'), receipt_content)
+                self.assertEqual(loaded.total_quantity, cart.total_quantity)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from shopping_cart.models.cart_view import CartView
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class TestCartView(unittest.TestCase):
+    """Unit tests for read-only cart views over snapshot files."""
+
+    def setUp(self):
+        """Save a cart to a snapshot file and open a view over it."""
+        self.cart = ShoppingCart()
+        self.cart.add_items(Item(name='Apple', price=1.00) for _ in range(3))
+        self.cart.add_items(Item(name='Orange', price=i / 4) for i in range(10))
+        self.cart.add_item(Item(name='Banana', price=0.50), quantity=4)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, 'cart.snapshot')
+        self.cart.save_snapshot(self.file_path)
+        self.view = CartView(self.file_path)
+        self.addCleanup(self.view.close)
+
+    def test_totals_only_read_the_header(self):
+        """Test that the totals are available without reading the group table."""
+        self.assertEqual(self.view.total_quantity, 17)
+        self.assertEqual(self.view.total_price_cents, self.cart.total_price_cents)
+        self.assertEqual(self.view.total_price, self.cart.total_price)
+        self.assertIsNone(self.view._groups)
+
+    def test_quantities_by_name(self):
+        """Test reading quantities by name without decoding units."""
+        self.assertEqual(self.view.get_total_quantity_by_name('Banana'), 4)
+        self.assertEqual(self.view.list_item_names(), ['Apple', 'Orange', 'Banana'])
+        self.assertEqual(self.view._instances, {})
+        with self.assertRaises(KeyError):
+            self.view.get_total_quantity_by_name('Cherry')
+
+    def test_list_items_by_name(self):
+        """Test that listed items keep their UIDs, and that counted units keep the ones they get."""
+        self.assertEqual(self.view.list_items_by_name('Orange'), self.cart.list_items_by_name('Orange'))
+        bananas = self.view.list_items_by_name('Banana')
+        self.assertEqual(len(bananas), 4)
+        self.assertEqual(self.view.list_items_by_name('Banana'), bananas)
+        with self.assertRaises(KeyError):
+            self.view.list_items_by_name('Cherry')
+
+    def test_generate_receipt(self):
+        """Test that receipts match the ones of the saved cart."""
+        self.assertEqual(self.view.generate_receipt('csv', grouped=True),
+                         self.cart.generate_receipt('csv', grouped=True))
+        self.assertEqual(self.view._instances, {})
+
+        for format_type in ('json', 'text', 'yaml'):
+            self.assertEqual(self.view.generate_receipt(format_type),
+                             self.cart.generate_receipt(format_type))
+
+    def test_invalid_files(self):
+        """Test that files other than snapshots are rejected."""
+        self.view.close()
+        for content in (b'', b'{"items": []}'):
+            with open(self.file_path, 'wb') as file:
+                file.write(content)
+            with self.assertRaises(ValueError):
+                CartView(self.file_path)
+        with self.assertRaises(IOError):
+            CartView(os.path.join(os.path.dirname(self.file_path), 'missing.snapshot'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from shopping_cart.models import catalog as catalog_module
+from shopping_cart.models.catalog import Catalog, ItemTemplate
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class TestCatalog(unittest.TestCase):
+    """Unit tests for the product catalog."""
+
+    def setUp(self):
+        """Set up a catalog with a few products."""
+        self.catalog = Catalog([
+            ('A-1', 'Apple', 1.00),
+            ('B-1', 'Banana', 0.50),
+            ('A-2', 'Apple', 1.25),
+            ('M-1', 'Milk', 2.50),
+        ])
+
+    def test_lookups(self):
+        """Test looking products up by SKU and by name."""
+        self.assertEqual(self.catalog.get('B-1'), ItemTemplate('B-1', 'Banana', 0.50, 50))
+        self.assertEqual([template.sku for template in self.catalog.find_by_name('Apple')], ['A-1', 'A-2'])
+        self.assertEqual(len(self.catalog), 4)
+        self.assertIn('M-1', self.catalog)
+        self.assertEqual([template.sku for template in self.catalog], ['A-1', 'B-1', 'A-2', 'M-1'])
+        with self.assertRaises(KeyError):
+            self.catalog.get('Z-1')
+        with self.assertRaises(KeyError):
+            self.catalog.find_by_name('Cherry')
+
+    def test_price_range(self):
+        """Test range queries on the price index, bounds included, as products come and go."""
+        self.assertEqual([template.sku for template in self.catalog.in_price_range(0.50, 1.25)],
+                         ['B-1', 'A-1', 'A-2'])
+        self.catalog.add('Bread', 1.10, sku='R-1')
+        self.catalog.remove('A-1')
+        self.assertEqual([template.sku for template in self.catalog.in_price_range(1.00, 3.00)],
+                         ['R-1', 'A-2', 'M-1'])
+        self.assertEqual(self.catalog.in_price_range(3.00, 10.00), [])
+        self.catalog.add_many([('C-1', 'Cheese', 4.00)])
+        self.assertEqual([template.sku for template in self.catalog.in_price_range(2.00, 10.00)], ['M-1', 'C-1'])
+
+    def test_add_and_remove(self):
+        """Test that single additions and removals keep the name index up to date."""
+        self.catalog.find_by_name('Apple')
+        template = self.catalog.add('Apple', 0.90)
+        self.assertEqual(template.sku, '1')
+        self.assertEqual(self.catalog.add('Pear', 0.90).sku, '2')
+        self.assertEqual(len(self.catalog.find_by_name('Apple')), 3)
+        self.catalog.remove('A-1')
+        self.catalog.remove('1')
+        self.assertEqual(self.catalog.find_by_name('Apple'), [self.catalog.get('A-2')])
+        self.catalog.remove('A-2')
+        with self.assertRaises(KeyError):
+            self.catalog.find_by_name('Apple')
+        with self.assertRaises(KeyError):
+            self.catalog.remove('A-2')
+
+    def test_search(self):
+        """Test type-ahead searches, as products come and go."""
+        self.assertEqual([template.sku for template in self.catalog.search('ap')], ['A-1', 'A-2'])
+        self.assertEqual([template.sku for template in self.catalog.search('ap', limit=1)], ['A-1'])
+        self.assertEqual([template.sku for template in self.catalog.search('bananna')], ['B-1'])
+        self.catalog.add('Apricot Jam', 3.00, sku='J-1')
+        self.catalog.remove('A-1')
+        self.assertEqual([template.sku for template in self.catalog.search('ap')], ['A-2', 'J-1'])
+        self.catalog.remove('A-2')
+        self.assertEqual([template.sku for template in self.catalog.search('jam')], ['J-1'])
+        self.assertEqual(self.catalog.search('apple'), [])
+        self.catalog.add_many([('A-3', 'Apple', 1.10)])
+        self.assertEqual([template.sku for template in self.catalog.search('ap')], ['A-3', 'J-1'])
+
+    def test_items_share_the_template_name(self):
+        """Test that items built from a template share its interned name and are ordinary items."""
+        name = ''.join(['Ban', 'ana'])
+        catalog = Catalog([('B-2', name, 0.50)])
+        first, second = catalog.new_item('B-2'), catalog.get('B-2').new_item()
+        self.assertIs(first.name, second.name)
+        self.assertIs(first.name, self.catalog.get('B-1').name)
+        self.assertNotEqual(first.uid, second.uid)
+        self.assertEqual((first.price, first.price_cents), (0.50, 50))
+        self.assertEqual(first, Item('Banana', 0.50, first.uid))
+
+        cart = ShoppingCart()
+        cart.add_items([first, second])
+        self.assertEqual(cart.total_price_cents, 100)
+
+    def test_invalid_products(self):
+        """Test that invalid products are rejected, and failed batches leave the catalog unchanged."""
+        with self.assertRaises(ValueError):
+            self.catalog.add('Apple', 1.00, sku='A-1')
+        with self.assertRaises(TypeError):
+            self.catalog.add('Apple', 1)
+        with self.assertRaises(ValueError):
+            self.catalog.add('', 1.00)
+        with self.assertRaises(ValueError):
+            self.catalog.add('Apple', float('inf'))
+        for batch in ([('C-1', 'Cheese', 4.00), ('C-1', 'Cream', 2.00)],
+                      [('C-1', 'Cheese', 4.00), ('B-1', 'Bun', 1.00)],
+                      [('C-1', 'Cheese', 4.00), ('C-2', 'Cream', -2.00)]):
+            with self.assertRaises(ValueError):
+                self.catalog.add_many(batch)
+        self.assertEqual(len(self.catalog), 4)
+        self.assertNotIn('C-1', self.catalog)
+
+
+class TestCatalogLoading(unittest.TestCase):
+    """Unit tests for bulk loading catalogs from files."""
+
+    def setUp(self):
+        """Set up the same products as CSV and JSON."""
+        self.csv_content = 'SKU,Name,Price\r\nA-1,Apple,1.00\r\nB-1,"Banana, ripe",0.50\r\n'
+        self.products = [{'sku': 'A-1', 'name': 'Apple', 'price': 1.00},
+                         {'sku': 'B-1', 'name': 'Banana, ripe', 'price': 0.5}]
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def assert_loaded(self, catalog):
+        """Check a catalog loaded from the test products."""
+        self.assertEqual(list(catalog), [ItemTemplate('A-1', 'Apple', 1.00, 100),
+                                         ItemTemplate('B-1', 'Banana, ripe', 0.50, 50)])
+
+    def test_from_csv(self):
+        """Test loading a CSV catalog from a stream and from a file."""
+        self.assert_loaded(Catalog.from_csv(io.StringIO(self.csv_content)))
+        file_path = os.path.join(self.directory.name, 'catalog.csv')
+        with open(file_path, 'w', newline='', encoding='utf-8') as file:
+            file.write(self.csv_content)
+        self.assert_loaded(Catalog.from_csv(file_path))
+
+    def test_from_json(self):
+        """Test loading a JSON catalog with and without orjson."""
+        content = json.dumps(self.products)
+        for orjson in (catalog_module.orjson, None):
+            with mock.patch.object(catalog_module, 'orjson', orjson):
+                self.assert_loaded(Catalog.from_json(io.StringIO(content)))
+                self.assert_loaded(Catalog.from_json(io.BytesIO(content.encode('utf-8'))))
+
+    def test_invalid_files(self):
+        """Test that invalid files are rejected with the position of the problem."""
+        with self.assertRaisesRegex(ValueError, 'header'):
+            Catalog.from_csv(io.StringIO('UID,Name,Unit Price\r\n'))
+        with self.assertRaisesRegex(ValueError, 'row 4'):
+            Catalog.from_csv(io.StringIO(self.csv_content + 'C-1,Cheese,cheap\r\nD-1,Dates,1.00\r\n'))
+        with self.assertRaises(ValueError):
+            Catalog.from_json(io.StringIO('{"sku": "A-1"}'))
+        with self.assertRaises(ValueError):
+            Catalog.from_json(io.StringIO('[{"sku": "A-1", "price": 1.0}]'))
+        with self.assertRaises(IOError):
+            Catalog.from_csv(os.path.join(self.directory.name, 'missing.csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
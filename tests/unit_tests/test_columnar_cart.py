@@ -0,0 +1,246 @@
+import asyncio
+import io
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+from shopping_cart.models import columnar_cart
+from shopping_cart.models.columnar_cart import ColumnarShoppingCart
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class TestColumnarShoppingCart(unittest.TestCase):
+    """Unit tests for the column-oriented cart."""
+
+    def setUp(self):
+        """Set up an empty cart and a few items."""
+        self.cart = ColumnarShoppingCart()
+        self.apple = Item(name='Apple', price=1.00)
+        self.banana = Item(name='Banana', price=0.50)
+        self.other_apple = Item(name='Apple', price=1.25)
+
+    def fill(self, cart, items):
+        """Apply the same sequence of operations to a cart."""
+        cart.add_items(items[:150])
+        for item in items[150:]:
+            cart.add_item(item)
+        cart.add_item(Item(name='Cherry', price=0.10), quantity=4)
+        cart.remove_items(items[10:60])
+        cart.remove_item(items[200])
+        cart.remove_item(Item(name='Cherry', price=0.10), quantity=1)
+
+    def test_matches_shopping_cart(self):
+        """Test that the cart behaves like ShoppingCart."""
+        rng = random.Random(7)
+        items = [Item(name=f"Item {rng.randrange(6)}", price=rng.choice([0.5, 1.25, 2.0, 0.333]))
+                 for _ in range(300)]
+        cart = ShoppingCart()
+        self.fill(cart, items)
+        self.fill(self.cart, items)
+
+        self.assertEqual(list(self.cart.iter_groups()), list(cart.iter_groups()))
+        self.assertEqual(self.cart.total_price_cents, cart.total_price_cents)
+        self.assertEqual(self.cart.total_quantity, cart.total_quantity)
+        self.assertEqual(self.cart.get_total_quantity_by_name('Cherry'), 3)
+        for format_type in ('csv', 'json', 'text', 'yaml'):
+            self.assertEqual(self.cart.generate_receipt(format_type, grouped=True),
+                             cart.generate_receipt(format_type, grouped=True))
+        for item_name in self.cart.list_items():
+            if item_name != 'Cherry':
+                self.assertCountEqual(self.cart.list_items_by_name(item_name), cart.list_items_by_name(item_name))
+        self.assertEqual(self.cart.get_item(items[0].name, str(items[0].uid)), items[0])
+        self.assertEqual(len(self.cart.generate_receipt('csv').splitlines()), self.cart.total_quantity + 2)
+
+    def test_listing_layout(self):
+        """Test that listings have the layout of ShoppingCart's."""
+        self.cart.add_items([self.apple, self.banana, self.other_apple])
+        self.cart.add_item(Item(name='Banana', price=0.50), quantity=2)
+        items = self.cart.list_items()
+        self.assertEqual(list(items), ['Apple', 'Banana'])
+        self.assertEqual(items['Apple']['instances'], [self.apple, self.other_apple])
+        self.assertEqual(items['Banana']['lines'], {0.50: 2})
+        self.assertEqual(items['Banana']['total_quantity'], 3)
+        self.assertEqual(items['Apple']['total_price_cents'], 225)
+        self.assertEqual(items['Apple']['total_price'], 2.25)
+        self.assertEqual(len(self.cart.list_items_by_name('Banana')), 3)
+
+    def test_listings_are_read_only(self):
+        """Test that listings are frozen views, unaffected by later changes."""
+        self.cart.add_items([self.apple, self.banana])
+        items = self.cart.list_items()
+        with self.assertRaises(TypeError):
+            items['Cherry'] = {}
+        with self.assertRaises(TypeError):
+            items['Apple']['lines'][1.00] = 2
+        self.cart.remove_item(self.apple)
+        self.assertEqual(items['Apple']['instances'], [self.apple])
+        self.assertNotIn('Apple', self.cart.list_items())
+
+    def test_counted_lines_get_no_rows(self):
+        """Test that reading counted lines as units does not give them rows."""
+        self.cart.add_item(self.apple)
+        self.cart.add_item(self.other_apple, quantity=3)
+        self.assertEqual(len(self.cart.list_items_by_name('Apple')), 4)
+        self.assertEqual(len(list(self.cart.iter_items())), 4)
+        self.assertEqual(len(self.cart.generate_receipt('csv').splitlines()), 6)
+        self.assertEqual(len(self.cart._prices), 1)
+        # Counted units are listed with the same UIDs as ShoppingCart's, and found by them
+        cart = ShoppingCart()
+        cart.add_item(self.apple)
+        cart.add_item(self.other_apple, quantity=3)
+        apples = self.cart.list_items_by_name('Apple')
+        self.assertEqual(apples, cart.list_items_by_name('Apple'))
+        self.assertEqual(self.cart.get_item('Apple', apples[2].uid), apples[2])
+        self.cart.remove_item(apples[2])
+        self.cart.remove_item(self.other_apple, quantity=2)
+        self.assertEqual(list(self.cart.iter_items()), [self.apple])
+
+    def test_names_listed_in_order_added(self):
+        """Test that an emptied name goes to the end of the listing when added again."""
+        self.cart.add_items([self.apple, self.banana])
+        self.cart.remove_item(self.apple)
+        self.cart.add_item(self.other_apple)
+        self.assertEqual(list(self.cart.list_items()), ['Banana', 'Apple'])
+        self.assertEqual([group.name for group in self.cart.iter_groups()], ['Banana', 'Apple'])
+
+    def test_invalid_operations(self):
+        """Test that invalid operations are rejected and leave the cart unchanged."""
+        self.cart.add_items([self.apple, self.banana])
+        with self.assertRaises(ValueError):
+            self.cart.add_items([self.other_apple, self.apple])
+        with self.assertRaises(TypeError):
+            self.cart.add_item('not an item')
+        with self.assertRaises(KeyError):
+            self.cart.remove_items([self.banana, self.other_apple])
+        with self.assertRaises(KeyError):
+            self.cart.remove_items([self.banana, self.banana])
+        with self.assertRaises(KeyError):
+            self.cart.remove_item(Item(name='Apple', price=1.00, uid=self.banana.uid))
+        with self.assertRaises(KeyError):
+            self.cart.remove_item(self.banana, quantity=1)
+        with self.assertRaises(KeyError):
+            self.cart.get_item('Banana', self.apple.uid)
+        with self.assertRaises(KeyError):
+            self.cart.get_item('Banana', 'not a uid')
+        with self.assertRaises(KeyError):
+            self.cart.list_items_by_name('Cherry')
+        self.assertEqual(self.cart.total_quantity, 2)
+        self.assertEqual(list(self.cart.iter_items()), [self.apple, self.banana])
+
+    def test_iter_items_survives_changes(self):
+        """Test that iter_items goes over the cart as it was when called."""
+        self.cart.add_items([self.apple, self.banana, self.other_apple])
+        seen = []
+        for item in self.cart.iter_items():
+            seen.append(item)
+            self.cart.remove_item(item)
+        self.assertEqual(seen, [self.apple, self.other_apple, self.banana])
+        self.assertEqual(self.cart.total_quantity, 0)
+        self.assertEqual(self.cart.list_items(), {})
+
+    def test_snapshot_round_trip(self):
+        """Test that snapshots are exchanged with ShoppingCart, keeping UIDs and counted lines."""
+        self.cart.add_items([self.apple, self.banana, self.other_apple])
+        self.cart.add_item(Item(name='Banana', price=0.50), quantity=2)
+        stream = io.BytesIO()
+        self.cart.save_snapshot(stream)
+        for cart_type in (ColumnarShoppingCart, ShoppingCart):
+            restored = cart_type.load_snapshot(stream.getvalue())
+            self.assertEqual(list(restored.iter_groups()), list(self.cart.iter_groups()))
+            self.assertEqual(restored.list_items_by_name('Apple'), [self.apple, self.other_apple])
+            self.assertEqual(restored.list_items()['Banana']['lines'], {0.50: 2})
+            self.assertEqual(restored.total_price_cents, 375)
+
+        cart = ShoppingCart()
+        cart.add_items([self.apple, self.banana])
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'cart.snapshot')
+            cart.save_snapshot(file_path)
+            restored = ColumnarShoppingCart.load_snapshot(file_path)
+        self.assertEqual(list(restored.iter_items()), [self.apple, self.banana])
+        with self.assertRaises(ValueError):
+            restored.add_item(self.apple)
+
+    def test_load_receipt(self):
+        """Test rebuilding a cart from a per-unit receipt."""
+        self.cart.add_items([self.apple, self.banana, self.other_apple])
+        receipt = self.cart.generate_receipt('json')
+        restored = ColumnarShoppingCart.load_receipt(io.StringIO(receipt), 'json')
+        self.assertEqual(list(restored.iter_items()), list(self.cart.iter_items()))
+        self.assertEqual(restored.generate_receipt('json'), receipt)
+
+    def test_agenerate_receipt(self):
+        """Test that async receipts match the generated ones."""
+        self.cart.add_items([self.apple, self.banana])
+        self.cart.add_item(self.other_apple, quantity=2)
+        receipt_content = asyncio.run(self.cart.agenerate_receipt('csv'))
+        self.assertEqual(len(receipt_content.splitlines()), self.cart.total_quantity + 2)
+        self.assertEqual(asyncio.run(self.cart.agenerate_receipt('text', grouped=True)),
+                         self.cart.generate_receipt('text', grouped=True))
+
+    def test_clear_cart(self):
+        """Test that clearing the cart resets its totals."""
+        self.cart.add_items([self.apple, self.banana])
+        self.cart.add_item(self.banana, quantity=3)
+        self.cart.clear_cart()
+        self.assertEqual(self.cart.total_price_cents, 0)
+        self.assertEqual(list(self.cart.iter_groups()), [])
+        self.cart.add_item(self.apple)
+        self.assertEqual(list(self.cart.iter_groups()), [('Apple', 1, 100)])
+
+    def test_price_histogram(self):
+        """Test counting units per price range, counted lines included."""
+        self.cart.add_items(Item(name='Item', price=price) for price in (0.25, 0.99, 1.00, 2.50, 3.00, 7.00))
+        self.cart.add_item(Item(name='Bulk', price=2.00), quantity=5)
+        self.assertEqual(self.cart.price_histogram([0.0, 1.0, 3.0]), [2, 8])
+        self.assertEqual(self.cart.price_histogram([1.0, 2.0]), [6])
+        for bin_edges in ([1.0], [2.0, 1.0]):
+            with self.assertRaises(ValueError):
+                self.cart.price_histogram(bin_edges)
+
+    def test_top_names(self):
+        """Test ranking names by quantity and by subtotal."""
+        self.cart.add_item(Item(name='Cheap', price=0.10), quantity=10)
+        self.cart.add_item(Item(name='Dear', price=9.99), quantity=2)
+        self.cart.add_item(Item(name='Middle', price=1.00), quantity=5)
+        self.assertEqual([group.name for group in self.cart.top_names(2)], ['Cheap', 'Middle'])
+        self.assertEqual(self.cart.top_names(1, by='subtotal_cents'), [('Dear', 2, 1998)])
+        with self.assertRaises(ValueError):
+            self.cart.top_names(1, by='price')
+
+    def test_aggregations_without_numpy(self):
+        """Test that aggregations give the same results with or without NumPy."""
+        items = [Item(name=f"Item {i % 3}", price=0.25 * (i % 7)) for i in range(50)]
+        results = []
+        for numpy_module in (columnar_cart.numpy, None):
+            with mock.patch.object(columnar_cart, 'numpy', numpy_module):
+                cart = ColumnarShoppingCart()
+                cart.add_items(items)
+                results.append((list(cart.iter_groups()), cart.price_histogram([0.0, 0.5, 1.0, 1.5]),
+                                cart.list_items_by_name('Item 1')))
+        self.assertEqual(results[0], results[1])
+
+
+    @unittest.skipUnless(columnar_cart.numpy, "NumPy is not installed")
+    def test_numpy_aggregations_match_pure_python(self):
+        """Test that the NumPy and pure Python paths give the same results on the same carts."""
+        rng = random.Random(3)
+        items = [Item(name=f"Item {rng.randrange(5)}", price=rng.choice([0.25, 0.99, 1.0, 2.5, 3.0]))
+                 for _ in range(500)]
+        results = []
+        for numpy_module in (columnar_cart.numpy, None):
+            with mock.patch.object(columnar_cart, 'numpy', numpy_module):
+                cart = ColumnarShoppingCart()
+                cart.add_items(items[:400])
+                cart.add_items(items[400:])
+                cart.add_item(Item(name='Bulk', price=1.0), quantity=7)
+                cart.remove_items(items[100:150])
+                results.append((list(cart.iter_groups()), cart.price_histogram([0.0, 0.5, 1.0, 3.0]),
+                                cart.list_items_by_name('Item 2'),
+                                columnar_cart._sum_by_code(cart._name_codes, cart._price_cents)))
+        self.assertEqual(results[0], results[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import random
+import sys
+import threading
+import unittest
+from shopping_cart.models.concurrent_cart import ConcurrentShoppingCart
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class TestConcurrentShoppingCart(unittest.TestCase):
+    """Unit tests for the thread-safe cart."""
+
+    def setUp(self):
+        """Set up a cart with few stripes, so that names share them."""
+        self.cart = ConcurrentShoppingCart(stripes=4)
+
+    def assert_consistent(self, data):
+        """Check that a snapshot's groups add up to its total."""
+        total_price_cents = 0
+        for item_group in data['items'].values():
+            self.assertEqual(item_group['total_quantity'],
+                             len(item_group['instances']) + sum(item_group['lines'].values()))
+            self.assertEqual(item_group['total_price_cents'],
+                             sum(item.price_cents for item in item_group['instances'])
+                             + sum(round(price * 100) * quantity for price, quantity in item_group['lines'].items()))
+            total_price_cents += item_group['total_price_cents']
+        self.assertEqual(round(data['total_price'] * 100), total_price_cents)
+
+    def test_matches_shopping_cart(self):
+        """Test that the cart behaves like ShoppingCart, names listed in the order they were added."""
+        cart = ShoppingCart()
+        items = [Item(name=f"Item {i % 7}", price=0.25 * (i % 5)) for i in range(40)]
+        for target in (cart, self.cart):
+            target.add_items(items[:20])
+            for item in items[20:]:
+                target.add_item(item)
+            target.add_item(Item(name='Banana', price=0.50), quantity=3)
+            target.remove_items(items[5:10])
+            target.remove_item(items[30])
+            target.remove_item(Item(name='Banana', price=0.50), quantity=1)
+
+        self.assertEqual(list(self.cart.list_items()), list(cart.list_items()))
+        self.assertEqual(self.cart.total_price_cents, cart.total_price_cents)
+        self.assertEqual(self.cart.total_quantity, cart.total_quantity)
+        self.assertEqual(self.cart.get_total_quantity_by_name('Banana'), 2)
+        self.assertEqual(self.cart.get_item('Item 0', items[0].uid), items[0])
+        for format_type in ('csv', 'json', 'text', 'yaml'):
+            self.assertEqual(self.cart.generate_receipt(format_type, grouped=True),
+                             cart.generate_receipt(format_type, grouped=True))
+        self.assertEqual(self.cart.list_items_by_name('Item 3'), cart.list_items_by_name('Item 3'))
+        self.assertEqual(list(self.cart.iter_items_by_name('Item 3')), list(cart.iter_items_by_name('Item 3')))
+        self.assertEqual(list(self.cart.iter_groups()), list(cart.iter_groups()))
+        self.assertEqual(len(self.cart.list_items_by_name('Banana')), 2)
+        self.assertEqual(self.cart.generate_receipt('json'), cart.generate_receipt('json'))
+        self.assertEqual(len(list(self.cart.iter_items())), cart.total_quantity)
+
+    def test_batches_are_all_or_nothing(self):
+        """Test that a failing batch leaves every stripe unchanged."""
+        items = [Item(name=f"Item {i}", price=1.00) for i in range(10)]
+        self.cart.add_items(items[:5])
+        receipt = self.cart.generate_receipt('json')
+
+        with self.assertRaises(ValueError):
+            self.cart.add_items(items[5:] + [items[0]])
+        with self.assertRaises(KeyError):
+            self.cart.remove_items(items[:4] + [items[9]])
+        with self.assertRaises(TypeError):
+            self.cart.add_items(['not an item'])
+        self.assertEqual(self.cart.generate_receipt('json'), receipt)
+        self.assertEqual(self.cart.total_quantity, 5)
+
+    def test_uids_are_unique_across_stripes(self):
+        """Test that a UID is rejected under any name once in the cart, like in ShoppingCart."""
+        apple = Item(name='Apple', price=1.00)
+        other_name = next(f"Item {i}" for i in range(100)
+                          if self.cart._stripe(f"Item {i}") != self.cart._stripe('Apple'))
+        twin = Item(name=other_name, price=2.00, uid=apple.uid)
+        self.cart.add_item(apple)
+        with self.assertRaises(ValueError):
+            self.cart.add_item(twin)
+        with self.assertRaises(ValueError):
+            self.cart.add_items([Item(name='Pear', price=1.00), twin])
+        self.assertEqual(self.cart.total_quantity, 1)
+
+        # The UID is free again once its item is removed, or the batch holding it failed
+        self.cart.remove_item(apple)
+        self.cart.add_items([twin])
+        with self.assertRaises(ValueError):
+            self.cart.add_items([apple, Item(name='Pear', price=1.00, uid=twin.uid)])
+        self.cart.remove_items([twin])
+        self.cart.add_item(apple)
+        self.cart.clear_cart()
+        self.cart.add_item(twin)
+        self.assertEqual(list(self.cart.iter_items()), [twin])
+
+    def test_remove_batch_with_repeated_item(self):
+        """Test that a removal batch repeating an item leaves every stripe, and the UIDs, unchanged."""
+        apple = Item(name='Apple', price=1.00)
+        other_name = next(f"Item {i}" for i in range(100)
+                          if self.cart._stripe(f"Item {i}") != self.cart._stripe('Apple'))
+        other = Item(name=other_name, price=2.00)
+        self.cart.add_items([apple, other])
+        for batch in ([apple, other, other], [other, apple, apple]):
+            with self.assertRaises(KeyError):
+                self.cart.remove_items(batch)
+        self.assertEqual(self.cart.total_quantity, 2)
+        self.cart.remove_items([apple, other])
+        self.cart.add_item(apple)
+        self.assertEqual(list(self.cart.iter_items()), [apple])
+
+    def test_receipts_are_cached_until_a_change(self):
+        """Test that receipts are reused while no stripe changes."""
+        self.cart.add_item(Item(name='Apple', price=1.00))
+        receipt = self.cart.generate_receipt('csv')
+        self.assertIs(self.cart.generate_receipt('csv'), receipt)
+        self.cart.add_item(Item(name='Pear', price=1.00))
+        self.assertNotEqual(self.cart.generate_receipt('csv'), receipt)
+        self.cart.clear_cart()
+        self.assertEqual(self.cart.list_items(), {})
+        self.assertEqual(self.cart.total_quantity, 0)
+
+    def test_invalid_stripes(self):
+        """Test that the number of stripes must be a positive integer."""
+        for stripes in (0, -1, 2.5):
+            with self.assertRaises(ValueError):
+                ConcurrentShoppingCart(stripes=stripes)
+
+    def test_concurrent_stress(self):
+        """Test that totals match the items while many threads add and remove them."""
+        thread_count = 8
+        operations = 300
+        barrier = threading.Barrier(thread_count + 1)
+        kept = [[] for _ in range(thread_count)]
+        errors = []
+        # Switch threads as often as possible to provoke interleavings
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+
+        def worker(thread_number):
+            rng = random.Random(thread_number)
+            owned = []
+            barrier.wait()
+            try:
+                for _ in range(operations):
+                    choice = rng.random()
+                    if choice < 0.4 or not owned:
+                        item = Item(name=f"Item {rng.randrange(12)}", price=rng.randrange(1000) / 100)
+                        self.cart.add_item(item)
+                        owned.append(item)
+                    elif choice < 0.6:
+                        batch = [Item(name=f"Item {rng.randrange(12)}", price=0.99) for _ in range(5)]
+                        self.cart.add_items(batch)
+                        owned.extend(batch)
+                    elif choice < 0.8:
+                        self.cart.remove_item(owned.pop(rng.randrange(len(owned))))
+                    else:
+                        batch, owned[:] = owned[:3], owned[3:]
+                        self.cart.remove_items(batch)
+            except Exception as e:
+                errors.append(e)
+            kept[thread_number] = owned
+
+        def reader():
+            barrier.wait()
+            try:
+                while any(thread.is_alive() for thread in threads):
+                    self.assert_consistent(self.cart.snapshot())
+                    self.cart.generate_receipt('csv', grouped=True)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(number,)) for number in range(thread_count)]
+        reader_thread = threading.Thread(target=reader)
+        for thread in threads + [reader_thread]:
+            thread.start()
+        for thread in threads + [reader_thread]:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        remaining = [item for owned in kept for item in owned]
+        self.assertEqual(self.cart.total_quantity, len(remaining))
+        self.assertEqual(self.cart.total_price_cents, sum(item.price_cents for item in remaining))
+        self.assert_consistent(self.cart.snapshot())
+        listed = [item for item_name in self.cart.list_items() for item in self.cart.list_items_by_name(item_name)]
+        self.assertEqual(sorted(item.uid for item in listed), sorted(item.uid for item in remaining))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 import uuid
 from shopping_cart.models.item import Item
@@ -24,6 +26,16 @@ class TestItem(unittest.TestCase):
             Item(name='Apple', price=-0.99)
         with self.assertRaises(TypeError):
             Item(name='Apple', price='0.99')
+        with self.assertRaises(ValueError):
+            Item(name='Apple', price=float('nan'))
+        with self.assertRaises(ValueError):
+            Item(name='Apple', price=float('inf'))
+
+    def test_item_huge_price(self):
+        """Test that prices too large to scale to cents as floats are still converted exactly."""
+        item = Item(name='Apple', price=1e307)
+        self.assertEqual(item.price_cents, int(1e307) * 100)
+        self.assertEqual(Item(name='Apple', price=1e300).price_cents, int(1e300) * 100)
 
     def test_item_immutability(self):
         """Test that Item attributes are immutable."""
@@ -39,5 +51,54 @@ class TestItem(unittest.TestCase):
         item2 = Item(name='Apple', price=0.99)
         self.assertNotEqual(item1.uid, item2.uid)
 
+    def test_item_uid_is_stable(self):
+        """Test that a lazily generated UID does not change between reads."""
+        item = Item(name='Apple', price=0.99)
+        self.assertEqual(item.uid, item.uid)
+        self.assertEqual(item.uid.version, 4)
+
+    def test_item_explicit_uid(self):
+        """Test creating an Item with an explicit UID."""
+        uid = uuid.uuid4()
+        item = Item(name='Apple', price=0.99, uid=uid)
+        self.assertEqual(item.uid, uid)
+
+    def test_item_equality_and_hash(self):
+        """Test that equality and hashing cover name, price and UID."""
+        uid = uuid.uuid4()
+        item1 = Item(name='Apple', price=0.99, uid=uid)
+        item2 = Item(name='Apple', price=0.99, uid=uid)
+        self.assertEqual(item1, item2)
+        self.assertEqual(hash(item1), hash(item2))
+        self.assertEqual(len({item1, item2}), 1)
+        self.assertNotEqual(item1, Item(name='Apple', price=1.99, uid=uid))
+        self.assertNotEqual(Item(name='Apple', price=0.99), Item(name='Apple', price=0.99))
+        self.assertNotEqual(item1, ('Apple', 0.99, uid))
+
+    def test_item_is_slotted(self):
+        """Test that Item instances carry no per-instance dictionary."""
+        item = Item(name='Apple', price=0.99)
+        self.assertFalse(hasattr(item, '__dict__'))
+        with self.assertRaises(AttributeError):
+            item.colour = 'red'
+        with self.assertRaises(AttributeError):
+            del item.name
+
+    def test_item_pickle_and_copy(self):
+        """Test that pickling and copying preserve the item and its UID."""
+        item = Item(name='Apple', price=0.99)
+        self.assertEqual(pickle.loads(pickle.dumps(item)), item)
+        self.assertEqual(copy.copy(item), item)
+        self.assertEqual(copy.deepcopy(item), item)
+
+    def test_item_price_cents(self):
+        """Test that the price is converted to exact cents, rounding half up."""
+        self.assertEqual(Item(name='Apple', price=0.99).price_cents, 99)
+        self.assertEqual(Item(name='Apple', price=0.29).price_cents, 29)
+        self.assertEqual(Item(name='Apple', price=1.005).price_cents, 101)
+        self.assertEqual(Item(name='Apple', price=999.9999).price_cents, 100000)
+        self.assertEqual(Item(name='Apple', price=0.0).price_cents, 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,211 @@
+import csv
+import io
+import json
+import random
+import unittest
+import yaml
+from unittest import mock
+from shopping_cart.models.item import Item
+from shopping_cart.models.promotions import (
+    BuyOneGetOneFree, DiscountLine, MultiBuy, PercentOff, PromotionEngine, SpendThreshold
+)
+from shopping_cart.models.receipts.batch_renderer import restore_receipt_data, snapshot_cart
+from shopping_cart.models.receipts.receipt_strategy_factory import get_receipt_strategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+
+
+class TestPromotions(unittest.TestCase):
+    """Unit tests for promotions applied to a shopping cart."""
+
+    def setUp(self):
+        """Set up a cart with a promotion of each kind."""
+        self.promotions = [
+            BuyOneGetOneFree('Apple'),
+            MultiBuy('Banana', 3, 2.00),
+            PercentOff('Cherry', 15),
+            SpendThreshold(10.00, amount_off=1.00),
+            SpendThreshold(20.00, percent_off=10),
+        ]
+        self.cart = ShoppingCart(promotions=self.promotions)
+
+    def test_buy_one_get_one_free(self):
+        """Test that every second unit is free, the cheapest ones first."""
+        self.cart.add_item(Item(name='Apple', price=1.00), quantity=3)
+        self.assertEqual(self.cart.discount_cents, 100)
+        self.cart.add_item(Item(name='Apple', price=0.50))
+        self.assertEqual(self.cart.discount_cents, 150)
+        self.assertEqual(self.cart.discount_lines(), [('Apple: buy one, get one free', 'Apple', 150)])
+
+    def test_multi_buy(self):
+        """Test that bundles are charged their fixed price, and the rest at unit price."""
+        self.cart.add_item(Item(name='Banana', price=0.90), quantity=2)
+        self.assertEqual(self.cart.discount_cents, 0)
+        self.cart.add_item(Item(name='Banana', price=0.90), quantity=5)
+        self.assertEqual(self.cart.discount_cents, 140)
+        self.assertEqual(self.cart.total_due_cents, 490)
+        self.cart.add_item(Item(name='Banana', price=0.50))
+        # The cheapest unit is left out of the bundles
+        self.assertEqual(self.cart.discount_cents, 140)
+        cheap_bananas = ShoppingCart(promotions=[MultiBuy('Banana', 2, 2.00)])
+        cheap_bananas.add_item(Item(name='Banana', price=0.50), quantity=4)
+        self.assertEqual(cheap_bananas.discount_cents, 0)
+
+    def test_percent_off(self):
+        """Test that percentages are rounded half up to the cent."""
+        self.cart.add_item(Item(name='Cherry', price=0.10))
+        self.assertEqual(self.cart.discount_cents, 2)
+        self.cart.add_item(Item(name='Cherry', price=0.10), quantity=2)
+        self.assertEqual(self.cart.discount_cents, 5)
+
+    def test_best_spend_threshold_applies_after_item_discounts(self):
+        """Test that only the best cart promotion applies, to the total after item discounts."""
+        self.cart.add_item(Item(name='Apple', price=5.00), quantity=2)
+        self.cart.add_item(Item(name='Bread', price=4.00))
+        # 14.00 less 5.00 off the apples is below the first threshold
+        self.assertEqual(self.cart.discount_cents, 500)
+        self.cart.add_item(Item(name='Bread', price=1.50))
+        self.assertEqual(self.cart.discount_lines()[-1], ('$1.00 off orders of $10.00 or more', None, 100))
+        self.cart.add_item(Item(name='Bread', price=15.00))
+        self.assertEqual(self.cart.discount_lines()[-1], ('10% off orders of $20.00 or more', None, 255))
+        self.assertEqual(self.cart.total_due_cents, 3050 - 500 - 255)
+        self.assertEqual(self.cart.total_due, 22.95)
+
+    def test_promotions_of_a_name_add_up_to_its_subtotal(self):
+        """Test that several promotions of a name never take off more than its subtotal."""
+        cart = ShoppingCart(promotions=[PercentOff('Apple', 60), PercentOff('Apple', 50, 'Loyalty')])
+        cart.add_item(Item(name='Apple', price=1.00))
+        self.assertEqual(cart.discount_lines(), [('Apple: 60% off', 'Apple', 60), ('Loyalty', 'Apple', 40)])
+        self.assertEqual(cart.total_due_cents, 0)
+
+    def test_incremental_discounts_match_a_rebuild(self):
+        """Test that discounts kept up to date through changes match discounts computed from scratch."""
+        rng = random.Random(3)
+        names = ['Apple', 'Banana', 'Cherry', 'Bread']
+        items = [Item(name=rng.choice(names), price=rng.choice([0.50, 0.90, 1.25, 3.00])) for _ in range(120)]
+        self.cart.add_items(items[:60])
+        for item in items[60:]:
+            self.cart.add_item(item)
+        self.cart.add_item(Item(name='Banana', price=0.90), quantity=4)
+        self.cart.remove_items(items[:30])
+        self.cart.remove_item(items[90])
+        self.cart.remove_item(Item(name='Banana', price=0.90), quantity=3)
+
+        rebuilt = ShoppingCart()
+        rebuilt.add_items(items[30:90] + items[91:])
+        rebuilt.add_item(Item(name='Banana', price=0.90))
+        rebuilt.set_promotions(self.promotions)
+        self.assertEqual(self.cart.discount_lines(), rebuilt.discount_lines())
+        self.assertEqual(self.cart.total_due_cents, rebuilt.total_due_cents)
+        self.assertGreater(self.cart.discount_cents, 0)
+
+    def test_only_promotions_of_the_changed_name_are_evaluated(self):
+        """Test that adding units of a name leaves the promotions of other names alone."""
+        self.cart.add_item(Item(name='Apple', price=1.00), quantity=2)
+        with mock.patch.object(BuyOneGetOneFree, 'discount_cents', return_value=0) as apple_rule, \
+                mock.patch.object(MultiBuy, 'discount_cents', return_value=0) as banana_rule:
+            self.cart.add_item(Item(name='Banana', price=0.90))
+            self.cart.add_items([Item(name='Banana', price=0.90), Item(name='Bread', price=2.00)])
+        apple_rule.assert_not_called()
+        self.assertEqual(banana_rule.call_count, 2)
+        self.assertEqual(self.cart.discount_lines(), [('Apple: buy one, get one free', 'Apple', 100)])
+
+    def test_clear_snapshot_and_replace(self):
+        """Test that discounts follow clearing, snapshots and a new set of promotions."""
+        self.cart.add_item(Item(name='Apple', price=1.00), quantity=2)
+        self.cart.add_items([Item(name='Apple', price=2.00), Item(name='Apple', price=2.00)])
+        buffer = io.BytesIO()
+        self.cart.save_snapshot(buffer)
+        restored = ShoppingCart.load_snapshot(buffer.getvalue(), promotions=self.promotions)
+        self.assertEqual(restored.discount_lines(), self.cart.discount_lines())
+        self.assertEqual(restored.discount_cents, 200)
+
+        self.cart.set_promotions([PercentOff('Apple', 50)])
+        self.assertEqual(self.cart.discount_cents, 300)
+        self.cart.set_promotions([])
+        self.assertEqual((self.cart.promotions, self.cart.discount_lines(), self.cart.total_due_cents), ([], [], 600))
+        restored.clear_cart()
+        self.assertEqual(restored.discount_cents, 0)
+
+    def test_invalid_promotions(self):
+        """Test that invalid promotions are rejected."""
+        for make_promotion in (lambda: MultiBuy('Apple', 1, 1.00), lambda: PercentOff('Apple', 0),
+                               lambda: PercentOff('', 10), lambda: SpendThreshold(10.00),
+                               lambda: SpendThreshold(10.00, amount_off=1.00, percent_off=5)):
+            with self.assertRaises(ValueError):
+                make_promotion()
+        with self.assertRaises(TypeError):
+            PromotionEngine(['not a promotion'])
+
+
+class TestDiscountReceipts(unittest.TestCase):
+    """Unit tests for discounts on receipts."""
+
+    def setUp(self):
+        """Set up a cart with an item and a cart discount."""
+        self.cart = ShoppingCart(promotions=[BuyOneGetOneFree('Apple'), SpendThreshold(2.00, amount_off=0.25)])
+        self.cart.add_items([Item(name='Apple', price=1.00), Item(name='Apple', price=1.00),
+                             Item(name='Banana', price=1.50)])
+        self.discounts = [
+            {'description': 'Apple: buy one, get one free', 'name': 'Apple', 'amount': 1.0},
+            {'description': '$0.25 off orders of $2.00 or more', 'name': None, 'amount': 0.25},
+        ]
+
+    def test_text_receipt(self):
+        """Test that discounts and the total due follow the total price."""
+        for grouped in (False, True):
+            receipt = self.cart.generate_receipt('text', grouped=grouped)
+            self.assertTrue(receipt.endswith(
+                "Total Price: $3.50\nDiscount: Apple: buy one, get one free | -$1.00"
+                "\nDiscount: $0.25 off orders of $2.00 or more | -$0.25\nTotal Due: $2.25"
+            ))
+
+    def test_csv_receipt(self):
+        """Test that discount and total due rows follow the total price row."""
+        rows = list(csv.reader(io.StringIO(self.cart.generate_receipt('csv'))))
+        self.assertEqual(rows[-4:], [
+            ['Total Price', '', '3.50'],
+            ['Discount', 'Apple: buy one, get one free', '-1.00'],
+            ['Discount', '$0.25 off orders of $2.00 or more', '-0.25'],
+            ['Total Due', '', '2.25'],
+        ])
+        stream = io.StringIO()
+        self.cart.write_receipt(stream, 'csv', grouped=True)
+        self.assertEqual(stream.getvalue(), self.cart.generate_receipt('csv', grouped=True))
+
+    def test_json_and_yaml_receipts(self):
+        """Test that structured receipts have the discounts and total due, in every style."""
+        for format_type, load, options in (('json', json.loads, {}), ('json', json.loads, {'compact': True}),
+                                           ('yaml', yaml.safe_load, {}), ('yaml', yaml.safe_load, {'compact': True})):
+            with self.subTest(format_type=format_type, **options):
+                receipt = load(self.cart.generate_receipt(format_type, **options))
+                self.assertEqual(receipt['total_price'], 3.50)
+                self.assertEqual(receipt['discounts'], self.discounts)
+                self.assertEqual(receipt['total_due'], 2.25)
+                self.assertEqual(len(receipt['items']), 3)
+        self.assertEqual(json.loads(self.cart.generate_receipt('json', compact=True)),
+                         json.loads(self.cart.generate_receipt('json')))
+
+    def test_receipts_without_promotions_are_unchanged(self):
+        """Test that carts without promotions print no discount section."""
+        self.cart.set_promotions([])
+        self.assertNotIn('Total Due', self.cart.generate_receipt('text'))
+        self.assertNotIn('discounts', json.loads(self.cart.generate_receipt('json')))
+
+    def test_receipts_round_trip(self):
+        """Test that receipts with discounts can still be loaded back into a cart."""
+        for format_type in ('csv', 'json', 'yaml'):
+            with self.subTest(format_type=format_type):
+                stream = io.StringIO(self.cart.generate_receipt(format_type))
+                loaded = ShoppingCart.load_receipt(stream, format_type)
+                self.assertEqual(loaded.total_price_cents, self.cart.total_price_cents)
+
+    def test_batch_snapshot_keeps_discounts(self):
+        """Test that batch rendering snapshots carry the discounts."""
+        data = restore_receipt_data(snapshot_cart(self.cart))
+        self.assertEqual(data['discounts'], self.cart.discount_lines())
+        self.assertIsInstance(data['discounts'][0], DiscountLine)
+        self.assertEqual(get_receipt_strategy('text').generate(data), self.cart.generate_receipt('text'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+from shopping_cart.models.item import Item
+from shopping_cart.models.shopping_cart import ShoppingCart
+from shopping_cart.models.receipts.receipt_parsers import JSONReceiptParser, get_receipt_parser
+
+# Names that need quoting or escaping in at least one format
+TRICKY_NAMES = ['Apple', 'Ap,ple "x"', 'line\nbreak', 'B: x', '- dash', '# hash', 'null', 'true', '123',
+                ' spaced ', "it's", 'Café ☕', '{braces}', '[list]', 'tab\there', 'back\\slash']
+
+# Every per-unit receipt layout, as (format, strategy options)
+LAYOUTS = [('csv', {}), ('csv', {'dialect': 'excel-tab'}), ('json', {}), ('json', {'compact': True}),
+           ('json', {'compact': True, 'encoder': 'json'}), ('yaml', {}), ('yaml', {'compact': True})]
+
+
+def random_cart(rng: random.Random, whole_cents: bool) -> ShoppingCart:
+    """Build a cart of random units and counted lines under tricky names."""
+    cart = ShoppingCart()
+    for _ in range(rng.randint(0, 40)):
+        name = rng.choice(TRICKY_NAMES)
+        price = rng.randint(0, 100_000) / 100 if whole_cents else rng.uniform(0, 1000)
+        if rng.random() < 0.2:
+            cart.add_item(Item(name=name, price=price), quantity=rng.randint(1, 5))
+        else:
+            cart.add_item(Item(name=name, price=price))
+    return cart
+
+
+class TestReceiptParsers(unittest.TestCase):
+    """Unit tests for parsing receipts back into carts."""
+
+    def setUp(self):
+        """Set up a cart with unique units and a counted line."""
+        self.cart = ShoppingCart()
+        self.cart.add_items([Item(name='Apple', price=1.00), Item(name='Banana', price=0.50),
+                             Item(name='Apple', price=1.25)])
+        self.cart.add_item(Item(name='Cherry', price=0.10), quantity=3)
+
+    def assert_same_units(self, cart, other):
+        """Check that two carts hold the same units, in the same order."""
+        for item_name in cart.list_items():
+            self.assertEqual(
+                [(item.uid, item.price_cents) for item in cart.list_items_by_name(item_name)],
+                [(item.uid, item.price_cents) for item in other.list_items_by_name(item_name)]
+            )
+        self.assertEqual(list(cart.list_items()), list(other.list_items()))
+        self.assertEqual(cart.total_price_cents, other.total_price_cents)
+        self.assertEqual(cart.total_quantity, other.total_quantity)
+
+    def test_round_trip_property(self):
+        """Test that parsing any receipt gives back its cart, which renders the same receipt."""
+        rng = random.Random(17)
+        for trial in range(60):
+            format_type, options = LAYOUTS[trial % len(LAYOUTS)]
+            # CSV receipts only keep two decimals
+            cart = random_cart(rng, whole_cents=format_type == 'csv')
+            receipt = cart.generate_receipt(format_type, **options)
+            parser_options = {'dialect': options['dialect']} if 'dialect' in options else {}
+            with self.subTest(trial=trial, format_type=format_type, options=options):
+                restored = ShoppingCart.load_receipt(io.StringIO(receipt), format_type, **parser_options)
+                self.assert_same_units(cart, restored)
+                self.assertEqual(restored.generate_receipt(format_type, **options), receipt)
+
+    def test_json_values_across_chunks(self):
+        """Test that entries and numbers cut by the end of a chunk are read whole."""
+        receipt = self.cart.generate_receipt('json')
+        for chunk_size in (1, 2, 3, 7, 64):
+            with mock.patch.object(JSONReceiptParser, 'chunk_size', chunk_size), self.subTest(chunk_size=chunk_size):
+                self.assert_same_units(self.cart, ShoppingCart.load_receipt(io.StringIO(receipt), 'json'))
+
+    def test_json_keys_in_any_order(self):
+        """Test that the total price may precede the items and unknown keys are skipped."""
+        receipt = ('{"total_price": 1.5, "store": {"id": [1, 2]}, "items": [{"name": "Apple", '
+                   '"unit_price": 1.5, "uid": "bb9b4d47-b033-4d2c-a379-4a0a480383da"}]}')
+        cart = ShoppingCart.load_receipt(io.StringIO(receipt), 'json')
+        self.assertEqual(str(cart.list_items_by_name('Apple')[0].uid), 'bb9b4d47-b033-4d2c-a379-4a0a480383da')
+
+    def test_files_and_binary_streams(self):
+        """Test loading from files, with the format told by the extension, and from binary streams."""
+        with tempfile.TemporaryDirectory() as directory:
+            for format_type, extension in (('csv', 'csv'), ('json', 'json'), ('yaml', 'yml')):
+                file_path = os.path.join(directory, f"receipt.{extension}")
+                self.cart.write_receipt(file_path, format_type)
+                self.assert_same_units(self.cart, ShoppingCart.load_receipt(file_path))
+                with open(file_path, 'rb') as file:
+                    self.assert_same_units(self.cart, ShoppingCart.load_receipt(file, format_type))
+                    self.assertFalse(file.closed)
+
+            with self.assertRaises(ValueError):
+                ShoppingCart.load_receipt(os.path.join(directory, 'receipt.txt'))
+            with self.assertRaises(IOError):
+                ShoppingCart.load_receipt(os.path.join(directory, 'missing.json'))
+        with self.assertRaises(ValueError):
+            ShoppingCart.load_receipt(io.StringIO(''))
+
+    def test_cart_options(self):
+        """Test that the rebuilt cart is built with the given options."""
+        receipt = self.cart.generate_receipt('yaml')
+        cart = ShoppingCart.load_receipt(io.StringIO(receipt), 'yaml', cart_options={'cache_receipt_lines': True})
+        self.assertIsNotNone(cart._fragment_cache)
+
+    def test_invalid_receipts(self):
+        """Test that grouped, truncated, altered or unknown receipts are rejected."""
+        for format_type in ('csv', 'json', 'yaml'):
+            receipt = self.cart.generate_receipt(format_type)
+            uid = str(self.cart.list_items_by_name('Banana')[0].uid)
+            invalid_receipts = {
+                'grouped': self.cart.generate_receipt(format_type, grouped=True),
+                'truncated': receipt[:len(receipt) // 2],
+                'altered price': receipt.replace('0.5', '0.75', 1),
+                'duplicate uid': receipt.replace(str(self.cart.list_items_by_name('Apple')[0].uid), uid),
+                'invalid uid': receipt.replace(uid, 'not-a-uid'),
+                'empty': '',
+            }
+            for label, invalid_receipt in invalid_receipts.items():
+                with self.subTest(format_type=format_type, receipt=label), self.assertRaises(ValueError):
+                    ShoppingCart.load_receipt(io.StringIO(invalid_receipt), format_type)
+
+        with self.assertRaises(ValueError):
+            get_receipt_parser('text')
+
+    def test_parsers_are_shared(self):
+        """Test that parsers are built once per format and options."""
+        self.assertIs(get_receipt_parser('json'), get_receipt_parser('JSON'))
+        self.assertIsNot(get_receipt_parser('csv'), get_receipt_parser('csv', dialect='excel-tab'))
+
+
+if __name__ == '__main__':
+    unittest.main()
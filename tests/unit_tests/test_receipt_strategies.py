@@ -1,10 +1,32 @@
 import unittest
+import asyncio
+import threading
+import time
 from shopping_cart.models.item import Item
 from shopping_cart.models.shopping_cart import ShoppingCart
+from shopping_cart.models.columnar_cart import ColumnarShoppingCart
+from shopping_cart.models.concurrent_cart import ConcurrentShoppingCart
 import json
 import yaml
 import csv
 import io
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from shopping_cart.models.receipts import receipt_strategy_factory
+from shopping_cart.models.receipts.base_receipt_strategy import BaseReceiptStrategy
+from shopping_cart.models.receipts import json_receipt_strategy, yaml_receipt_strategy
+from shopping_cart.models.receipts.csv_receipt_strategy import CSVReceiptStrategy
+from shopping_cart.models.receipts.async_receipt_strategy import (
+    AsyncReceiptStrategy, ConcurrencyLimiter, get_async_receipt_strategy
+)
+from shopping_cart.models.receipts.batch_renderer import render_receipts, restore_receipt_data, snapshot_cart
+from shopping_cart.models.receipts.receipt_strategy_factory import (
+    get_receipt_strategy, register_receipt_strategy, supported_formats
+)
 
 class TestReceiptGeneration(unittest.TestCase):
     """Unit tests for receipt generation strategies."""
@@ -160,6 +182,628 @@ class TestReceiptGeneration(unittest.TestCase):
             self.assertEqual(expected_item['name'], receipt_item['name'])
             self.assertEqual(expected_item['unit_price'], receipt_item['unit_price'])
 
+    def test_receipt_includes_quantity_lines(self):
+        """Test that units added with a quantity appear individually on receipts."""
+        self.cart.add_item(Item(name='Cherry', price=0.25), quantity=4)
+        receipt = json.loads(self.cart.generate_receipt(format_type='json'))
+        cherries = [item for item in receipt['items'] if item['name'] == 'Cherry']
+        self.assertEqual(len(cherries), 4)
+        self.assertEqual(len({item['uid'] for item in cherries}), 4)
+        self.assertEqual(receipt['total_price'], self.expected_total_price + 1.00)
+
+    def test_write_receipt_to_streams(self):
+        """Test that streamed receipts match the generated ones."""
+        for fmt in ['json', 'csv', 'text', 'yaml']:
+            expected = self.cart.generate_receipt(format_type=fmt)
+
+            text_stream = io.StringIO()
+            self.cart.write_receipt(text_stream, format_type=fmt)
+            self.assertEqual(text_stream.getvalue(), expected)
+
+            binary_stream = io.BytesIO()
+            self.cart.write_receipt(binary_stream, format_type=fmt)
+            self.assertEqual(binary_stream.getvalue(), expected.encode('utf-8'))
+
+    def test_write_receipt_to_file(self):
+        """Test streaming receipts straight to disk."""
+        with tempfile.TemporaryDirectory() as directory:
+            for fmt in ['json', 'csv', 'text', 'yaml']:
+                file_path = os.path.join(directory, f"receipt.{fmt}")
+                self.cart.write_receipt(file_path, format_type=fmt)
+                with open(file_path, newline='', encoding='utf-8') as file:
+                    self.assertEqual(file.read(), self.cart.generate_receipt(format_type=fmt))
+
+            with self.assertRaises(IOError):
+                self.cart.write_receipt(os.path.join(directory, 'missing', 'receipt.txt'))
+
+    def test_streamed_receipts_match_whole_document_dumps(self):
+        """Test that streamed JSON and YAML equal a single dump of the receipt."""
+        cart = ShoppingCart()
+        cart.add_items(Item(name=f"Item \"{i % 7}\", é", price=i / 4) for i in range(1200))
+        receipt = {
+            'items': [
+                {'uid': str(item.uid), 'name': item.name, 'unit_price': item.price}
+                for item_group in cart.list_items().values()
+                for item in item_group['instances']
+            ],
+            'total_price': cart.total_price
+        }
+        self.assertEqual(cart.generate_receipt(format_type='json'), json.dumps(receipt, indent=4))
+        self.assertEqual(cart.generate_receipt(format_type='yaml'), yaml.dump(receipt, default_flow_style=False))
+
+        empty = {'items': [], 'total_price': 0.0}
+        self.assertEqual(ShoppingCart().generate_receipt(format_type='json'), json.dumps(empty, indent=4))
+        self.assertEqual(ShoppingCart().generate_receipt(format_type='yaml'), yaml.dump(empty, default_flow_style=False))
+
+    def test_receipt_cache(self):
+        """Test that receipts are reused until the cart changes."""
+        first = self.cart.generate_receipt(format_type='text')
+        self.assertIs(self.cart.generate_receipt(format_type='text'), first)
+
+        version = self.cart._version
+        cherry = Item(name='Cherry', price=0.25)
+        self.cart.add_item(cherry)
+        self.assertGreater(self.cart._version, version)
+        updated = self.cart.generate_receipt(format_type='text')
+        self.assertIn(str(cherry.uid), updated)
+
+        self.cart.remove_item(cherry)
+        self.assertEqual(self.cart.generate_receipt(format_type='text'), first)
+
+        self.cart.clear_cart()
+        self.assertNotIn(str(self.item1.uid), self.cart.generate_receipt(format_type='text'))
+
+    def test_receipt_cache_saves_file(self):
+        """Test that a cached receipt is still written to the requested file."""
+        receipt_content = self.cart.generate_receipt(format_type='csv')
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'receipt.csv')
+            self.cart.generate_receipt(format_type='csv', file_path=file_path)
+            with open(file_path, newline='', encoding='utf-8') as file:
+                self.assertEqual(file.read(), receipt_content)
+
+    def test_receipt_line_cache(self):
+        """Test that cached item fragments are only rendered once."""
+        cherry = Item(name='Cherry', price=0.25)
+        for fmt in ['json', 'csv', 'text', 'yaml']:
+            cart = ShoppingCart(cache_receipt_lines=True)
+            cart.add_items([self.item1, self.item2, self.item3])
+            expected_before = self.cart.generate_receipt(format_type=fmt)
+            reference = ShoppingCart()
+            reference.add_items([self.item1, self.item3, cherry])
+            expected_after = reference.generate_receipt(format_type=fmt)
+
+            strategy = get_receipt_strategy(fmt)
+            with mock.patch.object(strategy, 'render_item', wraps=strategy.render_item) as render_item:
+                self.assertEqual(cart.generate_receipt(format_type=fmt), expected_before)
+                self.assertEqual(render_item.call_count, 3)
+
+                cart.remove_item(self.item2)
+                cart.add_item(cherry)
+                self.assertEqual(cart.generate_receipt(format_type=fmt), expected_after)
+                self.assertEqual(render_item.call_count, 4)
+                self.assertNotIn(self.item2.uid, cart._fragment_cache[strategy])
+
+                stream = io.StringIO()
+                cart.write_receipt(stream, format_type=fmt)
+                self.assertEqual(stream.getvalue(), expected_after)
+                self.assertEqual(render_item.call_count, 4)
+
+    def test_json_compact_receipt(self):
+        """Test the compact JSON receipt with every installed encoder."""
+        pretty = json.loads(self.cart.generate_receipt(format_type='json'))
+        encoders = ['auto', 'json'] + [
+            name for name in ('orjson', 'ujson') if getattr(json_receipt_strategy, name) is not None
+        ]
+        for encoder in encoders:
+            receipt_content = self.cart.generate_receipt(format_type='json', compact=True, encoder=encoder)
+            self.assertNotIn('\n', receipt_content)
+            self.assertNotIn(': ', receipt_content)
+            self.assertEqual(json.loads(receipt_content), pretty)
+
+            binary_stream = io.BytesIO()
+            self.cart.write_receipt(binary_stream, format_type='json', compact=True, encoder=encoder)
+            self.assertEqual(json.loads(binary_stream.getvalue()), pretty)
+
+        empty = ShoppingCart().generate_receipt(format_type='json', compact=True)
+        self.assertEqual(empty, '{"items":[],"total_price":0.0}')
+
+    def test_json_compact_receipt_matches_stdlib(self):
+        """Test that compact receipts equal a minified dump of the whole receipt."""
+        cart = ShoppingCart()
+        cart.add_items(Item(name=f"Crème \"{i % 7}\"/", price=i / 4) for i in range(2500))
+        receipt = json.loads(cart.generate_receipt(format_type='json'))
+        minified = json.dumps(receipt, separators=(',', ':'), ensure_ascii=False)
+        self.assertEqual(cart.generate_receipt(format_type='json', compact=True, encoder='json'), minified)
+
+        strategy = get_receipt_strategy('json', compact=True)
+        self.assertEqual(json.loads(strategy.generate_bytes(cart._receipt_data())), receipt)
+
+    def test_json_unknown_encoder(self):
+        """Test requesting an unsupported JSON encoder."""
+        with self.assertRaises(ValueError):
+            self.cart.generate_receipt(format_type='json', compact=True, encoder='simdjson')
+
+    def test_yaml_compact_receipt(self):
+        """Test the single-line, flow style YAML receipt."""
+        receipt_content = self.cart.generate_receipt(format_type='yaml', compact=True)
+        self.assertEqual(receipt_content.count('\n'), 1)
+        self.assertTrue(receipt_content.startswith('{items: ['))
+        self.assertEqual(yaml.safe_load(receipt_content),
+                         yaml.safe_load(self.cart.generate_receipt(format_type='yaml')))
+
+        empty = ShoppingCart().generate_receipt(format_type='yaml', compact=True)
+        self.assertEqual(yaml.safe_load(empty), {'items': [], 'total_price': 0.0})
+
+    @unittest.skipIf(yaml_receipt_strategy.LibYAMLDumper is None, "libyaml is not available")
+    def test_yaml_libyaml_matches_python_emitter(self):
+        """Test that libyaml and the pure Python emitter produce the same receipts."""
+        cart = ShoppingCart()
+        cart.add_items(Item(name=f"Crème {i % 5}: \"brûlée\"", price=i / 8) for i in range(1200))
+        for compact in (False, True):
+            self.assertEqual(
+                cart.generate_receipt(format_type='yaml', compact=compact, use_libyaml=True),
+                cart.generate_receipt(format_type='yaml', compact=compact, use_libyaml=False)
+            )
+        self.assertIs(get_receipt_strategy('yaml').dumper, yaml_receipt_strategy.LibYAMLDumper)
+
+    def test_csv_quoting(self):
+        """Test that CSV fields with delimiters, quotes and newlines survive a round trip."""
+        awkward = Item(name='Eggs, "Dozen"\nLarge', price=3.00)
+        self.cart.add_item(awkward)
+        receipt_content = self.cart.generate_receipt(format_type='csv')
+        self.assertIn('\r\n', receipt_content)
+
+        lines = list(csv.reader(io.StringIO(receipt_content, newline='')))
+        self.assertEqual(len(lines), 6)
+        self.assertIn([str(awkward.uid), awkward.name, '3.00'], lines)
+        self.assertEqual(lines[-1], ['Total Price', '', '5.50'])
+
+    def test_csv_dialect(self):
+        """Test writing a CSV receipt with another dialect."""
+        receipt_content = self.cart.generate_receipt(format_type='csv', dialect='excel-tab')
+        lines = list(csv.reader(io.StringIO(receipt_content, newline=''), dialect='excel-tab'))
+        self.assertEqual(lines[0], ['UID', 'Name', 'Unit Price'])
+        self.assertEqual(len(lines), 5)
+
+    def test_csv_grouped_receipt(self):
+        """Test the CSV receipt with one row per item name."""
+        self.cart.add_item(Item(name='Banana', price=0.50), quantity=10)
+        receipt_content = self.cart.generate_receipt(format_type='csv', grouped=True)
+        lines = list(csv.reader(io.StringIO(receipt_content, newline='')))
+        self.assertEqual(lines, [
+            ['Name', 'Quantity', 'Subtotal'],
+            ['Apple', '2', '2.00'],
+            ['Banana', '11', '5.50'],
+            ['Total Price', '', '7.50'],
+        ])
+
+    def test_csv_streamed_receipts(self):
+        """Test that streamed CSV receipts match the generated ones in every mode."""
+        self.cart.add_items(Item(name=f"Item, {i}", price=1.25) for i in range(2500))
+        for options in ({}, {'grouped': True}, {'dialect': 'unix'}):
+            expected = self.cart.generate_receipt(format_type='csv', **options)
+            text_stream = io.StringIO(newline='')
+            self.cart.write_receipt(text_stream, format_type='csv', **options)
+            self.assertEqual(text_stream.getvalue(), expected)
+
+            binary_stream = io.BytesIO()
+            self.cart.write_receipt(binary_stream, format_type='csv', **options)
+            self.assertEqual(binary_stream.getvalue(), expected.encode('utf-8'))
+
+    def test_grouped_receipts(self):
+        """Test that grouped receipts list each name once with its quantity and subtotal."""
+        self.cart.add_item(Item(name='Banana', price=0.50), quantity=10000)
+        expected_groups = [
+            {'name': 'Apple', 'quantity': 2, 'subtotal': 2.00},
+            {'name': 'Banana', 'quantity': 10001, 'subtotal': 5000.50},
+        ]
+
+        json_receipt = self.cart.generate_receipt(format_type='json', grouped=True)
+        self.assertEqual(json_receipt, json.dumps({'items': expected_groups, 'total_price': 5002.50}, indent=4))
+        compact_json = json.loads(self.cart.generate_receipt(format_type='json', grouped=True, compact=True))
+        self.assertEqual(compact_json['items'], expected_groups)
+
+        for compact in (False, True):
+            yaml_receipt = yaml.safe_load(self.cart.generate_receipt(format_type='yaml', grouped=True, compact=compact))
+            self.assertEqual(yaml_receipt, {'items': expected_groups, 'total_price': 5002.50})
+
+        text_receipt = self.cart.generate_receipt(format_type='text', grouped=True)
+        self.assertEqual(text_receipt.split('\n')[2:4], [
+            'Name: Apple | Quantity: 2 | Subtotal: $2.00',
+            'Name: Banana | Quantity: 10001 | Subtotal: $5000.50',
+        ])
+
+        # The counted units were never turned into instances
+        self.assertEqual(len(self.cart._items['Banana']['instances']), 1)
+        self.assertEqual(self.cart._items['Banana']['lines'], {0.50: 10000})
+
+        # Per-unit detail is still available
+        detailed = json.loads(self.cart.generate_receipt(format_type='json'))
+        self.assertEqual(len(detailed['items']), 10003)
+
+    def test_grouped_receipts_streamed(self):
+        """Test that streamed grouped receipts match the generated ones."""
+        cart = ShoppingCart(cache_receipt_lines=True)
+        cart.add_items(Item(name=f"Item {i % 1500}", price=1.25) for i in range(3000))
+        for format_type in ('csv', 'text', 'json', 'yaml'):
+            for options in ({'grouped': True}, {'grouped': True, 'compact': True}):
+                if 'compact' in options and format_type not in ('json', 'yaml'):
+                    continue
+                expected = cart.generate_receipt(format_type=format_type, **options)
+                stream = io.StringIO(newline='')
+                cart.write_receipt(stream, format_type=format_type, **options)
+                self.assertEqual(stream.getvalue(), expected)
+                self.assertEqual(expected.count('Item 1499'), 1)
+
+    def test_grouped_receipt_unsupported(self):
+        """Test that strategies without a grouped layout say so."""
+        strategy = NameListReceiptStrategy()
+        strategy.grouped = True
+        with self.assertRaises(NotImplementedError):
+            strategy.generate(self.cart._receipt_data())
+
+    def test_csv_rows_match_csv_writer(self):
+        """Test that CSV receipts are byte-identical to writing every row with csv.writer."""
+        class Semicolons(csv.Dialect):
+            delimiter = ';'
+            quotechar = "'"
+            escapechar = '\\'
+            quoting = csv.QUOTE_NONNUMERIC
+            lineterminator = '\n'
+
+        class HexDelimiter(csv.excel):
+            delimiter = 'a'
+
+        self.cart.add_items(Item(name=name, price=1.25) for name in ('Plain', 'Semi;colon', "Quote's", 'Tab\tbed'))
+        for dialect in ('excel', 'excel-tab', 'unix', Semicolons, HexDelimiter):
+            strategy = CSVReceiptStrategy(dialect=dialect)
+            buffer = io.StringIO(newline='')
+            csv.writer(buffer, dialect).writerows(strategy.iter_rows(self.cart._receipt_data()))
+            self.assertEqual(self.cart.generate_receipt(format_type='csv', dialect=dialect), buffer.getvalue())
+
+    def test_csv_dialect_quotes_every_field(self):
+        """Test that a dialect quoting all fields is applied to UIDs, prices and totals too."""
+        class AllQuoted(csv.excel):
+            quoting = csv.QUOTE_ALL
+
+        cart = ShoppingCart(cache_receipt_lines=True)
+        cart.add_items([Item(name='Apple', price=1.00), Item(name='Eggs, Dozen', price=3.50)])
+        cart.add_item(Item(name='Banana', price=0.50), quantity=2)
+        receipt_content = cart.generate_receipt('csv', dialect=AllQuoted)
+        for line in receipt_content.splitlines():
+            fields = line.split(',"')
+            self.assertTrue(line.startswith('"') and line.endswith('"'), line)
+            self.assertEqual(len(fields), 3, line)
+
+        stream = io.StringIO(newline='')
+        cart.write_receipt(stream, 'csv', dialect=AllQuoted)
+        self.assertEqual(stream.getvalue(), receipt_content)
+        stream = io.StringIO(newline='')
+        CSVReceiptStrategy(dialect=AllQuoted).write(cart._receipt_data(), stream)
+        self.assertEqual(stream.getvalue(), receipt_content)
+
+
+class NameListReceiptStrategy(BaseReceiptStrategy):
+    """Minimal third-party strategy used to exercise the registry."""
+
+    item_separator = ','
+
+    def render_header(self, data):
+        return ''
+
+    def render_item(self, item):
+        return item.name
+
+    def render_footer(self, data):
+        return ''
+
+
+class TestReceiptStrategyFactory(unittest.TestCase):
+    """Unit tests for the receipt strategy registry."""
+
+    def tearDown(self):
+        """Forget the formats registered by the tests."""
+        for format_type in ('names', 'names_path'):
+            receipt_strategy_factory._registry.pop(format_type, None)
+            receipt_strategy_factory._instances.pop(format_type, None)
+
+    def test_strategy_instances_are_cached(self):
+        """Test that repeated lookups return the same strategy instance."""
+        self.assertIs(get_receipt_strategy('json'), get_receipt_strategy('JSON'))
+
+    def test_strategy_instances_per_options(self):
+        """Test that strategies built with different options are cached separately."""
+        compact = get_receipt_strategy('json', compact=True)
+        self.assertIs(get_receipt_strategy('json', compact=True), compact)
+        self.assertIsNot(get_receipt_strategy('json'), compact)
+        self.assertTrue(compact.compact)
+
+    def test_supported_formats(self):
+        """Test listing the built-in formats."""
+        for format_type in ('csv', 'text', 'json', 'yaml'):
+            self.assertIn(format_type, supported_formats())
+
+    def test_register_receipt_strategy(self):
+        """Test registering a new format by class and by import path."""
+        register_receipt_strategy('names', NameListReceiptStrategy)
+        register_receipt_strategy('names_path', f"{__name__}:NameListReceiptStrategy")
+
+        cart = ShoppingCart()
+        cart.add_item(Item(name='Apple', price=1.00), quantity=3)
+        self.assertEqual(cart.generate_receipt(format_type='names'), 'Apple,Apple,Apple')
+        self.assertEqual(cart.generate_receipt(format_type='names_path'), 'Apple,Apple,Apple')
+        self.assertIn('names', supported_formats())
+
+    def test_register_existing_format(self):
+        """Test that registered formats are only replaced on request."""
+        with self.assertRaises(ValueError):
+            register_receipt_strategy('json', NameListReceiptStrategy)
+
+        register_receipt_strategy('names', NameListReceiptStrategy)
+        strategy = get_receipt_strategy('names')
+        register_receipt_strategy('names', NameListReceiptStrategy, replace=True)
+        self.assertIsNot(get_receipt_strategy('names'), strategy)
+
+    def test_strategies_are_imported_lazily(self):
+        """Test that importing the cart does not import any receipt backend."""
+        code = (
+            "import sys\n"
+            "import shopping_cart.models.shopping_cart\n"
+            "print(any(name in sys.modules for name in ("
+            "'yaml', 'shopping_cart.models.receipts.json_receipt_strategy')))"
+        )
+        output = subprocess.check_output([sys.executable, '-c', code], text=True)
+        self.assertEqual(output.strip(), 'False')
+
+
+class TestBatchRendering(unittest.TestCase):
+    """Unit tests for rendering the receipts of many carts in parallel."""
+
+    def setUp(self):
+        """Set up a few carts and an output directory."""
+        self.carts = {}
+        for cart_number in range(5):
+            cart = ShoppingCart()
+            cart.add_items(Item(name=f"Item, {i % 3}", price=0.25 * i) for i in range(cart_number * 4))
+            cart.add_item(Item(name='Banana', price=0.50), quantity=cart_number + 1)
+            self.carts[f"cart-{cart_number}"] = cart
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def assert_receipts_match(self, paths, formats):
+        """Check that every written receipt matches the one generated by its cart."""
+        self.assertEqual(len(paths), len(self.carts) * len(formats))
+        for cart_id, cart in self.carts.items():
+            for format_type, options in formats.items():
+                file_path = os.path.join(self.directory.name, f"{cart_id}.{format_type}")
+                self.assertIn(file_path, paths)
+                with open(file_path, newline='', encoding='utf-8') as file:
+                    self.assertEqual(file.read(),
+                                     cart.generate_receipt(format_type, **options))
+
+    def test_snapshot_round_trip(self):
+        """Test that a snapshot restores the receipt data of its cart."""
+        cart = self.carts['cart-3']
+        data = restore_receipt_data(snapshot_cart(cart))
+        self.assertEqual(cart.generate_receipt('json'),
+                         get_receipt_strategy('json').generate(data))
+        self.assertEqual(data['items']['Banana']['total_quantity'], 4)
+
+    def test_render_with_threads(self):
+        """Test batch rendering on a thread pool."""
+        formats = {'text': {}, 'csv': {}, 'json': {'compact': True}, 'yaml': {}}
+        paths = render_receipts(self.carts, formats, self.directory.name, executor='thread', max_workers=3,
+                                chunksize=2)
+        self.assert_receipts_match(paths, formats)
+
+    def test_render_with_processes(self):
+        """Test batch rendering on a process pool, carts identified by position."""
+        carts = list(self.carts.values())
+        self.carts = dict(zip(map(str, range(len(carts))), carts))
+        paths = render_receipts(carts, ['json', 'csv'], self.directory.name, executor='process', max_workers=2)
+        self.assert_receipts_match(paths, {'json': {}, 'csv': {}})
+
+    def test_render_other_cart_types(self):
+        """Test batch rendering of columnar and concurrent carts, which have no discounts or taxes."""
+        for cart_type in (ColumnarShoppingCart, ConcurrentShoppingCart):
+            with self.subTest(cart_type=cart_type.__name__):
+                carts = {}
+                for cart_id, cart in self.carts.items():
+                    carts[cart_id] = cart_type()
+                    carts[cart_id].add_items(cart.list_items_by_name(item_name)[0] for item_name in cart.list_items())
+                    carts[cart_id].add_item(Item(name='Banana', price=0.50), quantity=2)
+                self.carts = carts
+                formats = {'json': {}, 'csv': {'grouped': True}}
+                paths = render_receipts(self.carts, formats, self.directory.name, executor='thread')
+                self.assert_receipts_match(paths, formats)
+
+    def test_render_grouped_only_keeps_counted_lines(self):
+        """Test that grouped batches do not turn counted units into instances."""
+        paths = render_receipts(self.carts, {'csv': {'grouped': True}}, self.directory.name, executor='thread')
+        self.assert_receipts_match(paths, {'csv': {'grouped': True}})
+        self.assertEqual(self.carts['cart-4']._items['Banana']['lines'], {0.50: 5})
+
+    def test_render_unsupported(self):
+        """Test that unknown executors and formats are rejected."""
+        with self.assertRaises(ValueError):
+            render_receipts(self.carts, ['json'], self.directory.name, executor='fibers')
+        with self.assertRaises(ValueError):
+            render_receipts(self.carts, ['pdf'], self.directory.name, executor='thread')
+
+    def test_render_rejects_ids_outside_output_dir(self):
+        """Test that cart ids which are paths are rejected before anything is written."""
+        output_dir = os.path.join(self.directory.name, 'receipts')
+        for cart_id in ['../escaped', 'nested/cart', os.path.join('..', 'escaped'), '']:
+            with self.subTest(cart_id=cart_id):
+                carts = dict(self.carts, **{cart_id: ShoppingCart()})
+                with self.assertRaises(ValueError):
+                    render_receipts(carts, ['json'], output_dir, executor='thread')
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+class TestAsyncReceipts(unittest.TestCase):
+    """Unit tests for writing receipts from an event loop."""
+
+    def setUp(self):
+        """Set up a cart and an output directory."""
+        self.cart = ShoppingCart()
+        self.cart.add_items(Item(name=f"Item {i % 4}", price=0.75) for i in range(50))
+        self.cart.add_item(Item(name='Banana', price=0.50), quantity=3)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def read(self, file_name):
+        """Read a file of the output directory."""
+        with open(os.path.join(self.directory.name, file_name), newline='', encoding='utf-8') as file:
+            return file.read()
+
+    def test_agenerate_receipt(self):
+        """Test that async receipts match the generated ones in every format."""
+        async def generate_all():
+            return await asyncio.gather(*(
+                self.cart.agenerate_receipt(format_type, os.path.join(self.directory.name, f"receipt.{format_type}"),
+                                            atomic=format_type == 'csv')
+                for format_type in ('csv', 'text', 'json', 'yaml')
+            ))
+
+        receipts = asyncio.run(generate_all())
+        for format_type, receipt_content in zip(('csv', 'text', 'json', 'yaml'), receipts):
+            self.assertEqual(receipt_content, self.cart.generate_receipt(format_type))
+            self.assertEqual(self.read(f"receipt.{format_type}"), receipt_content)
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         ['receipt.csv', 'receipt.json', 'receipt.text', 'receipt.yaml'])
+
+    def test_agenerate_receipt_uses_contents_at_call(self):
+        """Test that changing the cart during an async receipt does not affect it."""
+        async def generate_while_changing():
+            task = asyncio.ensure_future(self.cart.agenerate_receipt('json', grouped=True))
+            await asyncio.sleep(0)
+            self.cart.clear_cart()
+            return await task
+
+        receipt_content = asyncio.run(generate_while_changing())
+        names = [entry['name'] for entry in json.loads(receipt_content)['items']]
+        self.assertEqual(names, ['Item 0', 'Item 1', 'Item 2', 'Item 3', 'Banana'])
+        # The receipt was cached for the version it was rendered at, not the current one
+        self.assertEqual(json.loads(self.cart.generate_receipt('json', grouped=True))['items'], [])
+
+    def test_async_writes_are_bounded(self):
+        """Test that no more than max_concurrency writes run at once."""
+        strategy = get_receipt_strategy('text')
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_save(receipt_content, file_path, atomic=False):
+            with lock:
+                running.append(file_path)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(file_path)
+
+        async_strategy = AsyncReceiptStrategy(strategy, max_concurrency=2)
+
+        async def save_all():
+            await asyncio.gather(*(async_strategy.save('', f"receipt-{i}.txt") for i in range(10)))
+
+        with mock.patch.object(strategy, 'save', side_effect=slow_save):
+            asyncio.run(save_all())
+        self.assertEqual(len(peak), 10)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_async_writes_are_bounded_across_formats(self):
+        """Test that async strategies of different formats share their limit."""
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_save(receipt_content, file_path, atomic=False):
+            with lock:
+                running.append(file_path)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(file_path)
+
+        formats = ['text', 'json', 'csv', 'yaml']
+        async_strategies = [get_async_receipt_strategy(format_type, max_concurrency=3) for format_type in formats]
+
+        async def save_all():
+            await asyncio.gather(*(async_strategy.save('', f"receipt-{i}.{format_type}")
+                                   for format_type, async_strategy in zip(formats, async_strategies)
+                                   for i in range(5)))
+
+        with mock.patch.object(BaseReceiptStrategy, 'save', side_effect=slow_save):
+            asyncio.run(save_all())
+        self.assertEqual(len(peak), 20)
+        self.assertLessEqual(max(peak), 3)
+
+    def test_agenerate_receipt_options(self):
+        """Test that agenerate_receipt passes its concurrency limit and executor on."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with mock.patch.object(executor, 'submit', wraps=executor.submit) as submit:
+                receipt_content = asyncio.run(self.cart.agenerate_receipt('json', max_concurrency=1,
+                                                                          executor=executor))
+        self.assertEqual(receipt_content, self.cart.generate_receipt('json'))
+        submit.assert_called_once()
+        self.assertEqual(get_async_receipt_strategy('json', max_concurrency=1, executor=executor).max_concurrency, 1)
+        with self.assertRaises(ValueError):
+            asyncio.run(self.cart.agenerate_receipt('json', max_concurrency=0))
+
+    def test_async_strategies_are_shared(self):
+        """Test that async strategies are shared per strategy, and their limit across strategies."""
+        self.assertIs(get_async_receipt_strategy('json'), get_async_receipt_strategy('JSON'))
+        self.assertIsNot(get_async_receipt_strategy('json'), get_async_receipt_strategy('json', compact=True))
+        self.assertIs(get_async_receipt_strategy('json').limiter, get_async_receipt_strategy('csv').limiter)
+        self.assertIs(get_async_receipt_strategy('json', max_concurrency=2).limiter,
+                      AsyncReceiptStrategy(get_receipt_strategy('text'), max_concurrency=2).limiter)
+        self.assertIsNot(get_async_receipt_strategy('json', max_concurrency=2).limiter,
+                         get_async_receipt_strategy('json').limiter)
+        with self.assertRaises(ValueError):
+            AsyncReceiptStrategy(get_receipt_strategy('json'), max_concurrency=0)
+        with self.assertRaises(ValueError):
+            get_async_receipt_strategy('json', max_concurrency=2, limiter=ConcurrencyLimiter(2))
+
+    def test_atomic_write_keeps_previous_file_on_failure(self):
+        """Test that a failed atomic write leaves the previous receipt in place."""
+        file_path = os.path.join(self.directory.name, 'receipt.json')
+        strategy = get_receipt_strategy('json')
+        strategy.write_file(self.cart._receipt_data(), file_path, atomic=True)
+        previous = self.read('receipt.json')
+
+        self.cart.add_item(Item(name='Cherry', price=0.25))
+        with mock.patch.object(strategy, 'render_footer', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(get_async_receipt_strategy('json').write_file(self.cart._receipt_data(), file_path,
+                                                                          atomic=True))
+        self.assertEqual(self.read('receipt.json'), previous)
+        self.assertEqual(os.listdir(self.directory.name), ['receipt.json'])
+
+    @unittest.skipUnless(os.name == 'posix', "File modes are POSIX specific")
+    def test_atomic_write_file_mode(self):
+        """Test that atomic writes give new files the default mode and keep the mode of replaced ones."""
+        file_path = os.path.join(self.directory.name, 'receipt.csv')
+        strategy = get_receipt_strategy('csv')
+        strategy.write_file(self.cart._receipt_data(), os.path.join(self.directory.name, 'plain.csv'))
+        strategy.write_file(self.cart._receipt_data(), file_path, atomic=True)
+        self.assertEqual(os.stat(file_path).st_mode & 0o777,
+                         os.stat(os.path.join(self.directory.name, 'plain.csv')).st_mode & 0o777)
+
+        os.chmod(file_path, 0o640)
+        strategy.write_file(self.cart._receipt_data(), file_path, atomic=True)
+        self.assertEqual(os.stat(file_path).st_mode & 0o777, 0o640)
+
+        # The umask in effect at the time of the write applies to new files
+        previous_umask = os.umask(0o077)
+        try:
+            strategy.write_file(self.cart._receipt_data(), os.path.join(self.directory.name, 'private.csv'),
+                                atomic=True)
+        finally:
+            os.umask(previous_umask)
+        self.assertEqual(os.stat(os.path.join(self.directory.name, 'private.csv')).st_mode & 0o777, 0o600)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from shopping_cart.models.search import SearchIndex, normalize
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Unit tests for the type-ahead search index."""
+
+    def setUp(self):
+        """Set up an index over a few names."""
+        self.index = SearchIndex([
+            'Tomato Sauce', 'Tomatoes', 'Tea', 'Tea Bags', 'Chicken Breast',
+            'Rice (1kg)', 'Banana', 'Peanut Butter #2',
+        ])
+
+    def test_normalize(self):
+        """Test that names and queries are case folded with single spaces."""
+        self.assertEqual(normalize('  Tomato \t SAUCE '), 'tomato sauce')
+
+    def test_prefix_search(self):
+        """Test prefix queries on the start of every word, in alphabetical order."""
+        self.assertEqual(self.index.search('tom'), ['Tomato Sauce', 'Tomatoes'])
+        self.assertEqual(self.index.search('  TOMATO  s'), ['Tomato Sauce'])
+        self.assertEqual(self.index.search('tea'), ['Tea', 'Tea Bags'])
+        self.assertEqual(self.index.search('sau'), ['Tomato Sauce'])
+        self.assertEqual(self.index.search('1kg'), ['Rice (1kg)'])
+        self.assertEqual(self.index.search('#2'), ['Peanut Butter #2'])
+        self.assertEqual(self.index.search('b'), ['Tea Bags', 'Banana', 'Chicken Breast', 'Peanut Butter #2'])
+        self.assertEqual(self.index.search('b', limit=2), ['Tea Bags', 'Banana'])
+        self.assertEqual(self.index.search('ato'), [])
+        self.assertEqual(self.index.search(' '), [])
+
+    def test_fuzzy_search(self):
+        """Test that typos are corrected against the words of the names."""
+        self.assertEqual(self.index.search('chiken'), ['Chicken Breast'])
+        self.assertEqual(self.index.search('bannana'), ['Banana'])
+        self.assertEqual(self.index.search('tomatto sau'), ['Tomato Sauce'])
+        self.assertEqual(self.index.search('chiken', fuzzy=False), [])
+        self.assertEqual(self.index.search('xylophone'), [])
+        self.assertEqual(self.index.search('tomatos'), ['Tomato Sauce', 'Tomatoes'])
+        # Words of the indexed names are not corrected
+        self.index.add('Tomatto Ketchup')
+        self.assertEqual(self.index.search('tomatto'), ['Tomatto Ketchup'])
+
+    def test_add_and_remove(self):
+        """Test incremental updates, with names added several times."""
+        self.index.add('Tea Cakes')
+        self.index.add('Tea Cakes')
+        self.assertEqual(self.index.search('tea'), ['Tea', 'Tea Bags', 'Tea Cakes'])
+        self.assertEqual(self.index.search('cakse'), ['Tea Cakes'])
+        self.index.remove('Tea Cakes')
+        self.assertIn('Tea Cakes', self.index)
+        self.index.remove('Tea Cakes')
+        self.assertNotIn('Tea Cakes', self.index)
+        self.assertEqual(self.index.search('tea'), ['Tea', 'Tea Bags'])
+        self.assertEqual(self.index.search('cakse'), [])
+        self.index.remove('Tea')
+        self.assertEqual(self.index.search('tea'), ['Tea Bags'])
+        self.assertEqual(len(self.index), 7)
+        with self.assertRaises(KeyError):
+            self.index.remove('Tea')
+        with self.assertRaises(TypeError):
+            self.index.add(1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
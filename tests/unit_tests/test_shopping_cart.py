@@ -1,3 +1,9 @@
+import io
+import json
+import os
+import pickle
+import random
+import tempfile
 import unittest
 from shopping_cart.models.shopping_cart import ShoppingCart
 from shopping_cart.models.item import Item
@@ -98,6 +104,17 @@ class TestShoppingCart(unittest.TestCase):
         self.assertIn('Apple', items)
         self.assertIn('Banana', items)
 
+    def test_list_items_total_price(self):
+        """Test that groups show their subtotal as a float next to the one in cents."""
+        self.cart.add_items([self.item1, self.item3])
+        self.cart.add_item(Item(name='Cherry', price=0.10), quantity=3)
+        items = self.cart.list_items()
+        self.assertEqual(items['Apple']['total_price_cents'], 200)
+        self.assertEqual(items['Apple']['total_price'], 2.00)
+        self.assertEqual(items['Cherry']['total_price'], 0.30)
+        self.assertIn('total_price', items['Apple'])
+        self.assertEqual(pickle.loads(pickle.dumps(items))['Cherry']['total_price'], 0.30)
+
     def test_list_items_by_name(self):
         """Test listing items by name."""
         self.cart.add_item(self.item1)
@@ -111,6 +128,101 @@ class TestShoppingCart(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.cart.list_items_by_name('Orange')
 
+    def test_listings_are_frozen(self):
+        """Test that listings keep showing the cart as it was when they were taken."""
+        self.cart.add_items([self.item1, self.item2, self.item3])
+        self.cart.add_item(Item(name='Cherry', price=0.10), quantity=2)
+        items = self.cart.list_items()
+        apples = self.cart.list_items_by_name('Apple')
+
+        self.cart.remove_item(self.item1)
+        self.cart.add_item(Item(name='Apple', price=2.00))
+        self.cart.add_item(Item(name='Cherry', price=0.10), quantity=1)
+        self.cart.remove_item(self.item2)
+        self.cart.list_items_by_name('Cherry')
+
+        self.assertEqual(list(items), ['Apple', 'Banana', 'Cherry'])
+        self.assertEqual(items['Apple']['instances'], [self.item1, self.item3])
+        self.assertEqual(items['Apple']['total_quantity'], 2)
+        self.assertEqual(dict(items['Cherry']['lines']), {0.10: 2})
+        self.assertEqual(apples, [self.item1, self.item3])
+        self.assertEqual(self.cart.get_total_quantity_by_name('Apple'), 2)
+        self.assertEqual(self.cart.get_item('Apple', self.item3.uid), self.item3)
+
+        self.cart.clear_cart()
+        self.assertEqual(len(items), 3)
+        self.assertEqual(self.cart.list_items(), {})
+
+    def test_listings_are_read_only_and_shared(self):
+        """Test that listings cannot be modified and do not copy the cart."""
+        self.cart.add_items([self.item1, self.item3])
+        apples = self.cart.list_items_by_name('Apple')
+        with self.assertRaises(TypeError):
+            apples[0] = self.item2
+        with self.assertRaises(TypeError):
+            self.cart.list_items()['Apple']['total_quantity'] = 0
+        self.assertFalse(hasattr(apples, 'append'))
+        self.assertIs(apples._instances, self.cart._items['Apple']['instances'])
+
+        # Once no listing is alive, the cart modifies its lists in place again
+        del apples
+        instances = self.cart._items['Apple']['instances']
+        self.cart.add_item(self.item4)
+        self.assertIs(self.cart._items['Apple']['instances'], instances)
+
+    def test_listings_pickle_as_plain_data(self):
+        """Test that listings are pickled as dictionaries and lists."""
+        self.cart.add_items([self.item1, self.item2])
+        restored = pickle.loads(pickle.dumps(self.cart.list_items()))
+        self.assertIs(type(restored), dict)
+        self.assertIs(type(restored['Apple']['instances']), list)
+        self.assertEqual(restored['Apple']['instances'], [self.item1])
+
+    def test_iter_items(self):
+        """Test iterating over every unit, counted lines included."""
+        self.cart.add_items([self.item1, self.item2, self.item3])
+        self.cart.add_item(self.item4, quantity=2)
+        items = list(self.cart.iter_items())
+        self.assertEqual(items[:3], [self.item1, self.item3, self.item2])
+        self.assertEqual([item.name for item in items[3:]], ['Orange', 'Orange'])
+        self.assertEqual(len({item.uid for item in items}), 5)
+        self.assertEqual(list(ShoppingCart().iter_items()), [])
+
+    def test_iter_groups(self):
+        """Test iterating over the quantity and subtotal of every name."""
+        self.cart.add_items([self.item1, self.item2, self.item3])
+        self.cart.add_item(self.item4, quantity=3)
+        groups = list(self.cart.iter_groups())
+        self.assertEqual(groups, [('Apple', 2, 200), ('Banana', 1, 50), ('Orange', 3, 225)])
+        self.assertEqual(groups[2].name, 'Orange')
+        self.assertEqual(groups[2].subtotal, 2.25)
+        # Counted units are not turned into instances
+        self.assertEqual(self.cart._items['Orange']['lines'], {0.75: 3})
+
+    def test_iter_items_by_name(self):
+        """Test iterating over the units of a name."""
+        self.cart.add_items([self.item1, self.item2, self.item3])
+        self.assertEqual(list(self.cart.iter_items_by_name('Apple')), [self.item1, self.item3])
+        # Unknown names are reported by the call, not on first iteration
+        with self.assertRaises(KeyError):
+            self.cart.iter_items_by_name('Orange')
+
+    def test_iterators_survive_changes(self):
+        """Test that iterators keep going over the cart as it was when they were created."""
+        self.cart.add_items([self.item1, self.item2, self.item3])
+        seen = []
+        for item in self.cart.iter_items():
+            seen.append(item)
+            self.cart.remove_item(item)
+            self.cart.add_item(Item(name=f"New {item.name}", price=1.00))
+        self.assertEqual(seen, [self.item1, self.item3, self.item2])
+
+        for item in self.cart.iter_items_by_name('New Apple'):
+            self.cart.remove_item(item)
+        for group in self.cart.iter_groups():
+            self.cart.add_item(Item(name=group.name.upper(), price=1.00))
+        self.assertEqual([group.name for group in self.cart.iter_groups()], ['New Banana', 'NEW BANANA'])
+
     def test_get_total_quantity_by_name(self):
         """Test getting total quantity by item name."""
         self.cart.add_item(self.item1)
@@ -178,6 +290,249 @@ class TestShoppingCart(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.cart.remove_item(123)  # Invalid type
 
+    def test_add_item_duplicate_uid(self):
+        """Test that the same item instance cannot be added twice."""
+        self.cart.add_item(self.item1)
+        with self.assertRaises(ValueError):
+            self.cart.add_item(self.item1)
+        self.assertEqual(self.cart.total_quantity, 1)
+
+    def test_uid_index_after_removals(self):
+        """Test that the UID index stays in step with the instance lists."""
+        apples = [Item(name='Apple', price=1.00) for _ in range(10)]
+        for apple in apples:
+            self.cart.add_item(apple)
+
+        # Remove from the front, the middle and the back of the group
+        for apple in (apples[0], apples[5], apples[9]):
+            self.cart.remove_item(apple)
+            with self.assertRaises(KeyError):
+                self.cart.get_item(item_name='Apple', item_uid=str(apple.uid))
+
+        remaining = [apple for i, apple in enumerate(apples) if i not in (0, 5, 9)]
+        self.assertCountEqual(self.cart.list_items_by_name('Apple'), remaining)
+        for apple in remaining:
+            self.assertIs(self.cart.get_item(item_name='Apple', item_uid=str(apple.uid)), apple)
+            self.assertIs(self.cart.get_item(item_name='Apple', item_uid=apple.uid), apple)
+
+        for apple in remaining:
+            self.cart.remove_item(apple)
+        self.assertEqual(self.cart.total_quantity, 0)
+        self.assertEqual(self.cart._uid_index, {})
+
+    def test_remove_item_uid_under_other_name(self):
+        """Test removing an item whose UID is only known under another name."""
+        self.cart.add_item(self.item1)
+        self.cart.add_item(self.item2)
+        impostor = Item(name='Banana', price=0.50, uid=self.item1.uid)
+        with self.assertRaises(KeyError):
+            self.cart.remove_item(impostor)
+        with self.assertRaises(KeyError):
+            self.cart.get_item(item_name='Banana', item_uid=str(self.item1.uid))
+
+    def test_get_item_malformed_uid(self):
+        """Test getting an item with a malformed UID string."""
+        self.cart.add_item(self.item1)
+        with self.assertRaises(KeyError):
+            self.cart.get_item(item_name='Apple', item_uid='not-a-uid')
+
+    def test_clear_cart_resets_uid_index(self):
+        """Test that clearing the cart allows the same items to be re-added."""
+        self.cart.add_item(self.item1)
+        self.cart.clear_cart()
+        self.cart.add_item(self.item1)
+        self.assertEqual(self.cart.get_item('Apple', str(self.item1.uid)), self.item1)
+
+    def test_add_items(self):
+        """Test adding a batch of items to the cart."""
+        self.cart.add_item(self.item4)
+        self.cart.add_items([self.item1, self.item2, self.item3])
+        self.assertEqual(self.cart.total_quantity, 4)
+        self.assertEqual(self.cart.total_price, 3.25)
+        self.assertEqual(self.cart.get_total_quantity_by_name('Apple'), 2)
+        self.assertEqual(self.cart._items['Apple']['total_price_cents'], 200)
+        self.assertIs(self.cart.get_item('Apple', str(self.item3.uid)), self.item3)
+
+    def test_add_items_is_atomic(self):
+        """Test that a failing batch leaves the cart untouched."""
+        self.cart.add_item(self.item4)
+        invalid_batches = [
+            ([self.item1, "NotAnItemInstance"], TypeError),
+            ([self.item1, self.item4], ValueError),
+            ([self.item1, self.item2, self.item1], ValueError),
+        ]
+        for batch, error in invalid_batches:
+            with self.assertRaises(error):
+                self.cart.add_items(batch)
+            self.assertEqual(self.cart.total_quantity, 1)
+            self.assertEqual(self.cart.total_price, 0.75)
+            self.assertEqual(list(self.cart.list_items()), ['Orange'])
+            self.assertEqual(len(self.cart._uid_index), 1)
+
+    def test_remove_items(self):
+        """Test removing a batch of items from the cart."""
+        self.cart.add_items([self.item1, self.item2, self.item3, self.item4])
+        self.cart.remove_items([self.item1, self.item2])
+        self.assertEqual(self.cart.total_quantity, 2)
+        self.assertEqual(self.cart.total_price, 1.75)
+        self.assertNotIn('Banana', self.cart._items)
+        self.assertEqual(self.cart.list_items_by_name('Apple'), [self.item3])
+
+        self.cart.remove_items(iter([self.item3, self.item4]))
+        self.assertEqual(self.cart.total_quantity, 0)
+        self.assertEqual(self.cart.total_price, 0.00)
+        self.assertEqual(self.cart.list_items(), {})
+        self.assertEqual(self.cart._uid_index, {})
+
+    def test_remove_items_is_atomic(self):
+        """Test that a failing removal batch leaves the cart untouched."""
+        self.cart.add_items([self.item1, self.item2, self.item3])
+        invalid_batches = [
+            ([self.item1, 123], TypeError),
+            ([self.item1, self.item4], KeyError),
+            ([self.item2, self.item2], KeyError),
+        ]
+        for batch, error in invalid_batches:
+            with self.assertRaises(error):
+                self.cart.remove_items(batch)
+            self.assertEqual(self.cart.total_quantity, 3)
+            self.assertEqual(self.cart.total_price, 2.50)
+            self.assertEqual(len(self.cart._uid_index), 3)
+
+    def test_add_item_with_quantity(self):
+        """Test adding units as a counted line."""
+        self.cart.add_item(self.item1)
+        self.cart.add_item(Item(name='Apple', price=1.00), quantity=500)
+        self.cart.add_item(Item(name='Apple', price=1.00), quantity=100)
+        self.assertEqual(self.cart.total_quantity, 601)
+        self.assertEqual(self.cart.total_price, 601.00)
+        self.assertEqual(self.cart.get_total_quantity_by_name('Apple'), 601)
+
+        # Only the unique instance is stored as an Item
+        self.assertEqual(len(self.cart._items['Apple']['instances']), 1)
+        self.assertEqual(self.cart._items['Apple']['lines'], {1.00: 600})
+        self.assertEqual(len(self.cart._uid_index), 1)
+
+    def test_add_item_invalid_quantity(self):
+        """Test adding units with an invalid quantity."""
+        with self.assertRaises(ValueError):
+            self.cart.add_item(self.item1, quantity=0)
+        with self.assertRaises(TypeError):
+            self.cart.add_item(self.item1, quantity=1.5)
+        with self.assertRaises(TypeError):
+            self.cart.add_item(self.item1, quantity=True)
+        self.assertEqual(self.cart.total_quantity, 0)
+
+    def test_remove_item_with_quantity(self):
+        """Test removing units from a counted line."""
+        self.cart.add_item(self.item1, quantity=5)
+        self.cart.remove_item(self.item3, quantity=2)
+        self.assertEqual(self.cart.get_total_quantity_by_name('Apple'), 3)
+        self.assertEqual(self.cart.total_price, 3.00)
+
+        with self.assertRaises(KeyError):
+            self.cart.remove_item(self.item1, quantity=4)
+        with self.assertRaises(KeyError):
+            self.cart.remove_item(self.item2, quantity=1)
+        self.assertEqual(self.cart.total_quantity, 3)
+
+        self.cart.remove_item(self.item1, quantity=3)
+        self.assertEqual(self.cart.total_quantity, 0)
+        self.assertNotIn('Apple', self.cart._items)
+
+    def test_quantity_lines_are_not_stored_when_read(self):
+        """Test that reading counted lines as units leaves them counted."""
+        self.cart.add_item(self.item1)
+        self.cart.add_item(self.item3, quantity=3)
+        apples = self.cart.list_items_by_name('Apple')
+        self.assertEqual(len(apples), 4)
+        self.assertEqual(len({apple.uid for apple in apples}), 4)
+        self.assertIs(apples[0], self.item1)
+        self.assertEqual(len(list(self.cart.iter_items())), 4)
+        self.assertEqual(len(list(self.cart.iter_items_by_name('Apple'))), 4)
+        self.cart.generate_receipt('json')
+        self.cart.write_receipt(io.StringIO(), 'csv')
+        self.assertEqual(self.cart._items['Apple']['instances'], [self.item1])
+        self.assertEqual(self.cart._items['Apple']['lines'], {1.0: 3})
+        self.assertEqual(len(self.cart._uid_index), 1)
+        self.assertEqual(self.cart.total_quantity, 4)
+        self.assertEqual(self.cart.total_price, 4.00)
+
+    def test_counted_units_keep_their_uids(self):
+        """Test that counted units are listed with the same UIDs every time, and can be found by them."""
+        self.cart.add_item(self.item1)
+        self.cart.add_item(self.item3, quantity=3)
+        apples = self.cart.list_items_by_name('Apple')
+        self.assertEqual(list(self.cart.iter_items_by_name('Apple')), apples)
+        self.assertEqual(self.cart.generate_receipt('json'), ShoppingCart.load_receipt(
+            io.StringIO(self.cart.generate_receipt('json')), 'json').generate_receipt('json'))
+        for apple in apples:
+            self.assertEqual(self.cart.get_item('Apple', str(apple.uid)), apple)
+        with self.assertRaises(ValueError):
+            self.cart.add_item(apples[2])
+        with self.assertRaises(KeyError):
+            self.cart.get_item('Apple', uuid.uuid5(uuid.NAMESPACE_DNS, 'apple'))
+
+        # Removing a counted unit takes the last unit of its line off
+        self.cart.remove_item(apples[1])
+        self.assertEqual(self.cart.list_items_by_name('Apple'), apples[:3])
+        self.assertEqual(self.cart._items['Apple']['lines'], {1.0: 2})
+        with self.assertRaises(KeyError):
+            self.cart.remove_item(apples[3])
+        self.cart.remove_items([self.item1])
+        self.cart.add_item(self.item1)
+        self.assertEqual(self.cart.total_quantity, 3)
+
+    def test_remove_quantity_after_receipt(self):
+        """Test that units can still be removed by quantity after every per-unit read."""
+        rice = Item(name='Rice', price=1.80)
+        self.cart.add_item(rice, quantity=500)
+        self.cart.generate_receipt('text')
+        self.cart.list_items_by_name('Rice')
+        list(self.cart.iter_items())
+        self.cart.remove_item(rice, quantity=1)
+        self.assertEqual(self.cart.total_quantity, 499)
+        self.assertEqual(self.cart.generate_receipt('text').count('Name: Rice'), 499)
+        self.cart.remove_item(rice, quantity=499)
+        self.assertEqual(self.cart.total_quantity, 0)
+
+    def test_total_price_is_exact(self):
+        """Test that totals stay exact where float accumulation would drift."""
+        dimes = [Item(name='Dime Candy', price=0.10) for _ in range(10)]
+        self.cart.add_items(dimes)
+        self.assertEqual(self.cart.total_price_cents, 100)
+        self.assertEqual(self.cart.total_price, 1.00)
+
+        self.cart.add_item(self.item4, quantity=3)
+        for dime in dimes:
+            self.cart.remove_item(dime)
+        self.assertEqual(self.cart.total_price_cents, 225)
+        self.assertEqual(self.cart.total_price, 2.25)
+
+    def test_random_operations_keep_exact_total(self):
+        """Stress random adds and removes and check the final total exactly."""
+        rng = random.Random(5)
+        prices = [0.01, 0.10, 0.29, 0.33, 0.99, 1.15, 19.99, 1234.56]
+        in_cart = []
+        for _ in range(20000):
+            if in_cart and rng.random() < 0.45:
+                item = in_cart.pop(rng.randrange(len(in_cart)))
+                self.cart.remove_item(item)
+            else:
+                item = Item(name=f"Item {rng.randrange(20)}", price=rng.choice(prices))
+                self.cart.add_item(item)
+                in_cart.append(item)
+
+        expected_cents = sum(item.price_cents for item in in_cart)
+        self.assertEqual(self.cart.total_price_cents, expected_cents)
+        self.assertEqual(self.cart.total_price, expected_cents / 100)
+        self.assertEqual(self.cart.total_quantity, len(in_cart))
+        for item_name, item_group in self.cart.list_items().items():
+            self.assertEqual(
+                item_group['total_price_cents'],
+                sum(item.price_cents for item in item_group['instances'])
+            )
+
     def test_total_price_rounding(self):
         """Test that total price is correctly rounded."""
         item_expensive = Item(name='Laptop', price=999.9999)
@@ -185,5 +540,123 @@ class TestShoppingCart(unittest.TestCase):
         self.assertEqual(self.cart.total_price, 1000.00)
 
 
+class TestCartSnapshots(unittest.TestCase):
+    """Unit tests for saving and loading binary cart snapshots."""
+
+    def setUp(self):
+        """Set up a cart with instances, counted lines and many distinct prices."""
+        self.cart = ShoppingCart()
+        self.cart.add_items(Item(name='Apple', price=1.00) for _ in range(3))
+        self.cart.add_items(Item(name='Crème brûlée', price=i / 100) for i in range(300))
+        self.cart.add_item(Item(name='Banana', price=0.50), quantity=7)
+        self.cart.add_item(Item(name='Apple', price=1.25), quantity=2)
+
+    def round_trip(self, cart):
+        """Save a cart to bytes and load it back."""
+        stream = io.BytesIO()
+        cart.save_snapshot(stream)
+        return ShoppingCart.load_snapshot(stream.getvalue())
+
+    def test_round_trip(self):
+        """Test that a restored cart has the same contents, UIDs and receipts."""
+        restored = self.round_trip(self.cart)
+        self.assertEqual(restored.total_quantity, self.cart.total_quantity)
+        self.assertEqual(restored.total_price_cents, self.cart.total_price_cents)
+        self.assertEqual(restored.get_total_quantity_by_name('Banana'), 7)
+        self.assertEqual(restored._items['Apple']['lines'], {1.25: 2})
+        self.assertEqual(restored.list_items_by_name('Crème brûlée'), self.cart.list_items_by_name('Crème brûlée'))
+
+        # Counted units keep the UIDs derived from their line
+        for format_type in ('json', 'csv'):
+            self.assertEqual(restored.generate_receipt(format_type),
+                             self.cart.generate_receipt(format_type))
+            self.assertEqual(restored.generate_receipt(format_type, grouped=True),
+                             self.cart.generate_receipt(format_type, grouped=True))
+
+    def test_round_trip_through_file(self):
+        """Test saving to and loading from a file path."""
+        receipt_content = self.cart.generate_receipt('text')
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'cart.snapshot')
+            self.cart.save_snapshot(file_path)
+            restored = ShoppingCart.load_snapshot(file_path)
+            with open(file_path, 'rb') as file:
+                self.assertEqual(ShoppingCart.load_snapshot(file).total_price, self.cart.total_price)
+        self.assertEqual(restored.generate_receipt('text'), receipt_content)
+
+    def test_units_are_unpacked_on_demand(self):
+        """Test that restored units only become Item instances when needed."""
+        restored = self.round_trip(self.cart)
+        self.assertEqual(restored._items['Apple']['instances'], [])
+        self.assertEqual(restored.total_price, self.cart.total_price)
+        json.loads(restored.generate_receipt('json', grouped=True))
+        self.assertEqual(restored._items['Apple']['instances'], [])
+
+        apple = self.cart.list_items_by_name('Apple')[0]
+        self.assertEqual(restored.get_item('Apple', apple.uid), apple)
+        # Counted lines are still counted
+        self.assertEqual(len(restored._items['Apple']['instances']), 3)
+        self.assertEqual(restored._items['Apple']['lines'], {1.25: 2})
+
+    def test_iterators_keep_units_packed(self):
+        """Test that iterating over restored units does not unpack them into the cart."""
+        restored = self.round_trip(self.cart)
+        uid_index = dict(restored._uid_index)
+        apples = [apple.uid for apple in self.cart.list_items_by_name('Apple')[:3]]
+        self.assertEqual([apple.uid for apple in restored.iter_items_by_name('Apple')][:3], apples)
+        self.assertEqual(len(list(restored.iter_items())), restored.total_quantity)
+        self.assertEqual(restored._items['Apple']['instances'], [])
+        self.assertIsNotNone(restored._items['Apple']['packed'])
+        self.assertEqual(restored._uid_index, uid_index)
+
+    def test_restored_uids_stay_unique(self):
+        """Test that restored units take part in UID checks and removals."""
+        restored = self.round_trip(self.cart)
+        apple = self.cart.list_items_by_name('Apple')[0]
+        with self.assertRaises(ValueError):
+            restored.add_item(apple)
+        with self.assertRaises(ValueError):
+            self.round_trip(self.cart).add_items([apple])
+
+        restored = self.round_trip(self.cart)
+        restored.remove_item(apple)
+        self.assertEqual(restored.get_total_quantity_by_name('Apple'), 4)
+        self.assertEqual(restored.total_price_cents, self.cart.total_price_cents - 100)
+
+    def test_save_after_load(self):
+        """Test saving a restored cart again after changing it."""
+        self.cart.list_items_by_name('Apple')
+        restored = self.round_trip(self.cart)
+        restored.add_item(Item(name='Apple', price=2.00))
+        restored = self.round_trip(restored)
+        restored.add_item(Item(name='Cherry', price=0.25), quantity=2)
+
+        again = self.round_trip(restored)
+        self.assertEqual(again.list_items_by_name('Apple'), restored.list_items_by_name('Apple'))
+        self.assertEqual(again._items['Apple']['lines'], {1.25: 2})
+        self.assertEqual(again.total_price_cents, self.cart.total_price_cents + 250)
+
+    def test_snapshot_is_smaller_than_json_receipt(self):
+        """Test that snapshots take a fraction of the space of JSON receipts."""
+        stream = io.BytesIO()
+        self.cart.save_snapshot(stream)
+        self.assertLess(len(stream.getvalue()) * 4, len(self.cart.generate_receipt('json')))
+
+    def test_invalid_snapshots(self):
+        """Test that invalid data is rejected."""
+        stream = io.BytesIO()
+        self.cart.save_snapshot(stream)
+        data = stream.getvalue()
+        for invalid in (b'', b'JSON' + data[4:], data[:4] + b'\x63\x00' + data[6:], data[:-1], data + b'\x00'):
+            with self.assertRaises(ValueError):
+                ShoppingCart.load_snapshot(invalid)
+
+    def test_empty_cart(self):
+        """Test the snapshot of an empty cart."""
+        restored = self.round_trip(ShoppingCart())
+        self.assertEqual(restored.total_quantity, 0)
+        self.assertEqual(restored.list_items(), {})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+import random
+import unittest
+import yaml
+from shopping_cart.models.item import Item
+from shopping_cart.models.promotions import BuyOneGetOneFree
+from shopping_cart.models.receipts.batch_renderer import restore_receipt_data, snapshot_cart
+from shopping_cart.models.receipts.receipt_strategy_factory import get_receipt_strategy
+from shopping_cart.models.shopping_cart import ShoppingCart
+from shopping_cart.models.taxes import TaxLine, TaxTable
+
+
+class TestTaxes(unittest.TestCase):
+    """Unit tests for taxes applied to a shopping cart."""
+
+    def setUp(self):
+        """Set up a cart with a standard rate, a reduced rate for food and no tax on books."""
+        self.table = TaxTable({'standard': 8.875, 'food': 5, 'books': 0},
+                              categories={'Apple': 'food', 'Bread': 'food', 'Novel': 'books'})
+        self.cart = ShoppingCart(tax_table=self.table)
+
+    def test_tax_per_category(self):
+        """Test that each category is taxed on its subtotal, rounded half up."""
+        self.cart.add_item(Item(name='Apple', price=0.50), quantity=3)
+        self.cart.add_items([Item(name='Bread', price=2.20), Item(name='Soap', price=4.00),
+                             Item(name='Novel', price=12.00)])
+        self.assertEqual(self.cart.tax_lines(), [
+            TaxLine('standard', 8.875, 400, 36),
+            TaxLine('food', 5, 370, 19),
+            TaxLine('books', 0, 1200, 0),
+        ])
+        self.assertEqual(self.cart.tax_cents, 55)
+        self.assertEqual(self.cart.total_due_cents, 1970 + 55)
+        self.assertEqual(self.cart.total_due, 20.25)
+
+    def test_rates_are_exact(self):
+        """Test that rates are applied without float rounding errors."""
+        self.assertEqual(self.table.tax_cents('standard', 400), 36)
+        self.assertEqual(self.table.tax_cents('food', 10), 1)
+        self.assertEqual(TaxTable({'standard': 7.25}).tax_cents('standard', 200), 15)
+        self.assertEqual(TaxTable({'standard': 0.1}).tax_cents('standard', 5000), 5)
+
+    def test_incremental_taxes_match_a_rebuild(self):
+        """Test that taxes kept up to date through changes match taxes computed from scratch."""
+        rng = random.Random(5)
+        names = ['Apple', 'Bread', 'Soap', 'Novel', 'Lamp']
+        items = [Item(name=rng.choice(names), price=rng.choice([0.33, 1.99, 2.50, 7.15])) for _ in range(100)]
+        self.cart.add_items(items[:50])
+        for item in items[50:]:
+            self.cart.add_item(item)
+        self.cart.add_item(Item(name='Soap', price=1.05), quantity=3)
+        self.cart.remove_items(items[:20])
+        self.cart.remove_item(items[70])
+        self.cart.remove_item(Item(name='Soap', price=1.05), quantity=2)
+
+        rebuilt = ShoppingCart()
+        rebuilt.add_items(items[20:70] + items[71:])
+        rebuilt.add_item(Item(name='Soap', price=1.05))
+        rebuilt.set_tax_table(self.table)
+        self.assertEqual(self.cart.tax_lines(), rebuilt.tax_lines())
+        self.assertEqual(self.cart.total_due_cents, rebuilt.total_due_cents)
+
+    def test_clear_snapshot_and_remove(self):
+        """Test that taxes follow clearing, snapshots and removing the table."""
+        self.cart.add_items([Item(name='Soap', price=4.00), Item(name='Apple', price=1.00)])
+        buffer = io.BytesIO()
+        self.cart.save_snapshot(buffer)
+        restored = ShoppingCart.load_snapshot(buffer.getvalue(), tax_table=self.table)
+        self.assertEqual(restored.tax_lines(), self.cart.tax_lines())
+        self.assertIs(restored.tax_table, self.table)
+
+        restored.clear_cart()
+        self.assertEqual((restored.tax_lines(), restored.tax_cents), ([], 0))
+        self.cart.set_tax_table(None)
+        self.assertEqual((self.cart.tax_table, self.cart.tax_cents, self.cart.total_due_cents), (None, 0, 500))
+
+    def test_taxes_with_promotions(self):
+        """Test that taxes apply to prices before discounts, and both count in the total due."""
+        cart = ShoppingCart(promotions=[BuyOneGetOneFree('Soap')], tax_table=self.table)
+        cart.add_item(Item(name='Soap', price=4.00), quantity=2)
+        self.assertEqual((cart.discount_cents, cart.tax_cents, cart.total_due_cents), (400, 71, 471))
+
+    def test_invalid_tables(self):
+        """Test that tables with invalid rates or unknown categories are rejected."""
+        for rates, categories in (({'standard': -1}, {}), ({'standard': float('nan')}, {}),
+                                  ({'reduced': 5}, {}), ({'standard': 5}, {'Apple': 'food'})):
+            with self.assertRaises(ValueError):
+                TaxTable(rates, categories)
+
+
+class TestTaxReceipts(unittest.TestCase):
+    """Unit tests for tax lines on receipts."""
+
+    def setUp(self):
+        """Set up a cart with units in two categories."""
+        table = TaxTable({'standard': 10, 'food': 5}, categories={'Apple': 'food'})
+        self.cart = ShoppingCart(tax_table=table)
+        self.cart.add_items([Item(name='Apple', price=1.00), Item(name='Soap', price=3.00)])
+
+    def test_text_and_csv_receipts(self):
+        """Test that tax lines and the total due follow the total price."""
+        self.assertTrue(self.cart.generate_receipt('text').endswith(
+            "Total Price: $4.00\nTax: standard 10% on $3.00 | $0.30\nTax: food 5% on $1.00 | $0.05\nTotal Due: $4.35"
+        ))
+        rows = list(csv.reader(io.StringIO(self.cart.generate_receipt('csv', grouped=True))))
+        self.assertEqual(rows[-4:], [['Total Price', '', '4.00'], ['Tax', 'standard 10%', '0.30'],
+                                     ['Tax', 'food 5%', '0.05'], ['Total Due', '', '4.35']])
+
+    def test_json_and_yaml_receipts(self):
+        """Test that structured receipts have the tax lines, in every style."""
+        taxes = [{'category': 'standard', 'rate': 10, 'taxable': 3.0, 'amount': 0.3},
+                 {'category': 'food', 'rate': 5, 'taxable': 1.0, 'amount': 0.05}]
+        for format_type, load, options in (('json', json.loads, {}), ('json', json.loads, {'compact': True}),
+                                           ('yaml', yaml.safe_load, {}), ('yaml', yaml.safe_load, {'compact': True})):
+            with self.subTest(format_type=format_type, **options):
+                receipt = load(self.cart.generate_receipt(format_type, **options))
+                self.assertEqual(receipt['taxes'], taxes)
+                self.assertEqual(receipt['total_due'], 4.35)
+                self.assertNotIn('discounts', receipt)
+
+    def test_receipts_round_trip(self):
+        """Test that receipts with tax lines can still be loaded back into a cart."""
+        for format_type in ('csv', 'json', 'yaml'):
+            with self.subTest(format_type=format_type):
+                stream = io.StringIO(self.cart.generate_receipt(format_type))
+                self.assertEqual(ShoppingCart.load_receipt(stream, format_type).total_price_cents, 400)
+
+    def test_batch_snapshot_keeps_taxes(self):
+        """Test that batch rendering snapshots carry the tax lines."""
+        data = restore_receipt_data(snapshot_cart(self.cart))
+        self.assertEqual(get_receipt_strategy('yaml').generate(data), self.cart.generate_receipt('yaml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
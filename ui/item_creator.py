@@ -1,3 +1,4 @@
+import math
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox
 )
@@ -48,7 +49,8 @@ class ItemCreatorDialog(QDialog):
             return
         try:
             price = float(price_text)
-            if price <= 0:
+            # float() also accepts 'nan', 'inf' and values that overflow to inf
+            if not math.isfinite(price) or price <= 0:
                 raise ValueError
         except ValueError:
             QMessageBox.warning(self, "Input Error", "Invalid price. Please enter a positive number.")
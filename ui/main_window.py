@@ -1,13 +1,16 @@
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QListWidget,
-    QPushButton, QLabel, QListWidgetItem, QMessageBox, QSplitter, QMenu
+    QPushButton, QLabel, QListWidgetItem, QMessageBox, QSplitter, QMenu, QLineEdit
 )
 from PyQt5.QtCore import Qt
+from shopping_cart.models.catalog import Catalog
 from shopping_cart.models.shopping_cart import ShoppingCart
-from shopping_cart.models.item import Item
 from ui.item_creator import ItemCreatorDialog
 from ui.receipt_viewer import ReceiptViewerDialog
 
+# Maximum number of items listed while searching
+SEARCH_RESULTS = 50
+
 
 class MainWindow(QMainWindow):
     """Main window for the Shopping Cart application."""
@@ -19,7 +22,7 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1000, 600)  # Increased width for better layout
 
         self.cart = ShoppingCart()
-        self.items = []  # Available items to add to the cart
+        self.catalog = Catalog()  # Available items to add to the cart
 
         self._setup_ui()
         self._load_initial_items()  # Load initial items
@@ -28,9 +31,15 @@ class MainWindow(QMainWindow):
         # Main layout
         main_layout = QHBoxLayout()
 
+        # Search box, filtering the available items as you type
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search items...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.refresh_item_list)
+
         # Item list widget
         self.item_list_widget = QListWidget()
-        self.item_list_widget.setSelectionMode(QListWidget.SingleSelection)
+        self.item_list_widget.setSelectionMode(QListWidget.ExtendedSelection)
         self.item_list_widget.setDragEnabled(True)
         self.item_list_widget.viewport().setAcceptDrops(True)
         self.item_list_widget.setDragDropMode(QListWidget.DragOnly)
@@ -80,6 +89,7 @@ class MainWindow(QMainWindow):
         # Assemble layouts
         left_layout = QVBoxLayout()
         left_layout.addWidget(QLabel("Available Items"))
+        left_layout.addWidget(self.search_box)
         left_layout.addWidget(self.item_list_widget)
         left_layout.addLayout(button_layout)
         left_layout.addSpacing(20)
@@ -129,44 +139,55 @@ class MainWindow(QMainWindow):
             {'name': 'Cereal', 'price': 3.50},
         ]
         for item_data in initial_items:
-            self.items.append(item_data)
-            self.add_item_to_list(item_data)
+            self.catalog.add(item_data['name'], item_data['price'])
+        self.refresh_item_list()
 
     def create_item(self):
         dialog = ItemCreatorDialog(self)
         if dialog.exec_():
             item_data = dialog.get_item_data()
-            self.items.append(item_data)
-            self.add_item_to_list(item_data)
-
-    def add_item_to_list(self, item_data):
-        item_widget = QListWidgetItem(f"{item_data['name']} - ${item_data['price']:.2f}")
-        item_widget.setData(Qt.UserRole, item_data)
+            try:
+                self.catalog.add(item_data['name'], item_data['price'])
+            except ValueError as e:
+                QMessageBox.warning(self, "Input Error", str(e))
+                return
+            self.refresh_item_list()
+
+    def refresh_item_list(self):
+        # List every item, or the best matches for the search box
+        query = self.search_box.text().strip()
+        templates = self.catalog.search(query, limit=SEARCH_RESULTS) if query else self.catalog
+        self.item_list_widget.clear()
+        for template in templates:
+            self.add_item_to_list(template)
+
+    def add_item_to_list(self, template):
+        item_widget = QListWidgetItem(f"{template.name} - ${template.price:.2f}")
+        item_widget.setData(Qt.UserRole, template.sku)
         self.item_list_widget.addItem(item_widget)
 
     def drag_enter_event(self, event):
         event.accept()
 
     def drop_event(self, event):
-        source_item = event.source().currentItem()
-        if source_item:
-            item_data = source_item.data(Qt.UserRole)
-            # Create a new Item instance with a unique UID
-            item = Item(name=item_data['name'], price=item_data['price'])
-            self.cart.add_item(item)
+        source_items = event.source().selectedItems()
+        if source_items:
+            # Create new Item instances with unique UIDs from the catalog's templates,
+            # and add them in one batch so that a multi-item drop is all-or-nothing
+            items = [self.catalog.new_item(source_item.data(Qt.UserRole)) for source_item in source_items]
+            self.cart.add_items(items)
             self.update_cart()
             self.update_cart_info()
         event.accept()
 
     def update_cart(self):
         self.cart_list_widget.clear()
-        for item_name, item_group in self.cart.list_items().items():
-            for item in item_group['instances']:
-                item_widget = QListWidgetItem(f"{item.name} - ${item.price:.2f}")
-                item_widget.setData(Qt.UserRole, item)
-                # Center-align the text
-                item_widget.setTextAlignment(Qt.AlignCenter)
-                self.cart_list_widget.addItem(item_widget)
+        for item in self.cart.iter_items():
+            item_widget = QListWidgetItem(f"{item.name} - ${item.price:.2f}")
+            item_widget.setData(Qt.UserRole, item)
+            # Center-align the text
+            item_widget.setTextAlignment(Qt.AlignCenter)
+            self.cart_list_widget.addItem(item_widget)
 
     def update_cart_info(self):
         self.total_quantity_label.setText(f"Total Quantity: {self.cart.total_quantity}")